@@ -1,7 +1,7 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QTableWidget, QTableWidgetItem, QHeaderView,
                              QMessageBox, QFileDialog, QLabel, QSpinBox, QProgressBar, QFrame)
-from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtCore import Qt, QSize, pyqtSignal
 from PyQt5.QtGui import QFont, QIcon
 from src.utils.data_manager import DataManager
 import os
@@ -9,10 +9,16 @@ from datetime import datetime
 from .icons import IconManager
 
 class BackupWindow(QWidget):
+    # Arka plandaki yedekleme bittiğinde sonucu arayüz iş parçacığına taşır
+    backup_finished = pyqtSignal(object)
+
     def __init__(self, data_manager: DataManager, parent=None):
         super().__init__(parent)
         self.data_manager = data_manager
+        # Seçilirse arşivin bir kopyası da bu dizine konur
+        self.backup_location = None
         self.icon_manager = IconManager()
+        self.backup_finished.connect(self.on_backup_finished)
         self.init_ui()
 
     def init_ui(self):
@@ -82,7 +88,7 @@ class BackupWindow(QWidget):
         
         # Yedekleme konumu seçimi
         location_layout = QHBoxLayout()
-        self.location_label = QLabel('Yedekleme Konumu:')
+        self.location_label = QLabel('Ek Kopya Konumu:')
         self.location_path = QLabel('Seçilmedi')
         self.location_path.setStyleSheet('color: #757575; font-style: italic;')
         self.select_location_btn = QPushButton('Konum Seç')
@@ -103,6 +109,11 @@ class BackupWindow(QWidget):
         progress_layout.addWidget(self.progress_bar)
         options_layout.addLayout(progress_layout)
         
+        # Son yedeğin boyutu ve süresi
+        self.result_label = QLabel('')
+        self.result_label.setStyleSheet('color: #757575;')
+        options_layout.addWidget(self.result_label)
+        
         main_layout.addLayout(options_layout)
         
         # Butonlar
@@ -112,7 +123,6 @@ class BackupWindow(QWidget):
         self.start_backup_btn = QPushButton('Yedeklemeyi Başlat')
         self.start_backup_btn.setIcon(self.icon_manager.get_icon('backup'))
         self.start_backup_btn.clicked.connect(self.start_backup)
-        self.start_backup_btn.setEnabled(False)
         
         self.cancel_btn = QPushButton('İptal')
         self.cancel_btn.setIcon(self.icon_manager.get_icon('cancel'))
@@ -160,7 +170,7 @@ class BackupWindow(QWidget):
             
             # Tarih
             try:
-                date_str = backup.split("_")[1]
+                date_str = backup[len("backup_"):len("backup_YYYYmmdd_HHMMSS")]
                 date = datetime.strptime(date_str, "%Y%m%d_%H%M%S")
                 self.backup_table.setItem(row, 1, QTableWidgetItem(date.strftime("%d.%m.%Y %H:%M:%S")))
             except:
@@ -176,30 +186,52 @@ class BackupWindow(QWidget):
         )
         
         if directory:
+            self.backup_location = directory
             self.location_path.setText(directory)
             self.location_path.setStyleSheet('color: #2E7D32; font-style: normal;')
-            self.start_backup_btn.setEnabled(True)
     
     def start_backup(self):
         """Yedekleme işlemini başlatır."""
-        # TODO: Yedekleme işlemi burada gerçekleştirilecek
-        self.progress_bar.setValue(0)
         self.start_backup_btn.setEnabled(False)
         self.select_location_btn.setEnabled(False)
+        # Süre bilinmediği için ilerleme çubuğu belirsiz modda gösterilir
+        self.progress_bar.setRange(0, 0)
+        
+        # Anlık görüntü hemen alınır; arşiv arka planda yazılırken düzenlemeye devam edilebilir.
+        # Arşiv listede görünsün ve geri yüklenebilsin diye yedek dizinine yazılır, seçilen konuma kopyalanır
+        future = self.data_manager.create_backup_archive_async(self.backup_location)
+        future.add_done_callback(lambda done: self.backup_finished.emit(done.result()))
+
+    def on_backup_finished(self, result):
+        """Arka plandaki yedekleme sonucunu gösterir."""
+        self.progress_bar.setRange(0, 100)
+        self.start_backup_btn.setEnabled(True)
+        self.select_location_btn.setEnabled(True)
+        if result is None:
+            self.progress_bar.setValue(0)
+            QMessageBox.critical(self, "Hata", "Yedekleme sırasında bir hata oluştu.")
+            return
         
-        # Simüle edilmiş yedekleme işlemi
-        import time
-        for i in range(101):
-            time.sleep(0.05)
-            self.progress_bar.setValue(i)
-            if i == 100:
-                QMessageBox.information(
-                    self,
-                    "Yedekleme Tamamlandı",
-                    "Veriler başarıyla yedeklendi!",
-                    QMessageBox.Ok
-                )
-                self.close()
+        self.progress_bar.setValue(100)
+        summary = f"{self.format_size(result['size'])}, {result['duration']:.2f} sn ({result['compression']})"
+        self.result_label.setText(f"Son yedek: {os.path.basename(result['path'])} - {summary}")
+        self.load_backups()
+        paths = result['path'] if result['copy'] is None else f"{result['path']}\n{result['copy']}"
+        QMessageBox.information(
+            self,
+            "Yedekleme Tamamlandı",
+            f"Veriler başarıyla yedeklendi!\n{paths}\n{summary}",
+            QMessageBox.Ok
+        )
+
+    @staticmethod
+    def format_size(size: int) -> str:
+        """Bayt cinsinden boyutu okunur biçime çevirir."""
+        for unit in ("B", "KB", "MB"):
+            if size < 1024:
+                return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+            size /= 1024
+        return f"{size:.1f} GB"
 
     def create_backup(self):
         """Yeni yedek oluşturur"""
@@ -253,14 +285,11 @@ class BackupWindow(QWidget):
         )
         
         if reply == QMessageBox.Yes:
-            backup_path = os.path.join(self.data_manager.data_dir, "backups", backup_name)
-            try:
-                import shutil
-                shutil.rmtree(backup_path)
+            if self.data_manager.delete_backup(backup_name):
                 self.load_backups()
                 QMessageBox.information(self, "Başarılı", "Yedek başarıyla silindi.")
-            except Exception as e:
-                QMessageBox.critical(self, "Hata", f"Yedek silinirken bir hata oluştu: {str(e)}")
+            else:
+                QMessageBox.critical(self, "Hata", "Yedek silinirken bir hata oluştu.")
 
     def on_interval_changed(self, value):
         """Yedekleme aralığını günceller"""
@@ -2,12 +2,16 @@ from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QFormLayout, QLineEdit,
     QDialogButtonBox, QMessageBox
 )
+from PyQt6.QtCore import pyqtSignal
 from utils.auth_manager import AuthManager
 from utils.logger import Logger
 
 class ChangePasswordDialog(QDialog):
     """Şifre değiştirme dialogu."""
     
+    # Arka plan iş parçacığından arayüz iş parçacığına sonuç taşır
+    password_changed = pyqtSignal(bool)
+    
     def __init__(self, auth_manager: AuthManager, logger: Logger, parent=None):
         super().__init__(parent)
         self.auth_manager = auth_manager
@@ -17,6 +21,7 @@ class ChangePasswordDialog(QDialog):
         self.setMinimumWidth(300)
         
         self.init_ui()
+        self.password_changed.connect(self.on_password_changed)
     
     def init_ui(self):
         """Dialog arayüzünü oluşturur."""
@@ -40,12 +45,12 @@ class ChangePasswordDialog(QDialog):
         layout.addLayout(form_layout)
         
         # Butonlar
-        buttons = QDialogButtonBox(
+        self.buttons = QDialogButtonBox(
             QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
         )
-        buttons.accepted.connect(self.accept)
-        buttons.rejected.connect(self.reject)
-        layout.addWidget(buttons)
+        self.buttons.accepted.connect(self.accept)
+        self.buttons.rejected.connect(self.reject)
+        layout.addWidget(self.buttons)
         
         self.setLayout(layout)
     
@@ -63,11 +68,19 @@ class ChangePasswordDialog(QDialog):
             QMessageBox.warning(self, "Uyarı", "Yeni şifreler eşleşmiyor!")
             return
             
-        if self.auth_manager.change_password(
+        # Hash hesaplaması arayüzü dondurmasın diye arka planda yapılır
+        self.buttons.setEnabled(False)
+        future = self.auth_manager.change_password_async(
             self.auth_manager.current_user_id,
             current_password,
             new_password
-        ):
+        )
+        future.add_done_callback(lambda f: self.password_changed.emit(f.exception() is None and f.result()))
+    
+    def on_password_changed(self, success: bool):
+        """Şifre değiştirme sonucu geldiğinde çalışır."""
+        self.buttons.setEnabled(True)
+        if success:
             self.logger.log_security("Şifre değiştirildi", self.auth_manager.current_user_id)
             QMessageBox.information(self, "Başarılı", "Şifreniz başarıyla değiştirildi!")
             super().accept()
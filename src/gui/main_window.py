@@ -6,7 +6,7 @@ from PyQt6.QtWidgets import (
     QDialogButtonBox, QHBoxLayout, QTableWidget, QTableWidgetItem,
     QHeaderView, QFileDialog, QToolBar, QComboBox, QFrame
 )
-from PyQt6.QtCore import Qt, QSize, QMimeData
+from PyQt6.QtCore import Qt, QSize, QMimeData, QTimer, pyqtSignal
 from PyQt6.QtGui import QAction, QIcon, QDragEnterEvent, QDropEvent, QFont
 from utils.data_manager import DataManager
 from utils.auth_manager import AuthManager
@@ -14,6 +14,7 @@ from utils.logger import Logger
 from utils.crypto_manager import CryptoManager
 from utils.filters import Filter
 from utils.license_manager import LicenseManager
+from utils.user_import import UserImporter, iter_json_records
 from .user_window import UserWindow
 from .license_window import LicenseWindow
 from .template_window import TemplateWindow
@@ -32,6 +33,9 @@ import shutil
 class MainWindow(QMainWindow):
     """Ana pencere sınıfı."""
     
+    # Arka plan iş parçacığından arayüz iş parçacığına ilk kullanıcı kaydının sonucunu taşır
+    first_user_registered = pyqtSignal(bool)
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Outlook İmza Yöneticisi")
@@ -42,6 +46,8 @@ class MainWindow(QMainWindow):
         
         # Güvenlik yöneticileri
         self.auth_manager = AuthManager()
+        # Yedekten geri yüklenen kullanıcı, rol ve izinler bellekteki kopyanın yerine geçer
+        self.data_manager.backup_restored.connect(self.auth_manager.reload)
         self.logger = Logger("main")
         self.crypto_manager = CryptoManager()
         
@@ -67,6 +73,10 @@ class MainWindow(QMainWindow):
         self.setStatusBar(self.status_bar)
         self.status_bar.showMessage("Hazır")
         
+        # Lisans süre olayları
+        self.data_manager.license_scheduler.license_expiring.connect(self.on_license_expiring)
+        self.data_manager.license_scheduler.license_expired.connect(self.on_license_expired)
+        
         # Sekmeleri oluştur
         self.create_tabs()
         
@@ -79,6 +89,7 @@ class MainWindow(QMainWindow):
         self.setAcceptDrops(True)
         
         # İlk giriş kontrolü
+        self.first_user_registered.connect(self.on_first_user_registered)
         self.check_first_login()
     
     def check_first_login(self):
@@ -133,7 +144,17 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(dialog, "Hata", "Şifreler eşleşmiyor!")
             return
             
-        if self.auth_manager.register(username, password, "admin"):
+        # Hash hesaplaması arayüzü dondurmasın diye arka planda yapılır
+        self._first_login = (dialog, username)
+        dialog.setEnabled(False)
+        future = self.auth_manager.register_async(username, password, "admin")
+        future.add_done_callback(lambda f: self.first_user_registered.emit(f.exception() is None and f.result()))
+    
+    def on_first_user_registered(self, success: bool):
+        """İlk kullanıcı kaydının sonucu geldiğinde çalışır"""
+        dialog, username = self._first_login
+        dialog.setEnabled(True)
+        if success:
             self.logger.log_security("İlk admin kullanıcısı oluşturuldu", username)
             dialog.accept()
         else:
@@ -340,6 +361,14 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Veriler yüklenirken bir hata oluştu: {str(e)}")
     
+    def on_license_expiring(self, license_key: str, days_left: int):
+        """Süresi yaklaşan lisansı durum çubuğunda bildirir."""
+        self.status_bar.showMessage(f"{license_key} lisansının süresi {days_left} gün içinde dolacak", 10000)
+    
+    def on_license_expired(self, license_key: str):
+        """Süresi dolan lisansı durum çubuğunda bildirir."""
+        self.status_bar.showMessage(f"{license_key} lisansının süresi doldu", 10000)
+    
     def show_about_dialog(self):
         """Hakkında penceresini gösterir."""
         QMessageBox.about(
@@ -402,7 +431,13 @@ class MainWindow(QMainWindow):
         # Arama kutusu
         self.search_edit = QLineEdit()
         self.search_edit.setPlaceholderText("İsim veya e-posta ile ara...")
-        self.search_edit.textChanged.connect(self.apply_filters)
+        
+        # Her tuş vuruşunda filtrelememek için aramayı geciktir
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(self.apply_filters)
+        self.search_edit.textChanged.connect(self.search_timer.start)
         filter_layout.addRow("Ara:", self.search_edit)
         
         self.main_layout.addLayout(filter_layout)
@@ -449,26 +484,22 @@ class MainWindow(QMainWindow):
         """Filtreleri uygular."""
         department = self.department_combo.currentText()
         role = self.role_combo.currentText()
-        search_text = self.search_edit.text().lower()
+        search_text = self.search_edit.text().strip()
+        
+        query = self.data_manager.query_users()
         
         # Departman ve rol filtreleri
-        if department != "Tümü" or role != "Tümü":
-            self.filtered_users = Filter.filter_users(
-                self.data_manager.get_users(),
-                department=department if department != "Tümü" else None,
-                role=role if role != "Tümü" else None
-            )
-        else:
-            self.filtered_users = self.data_manager.get_users()
+        if department != "Tümü":
+            query.where("department", department)
+        if role != "Tümü":
+            query.where("role", role)
         
         # Arama filtresi
         if search_text:
-            self.filtered_users = [
-                user for user in self.filtered_users
-                if search_text in user["full_name"].lower() or
-                   search_text in user["email"].lower()
-            ]
+            matching_ids = self.data_manager.search_users(search_text)
+            query.filter(lambda user: user["id"] in matching_ids)
         
+        self.filtered_users = query.all()
         self.update_user_table()
     
     def update_user_table(self):
@@ -661,22 +692,32 @@ class MainWindow(QMainWindow):
         """JSON dosyasını içe aktarır"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+                records = iter_json_records(f)
                 
-            if isinstance(data, list):
-                for item in data:
-                    if 'type' in item:
+                def users():
+                    # Kullanıcılar toplu içe aktarıcıya akıtılır, diğer kayıtlar okundukça eklenir
+                    for item in records:
+                        if not isinstance(item, dict) or 'type' not in item:
+                            continue
                         if item['type'] == 'user':
-                            self.data_manager.add_user(item)
+                            yield item
                         elif item['type'] == 'license':
                             self.data_manager.add_license(item)
                         elif item['type'] == 'template':
                             self.data_manager.add_template(item)
                 
-                QMessageBox.information(self, "Başarılı", "Veriler başarıyla içe aktarıldı.")
-                self.refresh_all()
-            else:
-                QMessageBox.warning(self, "Uyarı", "Geçersiz veri formatı.")
+                result = UserImporter(self.data_manager).run(users())
+            
+            QMessageBox.information(
+                self,
+                "Başarılı",
+                "Veriler başarıyla içe aktarıldı.\n"
+                f"Eklenen kullanıcı: {result['imported']}, yinelenen: {result['duplicates']}, "
+                f"geçersiz: {result['invalid']}"
+            )
+            self.refresh_all()
+        except ValueError:
+            QMessageBox.warning(self, "Uyarı", "Geçersiz veri formatı.")
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Veri içe aktarılırken hata oluştu: {str(e)}")
 
@@ -27,7 +27,8 @@ class ReportWindow(QWidget):
         self.report_type_combo.addItems([
             "Kullanıcı Aktivite Raporu",
             "Lisans Kullanım Raporu",
-            "Şablon İstatistikleri"
+            "Şablon İstatistikleri",
+            "Özet Rapor"
         ])
         report_type_layout.addWidget(self.report_type_combo)
         
@@ -94,6 +95,10 @@ class ReportWindow(QWidget):
                 filepath = self.report_manager.generate_license_usage_report(
                     start_date, end_date, output_format
                 )
+            elif report_type == "Özet Rapor":
+                filepath = self.report_manager.generate_summary_report(
+                    start_date, end_date, output_format
+                )
             else:  # Şablon İstatistikleri
                 filepath = self.report_manager.generate_template_statistics(
                     start_date, end_date, output_format
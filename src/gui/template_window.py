@@ -7,8 +7,9 @@ from PyQt6.QtWidgets import (
     QTextBrowser
 )
 from PyQt6.QtGui import QAction
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 from utils.data_manager import DataManager
+from utils.exporter import export_rows
 import json
 from datetime import datetime, timedelta
 from gui.icons import icon_manager
@@ -199,7 +200,13 @@ class TemplateWindow(QWidget):
         # Arama kutusu
         self.search_edit = QLineEdit()
         self.search_edit.setPlaceholderText("Şablon ara...")
-        self.search_edit.textChanged.connect(self.filter_templates)
+        
+        # Her tuş vuruşunda filtrelememek için aramayı geciktir
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(self.filter_templates)
+        self.search_edit.textChanged.connect(self.search_timer.start)
         filter_layout.addWidget(QLabel("Ara:"))
         filter_layout.addWidget(self.search_edit)
         
@@ -272,22 +279,39 @@ class TemplateWindow(QWidget):
     
     def filter_templates(self):
         """Şablonları filtreler ve tabloyu günceller."""
+        templates = self._template_query().all()
+        
+        # Tabloyu güncelle
+        self.template_table.setRowCount(len(templates))
+        for row, template in enumerate(templates):
+            self.template_table.setItem(row, 0, QTableWidgetItem(str(template["id"])))
+            self.template_table.setItem(row, 1, QTableWidgetItem(template.get("name", "")))
+            self.template_table.setItem(row, 2, QTableWidgetItem(template.get("description", "")))
+            self.template_table.setItem(row, 3, QTableWidgetItem(template.get("updated_at", "")))
+        
+        # Sütun genişliklerini ayarla
+        self.template_table.resizeColumnsToContents()
+        
+        # Durum etiketini güncelle
+        self.status_label.setText(f"Toplam {len(templates)} şablon")
+    
+    def _template_query(self):
+        """Tablodaki filtrelere karşılık gelen şablon sorgusunu döndürür; tüm filtreler tek geçişte uygulanır."""
         category_id = self.category_combo.currentData()
         status = self.status_combo.currentText()
         date_filter = self.date_combo.currentText()
-        search_text = self.search_edit.text().lower()
+        search_text = self.search_edit.text().strip()
         
-        # Tüm şablonları al
-        templates = self.data_manager.get_templates()
+        query = self.data_manager.query_templates()
         
         # Kategori filtresi
         if category_id:
-            templates = [t for t in templates if t.get("category_id") == category_id]
+            query.where("category_id", category_id)
         
         # Durum filtresi
         if status != "Tümü":
             is_active = status == "Aktif"
-            templates = [t for t in templates if t.get("is_active", False) == is_active]
+            query.filter(lambda t: t.get("is_active", False) == is_active)
         
         # Tarih filtresi
         if date_filter != "Tüm Zamanlar":
@@ -297,33 +321,23 @@ class TemplateWindow(QWidget):
                 "Son 90 Gün": 90
             }
             days_ago = datetime.now() - timedelta(days=days[date_filter])
-            templates = [
-                t for t in templates
-                if datetime.fromisoformat(t["updated_at"]) >= days_ago
-            ]
+            query.filter(lambda t: datetime.fromisoformat(t["updated_at"]) >= days_ago)
         
         # Arama filtresi
         if search_text:
-            templates = [
-                t for t in templates
-                if search_text in t.get("name", "").lower() or
-                search_text in t.get("description", "").lower() or
-                search_text in t.get("content", "").lower()
-            ]
+            matching_ids = self.data_manager.search_templates(search_text)
+            query.filter(lambda t: t["id"] in matching_ids)
         
-        # Tabloyu güncelle
-        self.template_table.setRowCount(len(templates))
-        for row, template in enumerate(templates):
-            self.template_table.setItem(row, 0, QTableWidgetItem(str(template["id"])))
-            self.template_table.setItem(row, 1, QTableWidgetItem(template.get("name", "")))
-            self.template_table.setItem(row, 2, QTableWidgetItem(template.get("description", "")))
-            self.template_table.setItem(row, 3, QTableWidgetItem(template.get("updated_at", "")))
-        
-        # Sütun genişliklerini ayarla
-        self.template_table.resizeColumnsToContents()
-        
-        # Durum etiketini güncelle
-        self.status_label.setText(f"Toplam {len(templates)} şablon")
+        return query
+    
+    def _has_filter(self):
+        """Tabloda bir filtre uygulanıp uygulanmadığını döndürür."""
+        return (
+            bool(self.category_combo.currentData())
+            or self.status_combo.currentText() != "Tümü"
+            or self.date_combo.currentText() != "Tüm Zamanlar"
+            or bool(self.search_edit.text().strip())
+        )
     
     def show_add_template_dialog(self):
         """Yeni şablon ekleme penceresini gösterir."""
@@ -382,15 +396,24 @@ class TemplateWindow(QWidget):
             self,
             "Şablonları Dışa Aktar",
             "",
-            "JSON Dosyaları (*.json)"
+            "JSON Dosyaları (*.json);;JSON Lines Dosyaları (*.jsonl);;"
+            "Sıkıştırılmış Dosyalar (*.json.gz *.jsonl.gz)"
         )
         
         if file_path:
             try:
-                templates = self.data_manager.get_templates()
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(templates, f, ensure_ascii=False, indent=4)
-                QMessageBox.information(self, "Bilgi", "Şablonlar başarıyla dışa aktarıldı.")
+                query = self.data_manager.query_templates()
+                if self._has_filter():
+                    reply = QMessageBox.question(
+                        self,
+                        "Dışa Aktar",
+                        "Yalnızca filtreyle eşleşen şablonlar dışa aktarılsın mı?",
+                        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+                    )
+                    if reply == QMessageBox.StandardButton.Yes:
+                        query = self._template_query()
+                count = export_rows(query, file_path)
+                QMessageBox.information(self, "Bilgi", f"{count} şablon başarıyla dışa aktarıldı.")
             except Exception as e:
                 QMessageBox.critical(self, "Hata", f"Dışa aktarma sırasında hata oluştu: {str(e)}")
     
@@ -2,15 +2,25 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
     QTableWidget, QTableWidgetItem, QComboBox, QLineEdit,
     QFormLayout, QMessageBox, QDialog, QLabel, QDialogButtonBox,
-    QToolBar, QFileDialog, QHeaderView, QMenu
+    QToolBar, QFileDialog, QHeaderView, QMenu, QProgressDialog, QApplication
 )
 from PyQt6.QtGui import QAction
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer
 from utils.data_manager import DataManager
-import csv
-import json
+from utils.user_import import UserImporter
+from utils.exporter import export_rows
 
 class UserWindow(QWidget):
+    # Dışa aktarılan CSV sütunları; başlıklar içe aktarıcının beklediğiyle aynıdır
+    CSV_COLUMNS = [
+        ("ID", lambda user: user["id"]),
+        ("Ad Soyad", lambda user: user.get("full_name", "")),
+        ("E-posta", lambda user: user.get("email", "")),
+        ("Departman", lambda user: user.get("department", "")),
+        ("Rol", lambda user: user.get("role", "")),
+        ("Durum", lambda user: "Aktif" if user.get("is_active") else "Pasif")
+    ]
+    
     def __init__(self, data_manager: DataManager, icon_manager):
         super().__init__()
         self.data_manager = data_manager
@@ -122,7 +132,13 @@ class UserWindow(QWidget):
         # Arama kutusu
         self.search_edit = QLineEdit()
         self.search_edit.setPlaceholderText("Kullanıcı ara...")
-        self.search_edit.textChanged.connect(self.filter_users)
+        
+        # Her tuş vuruşunda filtrelememek için aramayı geciktir
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_timer.timeout.connect(self.filter_users)
+        self.search_edit.textChanged.connect(self.search_timer.start)
         filter_layout.addWidget(QLabel("Ara:"))
         filter_layout.addWidget(self.search_edit)
         
@@ -191,50 +207,60 @@ class UserWindow(QWidget):
     
     def filter_users(self):
         """Kullanıcıları filtreler ve tabloya ekler."""
+        users = self._user_query().all()
+        
+        # Tabloyu güncelle
+        self.user_table.setRowCount(len(users))
+        for row, user in enumerate(users):
+            self.user_table.setItem(row, 0, QTableWidgetItem(str(user["id"])))
+            self.user_table.setItem(row, 1, QTableWidgetItem(user.get("full_name", "")))
+            self.user_table.setItem(row, 2, QTableWidgetItem(user.get("email", "")))
+            self.user_table.setItem(row, 3, QTableWidgetItem(user.get("department", "")))
+            self.user_table.setItem(row, 4, QTableWidgetItem(user.get("role", "")))
+            self.user_table.setItem(row, 5, QTableWidgetItem(user.get("status", "")))
+        
+        # Sütun genişliklerini ayarla
+        self.user_table.resizeColumnsToContents()
+        
+        # Durum etiketini güncelle
+        self.status_label.setText(f"Toplam {len(users)} kullanıcı")
+    
+    def _user_query(self):
+        """Tablodaki filtrelere karşılık gelen kullanıcı sorgusunu döndürür; tüm filtreler tek geçişte uygulanır."""
         department = self.department_combo.currentText()
         role = self.role_combo.currentText()
         status = self.status_combo.currentText()
-        search_text = self.search_edit.text().lower()
+        search_text = self.search_edit.text().strip()
         
-        # Tüm kullanıcıları al
-        users = self.data_manager.get_users()
+        query = self.data_manager.query_users()
         
         # Departman filtresi
         if department != "Tümü":
-            users = [u for u in users if u.get("department", "") == department]
+            query.where("department", department)
         
         # Rol filtresi
         if role != "Tümü":
-            users = [u for u in users if u.get("role", "") == role]
+            query.where("role", role)
         
         # Durum filtresi
         if status != "Tümü":
-            users = [u for u in users if u.get("status", "") == status]
+            query.where("status", status)
         
         # Arama filtresi
         if search_text:
-            users = [
-                u for u in users
-                if search_text in u.get("full_name", "").lower() or
-                search_text in u.get("email", "").lower() or
-                search_text in u.get("department", "").lower()
-            ]
-        
-        # Tabloyu güncelle
-        self.user_table.setRowCount(len(users))
-        for row, user in enumerate(users):
-            self.user_table.setItem(row, 0, QTableWidgetItem(str(user["id"])))
-            self.user_table.setItem(row, 1, QTableWidgetItem(user.get("full_name", "")))
-            self.user_table.setItem(row, 2, QTableWidgetItem(user.get("email", "")))
-            self.user_table.setItem(row, 3, QTableWidgetItem(user.get("department", "")))
-            self.user_table.setItem(row, 4, QTableWidgetItem(user.get("role", "")))
-            self.user_table.setItem(row, 5, QTableWidgetItem(user.get("status", "")))
-        
-        # Sütun genişliklerini ayarla
-        self.user_table.resizeColumnsToContents()
+            matching_ids = self.data_manager.search_users(search_text)
+            query.filter(lambda u: u["id"] in matching_ids)
         
-        # Durum etiketini güncelle
-        self.status_label.setText(f"Toplam {len(users)} kullanıcı")
+        return query
+    
+    def _has_filter(self):
+        """Tabloda bir filtre uygulanıp uygulanmadığını döndürür."""
+        return (
+            self.department_combo.currentText() != "Tümü"
+            or self.role_combo.currentText() != "Tümü"
+            or self.status_combo.currentText() != "Tümü"
+            or bool(self.search_edit.text().strip())
+        )
     
     def show_new_user_dialog(self):
         """Yeni kullanıcı ekleme penceresini gösterir."""
@@ -368,41 +394,28 @@ class UserWindow(QWidget):
             self,
             "Kullanıcıları Dışa Aktar",
             "",
-            "CSV Dosyaları (*.csv);;JSON Dosyaları (*.json)"
+            "CSV Dosyaları (*.csv);;JSON Dosyaları (*.json);;JSON Lines Dosyaları (*.jsonl);;"
+            "Sıkıştırılmış Dosyalar (*.csv.gz *.json.gz *.jsonl.gz)"
         )
         
         if file_path:
-            users = self.data_manager.get_users()
-            if file_path.endswith('.csv'):
-                self._export_to_csv(users, file_path)
-            else:
-                self._export_to_json(users, file_path)
+            query = self.data_manager.query_users()
+            if self._has_filter():
+                reply = QMessageBox.question(
+                    self,
+                    "Dışa Aktar",
+                    "Yalnızca filtreyle eşleşen kullanıcılar dışa aktarılsın mı?",
+                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+                )
+                if reply == QMessageBox.StandardButton.Yes:
+                    query = self._user_query()
+            self._export(query, file_path)
                 
-    def _export_to_csv(self, users, file_path):
-        """Kullanıcıları CSV formatında dışa aktarır."""
+    def _export(self, users, file_path):
+        """Kullanıcıları dosya uzantısına göre CSV, JSON veya JSON Lines olarak akış halinde dışa aktarır."""
         try:
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(['ID', 'Ad Soyad', 'E-posta', 'Departman', 'Rol', 'Durum'])
-                for user in users:
-                    writer.writerow([
-                        user['id'],
-                        user['full_name'],
-                        user['email'],
-                        user['department'],
-                        user['role'],
-                        'Aktif' if user['is_active'] else 'Pasif'
-                    ])
-            QMessageBox.information(self, "Bilgi", "Kullanıcılar başarıyla dışa aktarıldı.")
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", f"Dışa aktarma sırasında hata oluştu: {str(e)}")
-            
-    def _export_to_json(self, users, file_path):
-        """Kullanıcıları JSON formatında dışa aktarır."""
-        try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(users, f, ensure_ascii=False, indent=4)
-            QMessageBox.information(self, "Bilgi", "Kullanıcılar başarıyla dışa aktarıldı.")
+            count = export_rows(users, file_path, columns=self.CSV_COLUMNS)
+            QMessageBox.information(self, "Bilgi", f"{count} kullanıcı başarıyla dışa aktarıldı.")
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Dışa aktarma sırasında hata oluştu: {str(e)}")
             
@@ -416,42 +429,53 @@ class UserWindow(QWidget):
         )
         
         if file_path:
-            if file_path.endswith('.csv'):
-                self._import_from_csv(file_path)
-            else:
-                self._import_from_json(file_path)
+            self._import_file(file_path)
                 
-    def _import_from_csv(self, file_path):
-        """CSV dosyasından kullanıcıları içe aktarır."""
+    def _import_file(self, file_path):
+        """CSV veya JSON dosyasından kullanıcıları önce deneme modunda doğrulayıp onayla içe aktarır."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    user = {
-                        'id': int(row['ID']),
-                        'full_name': row['Ad Soyad'],
-                        'email': row['E-posta'],
-                        'department': row['Departman'],
-                        'role': row['Rol'],
-                        'is_active': row['Durum'] == 'Aktif'
-                    }
-                    self.data_manager.add_user(user)
-            self.load_users()
-            QMessageBox.information(self, "Bilgi", "Kullanıcılar başarıyla içe aktarıldı.")
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", f"İçe aktarma sırasında hata oluştu: {str(e)}")
+            preview = UserImporter(self.data_manager).import_file(file_path, dry_run=True)
+            if not preview["imported"]:
+                QMessageBox.warning(self, "Uyarı", self._import_summary(preview))
+                return
             
-    def _import_from_json(self, file_path):
-        """JSON dosyasından kullanıcıları içe aktarır."""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                users = json.load(f)
-                for user in users:
-                    self.data_manager.add_user(user)
+            reply = QMessageBox.question(
+                self,
+                "Onay",
+                f"{self._import_summary(preview)}\n\nDevam etmek istiyor musunuz?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                return
+            
+            progress = QProgressDialog("Kullanıcılar içe aktarılıyor...", None, 0, preview["total"], self)
+            progress.setWindowModality(Qt.WindowModality.WindowModal)
+            progress.setMinimumDuration(0)
+            
+            def report(processed):
+                progress.setValue(processed)
+                QApplication.processEvents()
+            
+            result = UserImporter(self.data_manager, progress=report).import_file(file_path)
+            progress.close()
             self.load_users()
-            QMessageBox.information(self, "Bilgi", "Kullanıcılar başarıyla içe aktarıldı.")
+            QMessageBox.information(self, "Bilgi", self._import_summary(result))
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"İçe aktarma sırasında hata oluştu: {str(e)}")
+            
+    @staticmethod
+    def _import_summary(result):
+        """İçe aktarma sonucunu kullanıcıya gösterilecek metne çevirir."""
+        lines = [
+            f"Okunan satır: {result['total']}",
+            f"{'Eklenecek' if result['dry_run'] else 'Eklenen'} kullanıcı: {result['imported']}",
+            f"Yinelenen e-posta: {result['duplicates']}",
+            f"Geçersiz satır: {result['invalid']}"
+        ]
+        # Çok sayıda hata olabileceği için yalnızca ilk birkaçı gösterilir
+        for row, error in result["errors"][:5]:
+            lines.append(f"  Satır {row + 1}: {error}")
+        return "\n".join(lines)
 
     def show_context_menu(self, pos):
         """Bağlam menüsünü gösterir"""
@@ -0,0 +1,127 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+import pandas as pd
+
+
+def _empty_frame(columns: Iterable[str]) -> pd.DataFrame:
+    """Belirtilen sütunlarla boş bir DataFrame döndürür."""
+    return pd.DataFrame({column: pd.Series(dtype=object) for column in columns})
+
+
+def _counts(series: pd.Series) -> Dict[Any, int]:
+    """Değer dağılımını, eksik değerleri de sayarak sözlük olarak döndürür."""
+    return {key: int(count) for key, count in series.value_counts(dropna=False, sort=False).items()}
+
+
+class ReportAnalytics:
+    """Kullanıcı ve lisansları sütunlu tablolarda tutan, raporlar için vektörel toplamlar üreten katman."""
+    
+    USER_COLUMNS = ("id", "full_name", "email", "department", "role", "is_active", "status")
+    USER_DATE_COLUMNS = ("created_at", "updated_at", "last_login")
+    LICENSE_COLUMNS = ("id", "key", "type", "status", "user_id", "max_users")
+    LICENSE_DATE_COLUMNS = ("start_date", "end_date", "created_at", "updated_at")
+    ACTIVE_STATUS = "ACTIVE"
+    
+    def __init__(self, data_manager):
+        self.data_manager = data_manager
+        self._frames: Dict[str, Tuple[Hashable, pd.DataFrame]] = {}
+    
+    def invalidate(self):
+        """Önbellekteki tabloları temizler."""
+        self._frames.clear()
+    
+    def users_frame(self) -> pd.DataFrame:
+        """Kullanıcı tablosunu veri sürümü başına önbellekten döndürür; tablo paylaşılır, değiştirilmemelidir."""
+        return self._frame(
+            "users",
+            lambda: self.data_manager.query_users().all(),
+            self.USER_COLUMNS,
+            self.USER_DATE_COLUMNS
+        )
+    
+    def licenses_frame(self) -> pd.DataFrame:
+        """Lisans tablosunu veri sürümü başına önbellekten döndürür; tablo paylaşılır, değiştirilmemelidir."""
+        return self._frame(
+            "licenses",
+            lambda: self.data_manager.query_licenses().all(),
+            self.LICENSE_COLUMNS,
+            self.LICENSE_DATE_COLUMNS
+        )
+    
+    @staticmethod
+    def filter_by_date_range(
+        frame: pd.DataFrame,
+        date_column: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """Tarih sütunu [start_date, end_date] aralığındaki satırları döndürür."""
+        if start_date is None and end_date is None:
+            return frame
+        
+        values = frame[date_column]
+        mask = values.notna()
+        if start_date is not None:
+            mask &= values >= pd.Timestamp(start_date)
+        if end_date is not None:
+            mask &= values <= pd.Timestamp(end_date)
+        return frame[mask]
+    
+    def users_by_department(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Dict[Any, int]:
+        """Oluşturulma tarihi aralıktaki kullanıcıların departmanlara göre dağılımını döndürür."""
+        users = self.filter_by_date_range(self.users_frame(), "created_at", start_date, end_date)
+        return _counts(users["department"])
+    
+    def users_by_role(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Dict[Any, int]:
+        """Oluşturulma tarihi aralıktaki kullanıcıların rollere göre dağılımını döndürür."""
+        users = self.filter_by_date_range(self.users_frame(), "created_at", start_date, end_date)
+        return _counts(users["role"])
+    
+    def licenses_by_type(self, status: Optional[str] = None) -> Dict[Any, int]:
+        """Lisans türlerine göre dağılımı döndürür; istenirse duruma göre süzer."""
+        licenses = self.licenses_frame()
+        if status is not None:
+            licenses = licenses[licenses["status"] == status]
+        return _counts(licenses["type"])
+    
+    def licenses_by_expiry_month(self, status: Optional[str] = ACTIVE_STATUS) -> Dict[str, int]:
+        """Lisansların bitiş aylarına (YYYY-MM) göre dağılımını ay sırasıyla döndürür."""
+        licenses = self.licenses_frame()
+        if status is not None:
+            licenses = licenses[licenses["status"] == status]
+        
+        months = licenses["end_date"].dropna().dt.strftime("%Y-%m")
+        return {month: int(count) for month, count in months.value_counts().sort_index().items()}
+    
+    def _frame(
+        self,
+        collection: str,
+        load: Callable[[], list],
+        columns: Tuple[str, ...],
+        date_columns: Tuple[str, ...]
+    ) -> pd.DataFrame:
+        """Koleksiyon tablosunu veri sürümüne göre önbellekten döndürür ya da yeniden kurar."""
+        version = self.data_manager.get_data_version(collection)
+        cached = self._frames.get(collection)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        records = load()
+        frame = pd.DataFrame.from_records(records) if records else _empty_frame(columns)
+        for column in columns + date_columns:
+            if column not in frame.columns:
+                frame[column] = None
+        # Tarihler bir kez ayrıştırılır; hatalı değerler NaT olur
+        for column in date_columns:
+            frame[column] = pd.to_datetime(frame[column], errors="coerce", format="ISO8601")
+        
+        self._frames[collection] = (version, frame)
+        return frame
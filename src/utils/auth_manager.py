@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, List, Optional
 import json
 import os
 from datetime import datetime
@@ -7,7 +7,11 @@ import base64
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from concurrent.futures import Future, ThreadPoolExecutor
 import secrets
+import threading
+from .password_hasher import PasswordHasher
+from .storage import atomic_write_json
 
 class AuthManager:
     """Kullanıcı kimlik doğrulama ve yetkilendirme yöneticisi."""
@@ -17,10 +21,24 @@ class AuthManager:
         self.users_file = os.path.join(data_dir, "users.json")
         self.roles_file = os.path.join(data_dir, "roles.json")
         self.permissions_file = os.path.join(data_dir, "permissions.json")
+        self.password_policy_file = os.path.join(data_dir, "password_policy.json")
         self.current_user_id = None
         self.current_username = None
+        # Kullanıcı ID -> etkin izin kümesi; rol veya kullanıcı değişince geçersiz kılınır
+        self._permission_cache: Dict[int, FrozenSet[str]] = {}
+        # Kullanıcı listesi, sözlükler ve oturum bilgisi arka plan iş parçacığıyla paylaşılır
+        self._lock = threading.RLock()
         self._load_data()
         
+        # Şifre işlemleri arayüzü kilitlememek için sırayla tek bir arka plan iş parçacığında çalışır
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="auth")
+        # Hash maliyeti ilk çalıştırmada bu makineye göre ölçülür ve saklanır
+        self.password_hasher = PasswordHasher(self._load_password_policy())
+        if not os.path.exists(self.password_policy_file):
+            # Ölçüm açılışı bekletmesin diye şifre işlemlerinden önce kuyruğa alınır;
+            # o zamana kadar eski parametrelerle üretilen hash'ler sonraki girişte yükseltilir
+            self._executor.submit(self.recalibrate_password_policy)
+        
         # Şifreleme anahtarı oluştur
         self._generate_key()
 
@@ -32,6 +50,7 @@ class AuthManager:
         else:
             with open(self.users_file, "r", encoding="utf-8") as f:
                 self.users = json.load(f)
+        self._rebuild_user_index()
         
         if not os.path.exists(self.roles_file):
             self._roles = {
@@ -57,21 +76,59 @@ class AuthManager:
             with open(self.permissions_file, "r", encoding="utf-8") as f:
                 self._permissions = json.load(f)
 
+    def reload(self):
+        """Kullanıcı, rol, izin ve şifre politikası dosyalarını diskten yeniden okur.
+        
+        Yedekten geri yüklemeden sonra çağrılır; oturumdaki kullanıcı yedekte yoksa oturum kapatılır.
+        """
+        with self._lock:
+            self._load_data()
+            self._invalidate_permissions()
+            policy = self._load_password_policy()
+            if policy is not None:
+                self.password_hasher.params = dict(policy)
+            if self.current_user_id not in self._users_by_id:
+                self.current_user_id = None
+                self.current_username = None
+
+    def _rebuild_user_index(self):
+        """Kullanıcı adı ve ID sözlüklerini kullanıcı listesinden oluşturur."""
+        self._users_by_name: Dict[str, Dict] = {user["username"]: user for user in self.users}
+        self._users_by_id: Dict[int, Dict] = {user["id"]: user for user in self.users}
+
+    def _next_user_id(self) -> int:
+        """Mevcut en büyük ID'nin bir fazlasını döndürür; en büyük ID'li kullanıcı silindiyse o ID yeniden verilir."""
+        return max(self._users_by_id, default=0) + 1
+
     def _save_users(self):
         """Kullanıcı verilerini kaydeder"""
-        os.makedirs(os.path.dirname(self.users_file), exist_ok=True)
-        with open(self.users_file, "w", encoding="utf-8") as f:
-            json.dump(self.users, f, indent=4, ensure_ascii=False)
+        atomic_write_json(self.users_file, self.users)
 
     def _save_roles(self):
         """Rol verilerini kaydeder"""
-        with open(self.roles_file, "w", encoding="utf-8") as f:
-            json.dump(self._roles, f, ensure_ascii=False, indent=4)
+        atomic_write_json(self.roles_file, self._roles, indent=4)
+
+    def _load_password_policy(self) -> Optional[Dict]:
+        """Şifre hash politikasını yükler; henüz ölçülmemişse None döndürür."""
+        if not os.path.exists(self.password_policy_file):
+            return None
+        with open(self.password_policy_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_password_policy(self, policy: Dict):
+        """Şifre hash politikasını kaydeder"""
+        atomic_write_json(self.password_policy_file, policy, indent=4)
+
+    def recalibrate_password_policy(self, target_seconds: float = 0.25, algorithm: Optional[str] = None) -> Dict:
+        """Hash maliyetini yeniden ölçer; mevcut hash'ler sonraki girişte yükseltilir."""
+        policy = PasswordHasher.calibrate(target_seconds, algorithm)
+        self.password_hasher.params = policy
+        self._save_password_policy(policy)
+        return policy
 
     def _save_permissions(self):
         """İzin verilerini kaydeder"""
-        with open(self.permissions_file, "w", encoding="utf-8") as f:
-            json.dump(self._permissions, f, ensure_ascii=False, indent=4)
+        atomic_write_json(self.permissions_file, self._permissions, indent=4)
 
     def _generate_key(self):
         """Şifreleme anahtarı oluşturur"""
@@ -86,17 +143,24 @@ class AuthManager:
         
         self._fernet = Fernet(key)
 
-    def _hash_password(self, password: str, salt: Optional[str] = None) -> tuple[str, str]:
-        """Şifreyi hashler ve tuz ekler."""
-        if salt is None:
-            salt = secrets.token_hex(16)
-        hashed = hashlib.pbkdf2_hmac(
-            "sha256",
-            password.encode("utf-8"),
-            salt.encode("utf-8"),
-            100000
-        ).hex()
-        return hashed, salt
+    def _hash_password(self, password: str, salt: Optional[str] = None) -> tuple[str, str, Dict]:
+        """Şifreyi güncel politikayla hashler ve tuz ekler."""
+        return self.password_hasher.hash(password, salt)
+
+    def _verify_password(self, user: Dict, password: str) -> bool:
+        """Şifreyi kullanıcının kayıtlı hash parametreleriyle doğrular."""
+        return self.password_hasher.verify(
+            password, user["password_hash"], user["salt"], user.get("password_params")
+        )
+
+    def _set_password(self, user: Dict, password: str):
+        """Kullanıcının şifresini güncel politikayla hashleyip kaydeder."""
+        self.password_hasher.forget(user["password_hash"])
+        hashed_password, salt, params = self._hash_password(password)
+        with self._lock:
+            user["password_hash"] = hashed_password
+            user["salt"] = salt
+            user["password_params"] = params
 
     def _encrypt_data(self, data: str) -> str:
         """Veriyi şifreler"""
@@ -113,69 +177,96 @@ class AuthManager:
     def register(self, username: str, password: str, role: str = "user") -> bool:
         """Yeni kullanıcı kaydeder."""
         # Kullanıcı adı kontrolü
-        if any(user["username"] == username for user in self.users):
+        if username in self._users_by_name:
             return False
             
-        # Şifre hashleme
-        hashed_password, salt = self._hash_password(password)
+        # Şifre hashleme; yavaş olduğu için kilit dışında yapılır
+        hashed_password, salt, params = self._hash_password(password)
         
-        # Yeni kullanıcı oluştur
-        new_user = {
-            "id": len(self.users) + 1,
-            "username": username,
-            "password_hash": hashed_password,
-            "salt": salt,
-            "role": role,
-            "is_active": True,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        }
+        with self._lock:
+            # Hash sırasında aynı adla kayıt yapılmış olabilir
+            if username in self._users_by_name:
+                return False
         
-        self.users.append(new_user)
-        self._save_users()
+            # Yeni kullanıcı oluştur
+            new_user = {
+                "id": self._next_user_id(),
+                "username": username,
+                "password_hash": hashed_password,
+                "salt": salt,
+                "password_params": params,
+                "role": role,
+                "is_active": True,
+                "created_at": datetime.now().isoformat(),
+                "updated_at": datetime.now().isoformat()
+            }
+        
+            self.users.append(new_user)
+            self._users_by_name[username] = new_user
+            self._users_by_id[new_user["id"]] = new_user
+            self._permission_cache.pop(new_user["id"], None)
+            self._save_users()
         return True
 
     def login(self, username: str, password: str) -> bool:
         """Kullanıcı girişi yapar."""
-        user = next((user for user in self.users if user["username"] == username), None)
+        user = self._users_by_name.get(username)
         if not user or not user["is_active"]:
             return False
             
-        hashed_password, _ = self._hash_password(password, user["salt"])
-        if hashed_password == user["password_hash"]:
+        if not self._verify_password(user, password):
+            return False
+        
+        # Eski veya zayıf parametrelerle saklanan hash, şifre elimizdeyken yükseltilir
+        if self.password_hasher.needs_upgrade(user.get("password_params")):
+            self._set_password(user, password)
+            with self._lock:
+                self._save_users()
+        
+        with self._lock:
             self.current_user_id = user["id"]
             self.current_username = username
-            return True
-        return False
+        return True
+
+    def login_async(self, username: str, password: str) -> Future:
+        """Girişi arka planda yapar; sonucu Future olarak döndürür."""
+        return self._executor.submit(self.login, username, password)
 
     def logout(self):
         """Kullanıcı çıkışı yapar."""
-        self.current_user_id = None
-        self.current_username = None
+        with self._lock:
+            self.current_user_id = None
+            self.current_username = None
 
     def change_password(self, user_id: int, current_password: str, new_password: str) -> bool:
         """Kullanıcı şifresini değiştirir."""
-        user = next((user for user in self.users if user["id"] == user_id), None)
+        user = self._users_by_id.get(user_id)
         if not user:
             return False
             
         # Mevcut şifre kontrolü
-        hashed_password, _ = self._hash_password(current_password, user["salt"])
-        if hashed_password != user["password_hash"]:
+        if not self._verify_password(user, current_password):
             return False
             
         # Yeni şifre hashleme
-        hashed_password, salt = self._hash_password(new_password)
-        user["password_hash"] = hashed_password
-        user["salt"] = salt
-        user["updated_at"] = datetime.now().isoformat()
+        self._set_password(user, new_password)
         
-        self._save_users()
+        with self._lock:
+            user["updated_at"] = datetime.now().isoformat()
+            self._save_users()
         return True
 
+    def change_password_async(self, user_id: int, current_password: str, new_password: str) -> Future:
+        """Şifre değişikliğini arka planda yapar; sonucu Future olarak döndürür."""
+        return self._executor.submit(self.change_password, user_id, current_password, new_password)
+
+    def register_async(self, username: str, password: str, role: str = "user") -> Future:
+        """Kullanıcı kaydını arka planda yapar; sonucu Future olarak döndürür."""
+        return self._executor.submit(self.register, username, password, role)
+
     def get_user(self, user_id: int) -> Optional[Dict]:
         """Kullanıcı bilgilerini getirir."""
-        return next((user for user in self.users if user["id"] == user_id), None)
+        return self._users_by_id.get(user_id)
 
     def get_all_users(self) -> List[Dict]:
         """Tüm kullanıcıları getirir."""
@@ -183,25 +274,44 @@ class AuthManager:
 
     def update_user(self, user_id: int, data: Dict) -> bool:
         """Kullanıcı bilgilerini günceller."""
-        user = next((user for user in self.users if user["id"] == user_id), None)
+        with self._lock:
+            return self._update_user(user_id, data)
+
+    def _update_user(self, user_id: int, data: Dict) -> bool:
+        """Kullanıcı bilgilerini kilit altında günceller."""
+        user = self._users_by_id.get(user_id)
         if not user:
             return False
             
         # Hassas alanları koru
-        protected_fields = ["id", "password_hash", "salt", "created_at"]
+        protected_fields = ["id", "password_hash", "salt", "password_params", "created_at"]
         for field in protected_fields:
             if field in data:
                 del data[field]
+        
+        # Kullanıcı adı değişiyorsa başka kullanıcıyla çakışmamalı
+        new_username = data.get("username", user["username"])
+        if new_username != user["username"]:
+            if new_username in self._users_by_name:
+                return False
+            del self._users_by_name[user["username"]]
+            self._users_by_name[new_username] = user
                 
         user.update(data)
         user["updated_at"] = datetime.now().isoformat()
+        self._permission_cache.pop(user_id, None)
         
         self._save_users()
         return True
 
     def delete_user(self, user_id: int) -> bool:
         """Kullanıcıyı siler."""
-        user = next((user for user in self.users if user["id"] == user_id), None)
+        with self._lock:
+            return self._delete_user(user_id)
+
+    def _delete_user(self, user_id: int) -> bool:
+        """Kullanıcıyı kilit altında siler."""
+        user = self._users_by_id.get(user_id)
         if not user:
             return False
             
@@ -210,31 +320,39 @@ class AuthManager:
             return False
             
         self.users.remove(user)
+        del self._users_by_id[user_id]
+        del self._users_by_name[user["username"]]
+        self._permission_cache.pop(user_id, None)
         self._save_users()
         return True
 
     def has_permission(self, user_id: int, permission: str) -> bool:
         """Kullanıcının yetkisini kontrol eder."""
+        permissions = self._permission_cache.get(user_id)
+        if permissions is None:
+            permissions = self._resolve_permissions(user_id)
+        
+        # "*" tüm yetkileri kapsar
+        return "*" in permissions or permission in permissions
+
+    def _resolve_permissions(self, user_id: int) -> FrozenSet[str]:
+        """Kullanıcının etkin izinlerini hesaplar ve önbelleğe alır."""
         user = self.get_user(user_id)
         if not user or not user["is_active"]:
-            return False
-            
-        # Admin tüm yetkilere sahip
-        if user["role"] == "admin":
-            return True
-            
-        # Kullanıcı yetkileri
-        user_permissions = {
-            "user": ["view_users", "edit_own_profile"],
-            "manager": ["view_users", "edit_users", "manage_licenses"],
-            "admin": ["all"]
-        }
+            permissions = frozenset()
+        else:
+            permissions = frozenset(self._roles.get(user["role"], []))
         
-        return permission in user_permissions.get(user["role"], [])
+        self._permission_cache[user_id] = permissions
+        return permissions
+
+    def _invalidate_permissions(self):
+        """Rol tanımları değiştiğinde tüm izin önbelleğini temizler."""
+        self._permission_cache.clear()
 
     def get_user_permissions(self, user_id: int) -> List[str]:
         """Kullanıcının izinlerini döndürür"""
-        user = next((u for u in self.users if u["id"] == user_id), None)
+        user = self._users_by_id.get(user_id)
         if not user:
             return []
         
@@ -246,6 +364,7 @@ class AuthManager:
             return False
         
         self._roles[name] = permissions
+        self._invalidate_permissions()
         self._save_roles()
         return True
 
@@ -255,6 +374,7 @@ class AuthManager:
             return False
         
         self._roles[name] = permissions
+        self._invalidate_permissions()
         self._save_roles()
         return True
 
@@ -269,6 +389,7 @@ class AuthManager:
                 return False
         
         del self._roles[name]
+        self._invalidate_permissions()
         self._save_roles()
         return True
 
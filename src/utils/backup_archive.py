@@ -0,0 +1,143 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+import hashlib
+import io
+import json
+import os
+import tarfile
+import tempfile
+
+try:
+    import zstandard
+except ImportError:  # zstandard isteğe bağlıdır; yoksa gzip kullanılır
+    zstandard = None
+
+ZSTD = "zstd"
+GZIP = "gzip"
+EXTENSIONS = {ZSTD: ".tar.zst", GZIP: ".tar.gz"}
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+GZIP_MAGIC = b"\x1f\x8b"
+MANIFEST_NAME = "manifest.json"
+# Her tar girdisinin özeti PAX başlığında taşınır; geri yüklemede girdi okunur okunmaz doğrulanır
+SHA256_HEADER = "BACKUP.sha256"
+
+
+def default_compression() -> str:
+    """Bu ortamda kullanılabilen en iyi sıkıştırma yöntemini döndürür."""
+    return ZSTD if zstandard is not None else GZIP
+
+
+def is_archive(path: str) -> bool:
+    """Yolun tek dosyalık bir yedek arşivi olup olmadığını döndürür."""
+    return path.endswith(tuple(EXTENSIONS.values())) and os.path.isfile(path)
+
+
+def archive_name(backup_id: str, compression: Optional[str] = None) -> str:
+    """Yedek ID'si için arşiv dosya adını döndürür."""
+    return backup_id + EXTENSIONS[compression or default_compression()]
+
+
+def write_archive(
+    path: str,
+    entries: Iterable[Tuple[str, bytes]],
+    compression: Optional[str] = None,
+    created_at: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """Girdileri sırayla sıkıştırılmış tar arşivine akıtır ve arşivin manifestini döndürür.
+    
+    Girdiler üreteçten geldikçe yazılır; arşivin tamamı ne bellekte ne de geçici bir
+    kopyada tutulur. Yarım kalan yazım hedef dosyayı bozmaz.
+    """
+    compression = compression or default_compression()
+    if compression == ZSTD and zstandard is None:
+        raise ValueError("zstd sıkıştırması için zstandard paketi gerekli")
+    created_at = created_at or datetime.now()
+    mtime = int(created_at.timestamp())
+    manifest = {"created_at": created_at.isoformat(), "compression": compression, "entries": {}}
+    
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp-", suffix=EXTENSIONS[compression], dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            compressor = None
+            if compression == ZSTD:
+                compressor = zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=False)
+                tar = tarfile.open(fileobj=compressor, mode="w|", format=tarfile.PAX_FORMAT)
+            else:
+                tar = tarfile.open(fileobj=raw, mode="w|gz", format=tarfile.PAX_FORMAT)
+            
+            with tar:
+                for name, data in entries:
+                    digest = hashlib.sha256(data).hexdigest()
+                    tar.addfile(_tar_info(name, len(data), mtime, digest), io.BytesIO(data))
+                    manifest["entries"][name] = {"sha256": digest, "size": len(data)}
+                
+                # Manifest en sona yazılır; yoksa arşiv yarım kalmış demektir
+                payload = json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8")
+                tar.addfile(_tar_info(MANIFEST_NAME, len(payload), mtime, None), io.BytesIO(payload))
+            if compressor is not None:
+                compressor.close()
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    
+    manifest["size"] = os.path.getsize(path)
+    return manifest
+
+
+def read_archive(path: str) -> Iterator[Tuple[str, bytes]]:
+    """Arşivdeki girdileri sırayla, özetlerini doğrulayarak üretir.
+    
+    Arşiv sonundaki manifest bulunamazsa veya girdilerle uyuşmazsa ValueError fırlatılır;
+    bu yüzden girdiler tümü okunmadan uygulanmamalıdır.
+    """
+    with open(path, "rb") as raw:
+        magic = raw.read(4)
+        raw.seek(0)
+        if magic.startswith(ZSTD_MAGIC):
+            if zstandard is None:
+                raise ValueError("zstd arşivini açmak için zstandard paketi gerekli")
+            tar = tarfile.open(fileobj=zstandard.ZstdDecompressor().stream_reader(raw), mode="r|")
+        elif magic.startswith(GZIP_MAGIC):
+            tar = tarfile.open(fileobj=raw, mode="r|gz")
+        else:
+            raise ValueError(f"Tanınmayan yedek arşivi: {path}")
+        
+        seen: Dict[str, str] = {}
+        manifest = None
+        with tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                data = tar.extractfile(member).read()
+                if member.name == MANIFEST_NAME:
+                    manifest = json.loads(data.decode("utf-8"))
+                    continue
+                
+                digest = hashlib.sha256(data).hexdigest()
+                if digest != member.pax_headers.get(SHA256_HEADER):
+                    raise ValueError(f"Yedek girdisi bozuk: {member.name}")
+                seen[member.name] = digest
+                yield member.name, data
+        
+        if manifest is None:
+            raise ValueError(f"Yedek arşivi eksik (manifest bulunamadı): {path}")
+        expected = {name: entry["sha256"] for name, entry in manifest["entries"].items()}
+        if expected != seen:
+            raise ValueError(f"Yedek arşivi manifestle uyuşmuyor: {path}")
+
+
+def _tar_info(name: str, size: int, mtime: int, digest: Optional[str]) -> tarfile.TarInfo:
+    """Tar girdi başlığını oluşturur."""
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mtime = mtime
+    info.mode = 0o600
+    if digest is not None:
+        info.pax_headers = {SHA256_HEADER: digest}
+    return info
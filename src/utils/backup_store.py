@@ -0,0 +1,190 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from .storage import atomic_write_json
+
+# Varsayılan saklama politikası: her periyot için tutulacak en yeni yedek sayısı
+DEFAULT_RETENTION = {"last": 10, "hourly": 24, "daily": 7, "weekly": 4}
+
+def _created(manifest: Dict[str, Any]) -> datetime:
+    return datetime.fromisoformat(manifest["created_at"])
+
+
+# Periyot adı -> yedeğin ait olduğu dilimi veren fonksiyon; "last" her yedeği ayrı dilim sayar
+RETENTION_BUCKETS = {
+    "last": lambda manifest: manifest["id"],
+    "hourly": lambda manifest: _created(manifest).strftime("%Y%m%d%H"),
+    "daily": lambda manifest: _created(manifest).strftime("%Y%m%d"),
+    "weekly": lambda manifest: _created(manifest).isocalendar()[:2],
+    "monthly": lambda manifest: _created(manifest).strftime("%Y%m"),
+}
+
+
+class BackupStore:
+    """İçerik adresli, tekilleştirilmiş artımlı yedek deposu.
+    
+    Her koleksiyon SHA-256 özetiyle adlandırılan bir blob olarak saklanır; değişmeyen
+    koleksiyonlar tekrar yazılmaz. Her yedek, girdi adlarını blob özetlerine eşleyen
+    küçük bir manifest dosyasıdır.
+    """
+    
+    PREFIX = "backup_"
+    
+    def __init__(self, root: str):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.manifests_dir = os.path.join(root, "manifests")
+        self._lock = threading.RLock()
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.manifests_dir, exist_ok=True)
+    
+    def create(self, entries: Dict[str, bytes], created_at: Optional[datetime] = None) -> Dict[str, Any]:
+        """Girdileri saklar, yalnızca yeni blobları yazar ve yedeğin manifestini döndürür."""
+        created_at = created_at or datetime.now()
+        with self._lock:
+            backup_id = self._new_id(created_at)
+            manifest_entries = {}
+            written = 0
+            written_bytes = 0
+            for name, data in entries.items():
+                digest = hashlib.sha256(data).hexdigest()
+                if self._write_blob(digest, data):
+                    written += 1
+                    written_bytes += len(data)
+                manifest_entries[name] = {"sha256": digest, "size": len(data)}
+            
+            manifest = {
+                "id": backup_id,
+                "created_at": created_at.isoformat(),
+                "entries": manifest_entries,
+                "stats": {"blobs_written": written, "bytes_written": written_bytes}
+            }
+            atomic_write_json(self._manifest_path(backup_id), manifest, indent=2)
+            return manifest
+    
+    def manifests(self) -> List[Dict[str, Any]]:
+        """Tüm yedeklerin manifestlerini en yeniden eskiye döndürür."""
+        manifests = []
+        for filename in os.listdir(self.manifests_dir):
+            if not (filename.startswith(self.PREFIX) and filename.endswith(".json")):
+                continue
+            try:
+                manifests.append(self.manifest(filename[:-len(".json")]))
+            except (OSError, ValueError) as e:
+                print(f"Yedek manifesti okunamadı ({filename}): {str(e)}")
+        return sorted(manifests, key=lambda manifest: (manifest["created_at"], manifest["id"]), reverse=True)
+    
+    def manifest(self, backup_id: str) -> Dict[str, Any]:
+        """Yedeğin manifestini döndürür."""
+        with open(self._manifest_path(backup_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+    
+    def exists(self, backup_id: str) -> bool:
+        """Yedeğin bulunup bulunmadığını döndürür."""
+        return os.path.exists(self._manifest_path(backup_id))
+    
+    def read(self, backup_id: str, names: Optional[Iterable[str]] = None) -> Dict[str, bytes]:
+        """Yedeğin girdilerini özetlerini doğrulayarak okur."""
+        entries = self.manifest(backup_id)["entries"]
+        if names is not None:
+            entries = {name: entries[name] for name in names if name in entries}
+        
+        result = {}
+        for name, entry in entries.items():
+            with open(self._blob_path(entry["sha256"]), "rb") as f:
+                data = f.read()
+            if hashlib.sha256(data).hexdigest() != entry["sha256"]:
+                raise ValueError(f"Yedek girdisi bozuk: {backup_id}/{name}")
+            result[name] = data
+        return result
+    
+    def delete(self, backup_id: str, collect: bool = True):
+        """Yedeğin manifestini siler; istenirse sahipsiz kalan blobları temizler."""
+        with self._lock:
+            os.remove(self._manifest_path(backup_id))
+            if collect:
+                self.collect_garbage()
+    
+    def prune(self, retention: Dict[str, int]) -> List[str]:
+        """Saklama politikasının dışında kalan yedekleri siler ve silinen ID'leri döndürür."""
+        with self._lock:
+            manifests = self.manifests()
+            keep = {manifest["id"] for manifest in manifests[:1]}
+            for period, count in retention.items():
+                bucket_of = RETENTION_BUCKETS[period]
+                seen = set()
+                for manifest in manifests:
+                    if len(seen) >= count:
+                        break
+                    bucket = bucket_of(manifest)
+                    if bucket not in seen:
+                        # Her dilimin en yeni yedeği tutulur
+                        seen.add(bucket)
+                        keep.add(manifest["id"])
+            
+            removed = [manifest["id"] for manifest in manifests if manifest["id"] not in keep]
+            for backup_id in removed:
+                os.remove(self._manifest_path(backup_id))
+            if removed:
+                self.collect_garbage()
+            return removed
+    
+    def collect_garbage(self) -> int:
+        """Hiçbir manifestin başvurmadığı blobları siler ve silinen blob sayısını döndürür."""
+        with self._lock:
+            referenced = set()
+            for manifest in self.manifests():
+                referenced.update(entry["sha256"] for entry in manifest["entries"].values())
+            
+            removed = 0
+            for prefix in os.listdir(self.objects_dir):
+                directory = os.path.join(self.objects_dir, prefix)
+                for filename in os.listdir(directory):
+                    # Yarım kalmış geçici dosyalar da temizlenir
+                    if filename not in referenced:
+                        os.remove(os.path.join(directory, filename))
+                        removed += 1
+                if not os.listdir(directory):
+                    os.rmdir(directory)
+            return removed
+    
+    def _write_blob(self, digest: str, data: bytes) -> bool:
+        """Blob yoksa yazar; yazıldıysa True döndürür."""
+        path = self._blob_path(digest)
+        if os.path.exists(path):
+            return False
+        
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return True
+    
+    def _new_id(self, created_at: datetime) -> str:
+        """Zaman damgasından benzersiz bir yedek ID'si üretir."""
+        base = f"{self.PREFIX}{created_at.strftime('%Y%m%d_%H%M%S')}"
+        backup_id = base
+        counter = 1
+        while self.exists(backup_id):
+            backup_id = f"{base}_{counter}"
+            counter += 1
+        return backup_id
+    
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], digest)
+    
+    def _manifest_path(self, backup_id: str) -> str:
+        return os.path.join(self.manifests_dir, f"{backup_id}.json")
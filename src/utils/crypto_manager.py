@@ -1,15 +1,34 @@
 import os
 import base64
+import glob
+import hashlib
 import json
+import struct
 import time
-from typing import Optional, Dict, Any
-from cryptography.fernet import Fernet
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, BinaryIO, Iterable, Iterator, List, Tuple
+from cryptography.fernet import Fernet, MultiFernet
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 class CryptoManager:
     """Hassas veri şifreleme yöneticisi."""
     
+    # Akış şifreleme biçimi: başlık + [uzunluk, bayrak, AES-GCM çerçevesi]...
+    STREAM_MAGIC = b"CMS1"
+    STREAM_HEADER = struct.Struct(">4s8sI16s")  # sihirli değer, anahtar kimliği, parça boyutu, tuz
+    FRAME_HEADER = struct.Struct(">IB")  # şifreli çerçeve uzunluğu, son çerçeve bayrağı
+    FINAL_FLAG = 1
+    CHUNK_SIZE = 1024 * 1024
+    # Başlıktaki parça boyutu güvenilmez girdidir; bundan büyük çerçeveler için bellek ayrılmaz
+    MAX_CHUNK_SIZE = 64 * 1024 * 1024
+    GCM_TAG_SIZE = 16
+    
+    # Metin belirteçleri "<anahtar kimliği>:<Fernet belirteci>" biçimindedir
+    KEY_ID_SEPARATOR = ":"
+    
     def __init__(self, data_dir: str = "data"):
         self.data_dir = data_dir
         self.keys_dir = os.path.join(data_dir, "keys")
@@ -17,7 +36,7 @@ class CryptoManager:
         self._load_or_generate_key()
     
     def _load_or_generate_key(self):
-        """Şifreleme anahtarını yükler veya oluşturur."""
+        """Güncel anahtarı ve döndürülmüş eski anahtarları yükler; yoksa yeni anahtar oluşturur."""
         os.makedirs(self.keys_dir, exist_ok=True)
         
         if os.path.exists(self.key_file):
@@ -28,7 +47,43 @@ class CryptoManager:
             with open(self.key_file, "wb") as f:
                 f.write(self.key)
         
-        self._fernet = Fernet(self.key)
+        self.key_id = self.get_key_id(self.key)
+        self._keys: Dict[str, bytes] = {self.key_id: self.key}
+        self._fernets: Dict[str, Fernet] = {self.key_id: Fernet(self.key)}
+        
+        # Eski anahtarlar yalnızca şifre çözmek için tutulur, en yenisi önce denenir
+        old_key_files = sorted(glob.glob(self.key_file + ".*"), key=self._key_file_timestamp, reverse=True)
+        for key_file in old_key_files:
+            with open(key_file, "rb") as f:
+                key = f.read().strip()
+            key_id = self.get_key_id(key)
+            if key_id not in self._keys:
+                self._keys[key_id] = key
+                self._fernets[key_id] = Fernet(key)
+        
+        self._fernet = self._fernets[self.key_id]
+        self._multi_fernet = MultiFernet(list(self._fernets.values()))
+    
+    def reload_keys(self):
+        """Anahtarları diskten yeniden yükler; başka bir örnek anahtar döndürdüğünde kullanılır."""
+        self._load_or_generate_key()
+    
+    @staticmethod
+    def get_key_id(key: bytes) -> str:
+        """Anahtarın kısa, gizli olmayan kimliğini döndürür."""
+        return hashlib.sha256(key.strip()).hexdigest()[:16]
+    
+    @staticmethod
+    def _key_file_timestamp(key_file: str) -> int:
+        """Yedek anahtar dosya adındaki zaman damgasını döndürür."""
+        try:
+            return int(key_file.rsplit(".", 1)[1])
+        except (IndexError, ValueError):
+            return 0
+    
+    def known_key_ids(self) -> List[str]:
+        """Güncel anahtar önce olmak üzere bilinen anahtar kimliklerini döndürür."""
+        return list(self._keys)
     
     def _derive_key(self, password: str, salt: bytes) -> bytes:
         """PBKDF2 ile anahtar türetir."""
@@ -43,39 +98,289 @@ class CryptoManager:
     def encrypt_data(self, data: Dict[str, Any]) -> str:
         """Veriyi şifreler."""
         json_data = json.dumps(data, ensure_ascii=False)
-        encrypted_data = self._fernet.encrypt(json_data.encode())
+        encrypted_data = self.encrypt_string(json_data).encode("ascii")
         return base64.b64encode(encrypted_data).decode()
     
     def decrypt_data(self, encrypted_data: str) -> Dict[str, Any]:
         """Şifrelenmiş veriyi çözer."""
-        encrypted_bytes = base64.b64decode(encrypted_data)
-        decrypted_bytes = self._fernet.decrypt(encrypted_bytes)
-        return json.loads(decrypted_bytes.decode())
-    
-    def encrypt_file(self, input_file: str, output_file: str):
-        """Dosyayı şifreler."""
-        with open(input_file, "rb") as f:
-            data = f.read()
+        encrypted_token = base64.b64decode(encrypted_data).decode("ascii")
+        return json.loads(self.decrypt_string(encrypted_token))
+    
+    def encrypt_string(self, data: str) -> str:
+        """Metni güncel anahtarla şifreler ve anahtar kimliği önekli belirteç döndürür."""
+        token = self._fernet.encrypt(data.encode("utf-8")).decode("ascii")
+        return f"{self.key_id}{self.KEY_ID_SEPARATOR}{token}"
+    
+    def decrypt_string(self, token: str) -> str:
+        """Belirteci, başlığındaki anahtarla veya bilinen tüm anahtarları deneyerek çözer."""
+        key_id, fernet_token = self.split_token(token)
+        if key_id is None:
+            # Anahtar kimliği taşımayan eski belirteçler
+            return self._multi_fernet.decrypt(fernet_token.encode("ascii")).decode("utf-8")
+        
+        fernet = self._fernets.get(key_id)
+        if fernet is None:
+            raise ValueError(f"Bilinmeyen şifreleme anahtarı: {key_id}")
+        return fernet.decrypt(fernet_token.encode("ascii")).decode("utf-8")
+    
+    @classmethod
+    def split_token(cls, token: str) -> Tuple[Optional[str], str]:
+        """Belirteci (anahtar kimliği, Fernet belirteci) olarak ayırır."""
+        key_id, separator, fernet_token = token.partition(cls.KEY_ID_SEPARATOR)
+        if not separator:
+            return None, token
+        return key_id, fernet_token
+    
+    def is_current(self, token: str) -> bool:
+        """Belirtecin güncel anahtarla şifrelenip şifrelenmediğini döndürür."""
+        return self.split_token(token)[0] == self.key_id
+    
+    def reencrypt_string(self, token: str) -> str:
+        """Belirteci güncel anahtarla yeniden şifreler."""
+        if self.is_current(token):
+            return token
+        return self.encrypt_string(self.decrypt_string(token))
+    
+    def encrypt_file(self, input_file: str, output_file: str, workers: int = 1):
+        """Dosyayı sabit bellekle, parça parça şifreler."""
+        temp_file = output_file + ".tmp"
+        try:
+            with open(input_file, "rb") as src, open(temp_file, "wb") as dst:
+                self.encrypt_stream(src, dst, workers=workers)
+            os.replace(temp_file, output_file)
+        except BaseException:
+            self._remove_quietly(temp_file)
+            raise
+    
+    def decrypt_file(self, input_file: str, output_file: str, workers: int = 1):
+        """Şifrelenmiş dosyayı çözer; eski tek parça Fernet dosyalarını da okur."""
+        temp_file = output_file + ".tmp"
+        try:
+            with open(input_file, "rb") as src:
+                magic = src.read(len(self.STREAM_MAGIC))
+                src.seek(0)
+                with open(temp_file, "wb") as dst:
+                    if magic == self.STREAM_MAGIC:
+                        self.decrypt_stream(src, dst, workers=workers)
+                    else:
+                        dst.write(self._multi_fernet.decrypt(src.read()))
+            os.replace(temp_file, output_file)
+        except BaseException:
+            # Doğrulanmamış kısmi açık metin diskte bırakılmaz
+            self._remove_quietly(temp_file)
+            raise
+    
+    def file_key_id(self, input_file: str) -> Optional[str]:
+        """Şifreli dosyanın başlığındaki anahtar kimliğini döndürür; eski biçimde None döner."""
+        with open(input_file, "rb") as src:
+            header = src.read(self.STREAM_HEADER.size)
+        if len(header) != self.STREAM_HEADER.size or not header.startswith(self.STREAM_MAGIC):
+            return None
+        return self.STREAM_HEADER.unpack(header)[1].hex()
+    
+    def reencrypt_file(self, input_file: str, workers: int = 1) -> bool:
+        """Dosyayı açık metni diske yazmadan güncel anahtarla yeniden şifreler."""
+        if self.file_key_id(input_file) == self.key_id:
+            return False
         
-        encrypted_data = self._fernet.encrypt(data)
+        temp_file = input_file + ".rekey"
+        written = hashlib.sha256()
+        try:
+            with open(input_file, "rb") as src, open(temp_file, "wb") as dst:
+                if src.read(len(self.STREAM_MAGIC)) == self.STREAM_MAGIC:
+                    src.seek(0)
+                    chunks = self._decrypted_chunks(src, workers)
+                else:
+                    src.seek(0)
+                    chunks = iter([self._multi_fernet.decrypt(src.read())])
+                # Kaynağın parça boyutu başlıkla uyuşmayabilir; çerçeveler CHUNK_SIZE'a göre yeniden bölünür
+                blocks = self._reblock(chunks, self.CHUNK_SIZE)
+                self._write_frames(self._hashed(blocks, written), dst, self.CHUNK_SIZE, workers)
+            
+            # Tek kopyanın üzerine yazmadan önce yeni dosyanın çözülüp aynı açık metni verdiği doğrulanır
+            verified = hashlib.sha256()
+            with open(temp_file, "rb") as src:
+                for chunk in self._decrypted_chunks(src, workers):
+                    verified.update(chunk)
+            if verified.digest() != written.digest():
+                raise ValueError(f"Yeniden şifrelenen dosya doğrulanamadı: {input_file}")
+            os.replace(temp_file, input_file)
+        except BaseException:
+            self._remove_quietly(temp_file)
+            raise
+        return True
+    
+    @staticmethod
+    def _remove_quietly(path: str):
+        """Dosya varsa siler."""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    
+    def encrypt_stream(self, src: BinaryIO, dst: BinaryIO, chunk_size: Optional[int] = None, workers: int = 1):
+        """Akışı 1 MiB'lık AES-GCM çerçeveleri halinde şifreler."""
+        chunk_size = chunk_size or self.CHUNK_SIZE
+        self._write_frames(self._read_blocks(src, chunk_size), dst, chunk_size, workers)
+    
+    def decrypt_stream(self, src: BinaryIO, dst: BinaryIO, workers: int = 1):
+        """Çerçeveli akışı çözer; eksik, sıralaması bozuk veya kesilmiş akışları reddeder."""
+        for chunk in self._decrypted_chunks(src, workers):
+            dst.write(chunk)
+    
+    def _write_frames(self, chunks: Iterable[bytes], dst: BinaryIO, chunk_size: int, workers: int):
+        """Açık metin parçalarını güncel anahtarla çerçeveleyip yazar."""
+        salt = os.urandom(16)
+        header = self.STREAM_HEADER.pack(self.STREAM_MAGIC, bytes.fromhex(self.key_id), chunk_size, salt)
+        cipher = AESGCM(self._stream_key(self.key, salt))
+        dst.write(header)
         
-        with open(output_file, "wb") as f:
-            f.write(encrypted_data)
+        def encrypt_chunk(item: Tuple[int, bytes, bool]) -> Tuple[bytes, bool]:
+            sequence, chunk, final = item
+            aad = self._frame_aad(header, sequence, final)
+            return cipher.encrypt(self._frame_nonce(sequence), chunk, aad), final
+        
+        for frame, final in self._map_ordered(encrypt_chunk, self._sequence_chunks(chunks), workers):
+            dst.write(self.FRAME_HEADER.pack(len(frame), self.FINAL_FLAG if final else 0))
+            dst.write(frame)
     
-    def decrypt_file(self, input_file: str, output_file: str):
-        """Şifrelenmiş dosyayı çözer."""
-        with open(input_file, "rb") as f:
-            encrypted_data = f.read()
+    def _decrypted_chunks(self, src: BinaryIO, workers: int) -> Iterator[bytes]:
+        """Çerçeveli akışı, başlıktaki anahtarla çözülmüş parçalar halinde üretir."""
+        header = src.read(self.STREAM_HEADER.size)
+        if len(header) != self.STREAM_HEADER.size:
+            raise ValueError("Şifreli akış başlığı eksik")
+        magic, key_id, chunk_size, salt = self.STREAM_HEADER.unpack(header)
+        if magic != self.STREAM_MAGIC:
+            raise ValueError("Tanınmayan şifreli akış biçimi")
+        if chunk_size > self.MAX_CHUNK_SIZE:
+            raise ValueError(f"Şifreli akışın parça boyutu çok büyük: {chunk_size}")
+        key = self._keys.get(key_id.hex())
+        if key is None:
+            raise ValueError(f"Bilinmeyen şifreleme anahtarı: {key_id.hex()}")
+        cipher = AESGCM(self._stream_key(key, salt))
+        
+        def decrypt_frame(item: Tuple[int, bytes, bool]) -> Tuple[bytes, bool]:
+            sequence, frame, final = item
+            aad = self._frame_aad(header, sequence, final)
+            return cipher.decrypt(self._frame_nonce(sequence), frame, aad), final
         
-        decrypted_data = self._fernet.decrypt(encrypted_data)
+        finished = False
+        frames = self._read_frames(src, chunk_size + self.GCM_TAG_SIZE)
+        for chunk, final in self._map_ordered(decrypt_frame, frames, workers):
+            yield chunk
+            finished = final
+        
+        if not finished:
+            raise ValueError("Şifreli akış kesilmiş: son çerçeve bulunamadı")
+    
+    @staticmethod
+    def _stream_key(key: bytes, salt: bytes) -> bytes:
+        """Ana anahtardan dosyaya özgü AES-GCM anahtarı türetir."""
+        hkdf = HKDF(algorithm=hashes.SHA256(), length=32, salt=salt, info=b"crypto-manager-stream")
+        return hkdf.derive(base64.urlsafe_b64decode(key))
+    
+    @staticmethod
+    def _frame_nonce(sequence: int) -> bytes:
+        """Sıra numarasından nonce üretir; anahtar dosyaya özgü olduğu için tekrarlanmaz."""
+        return sequence.to_bytes(12, "big")
+    
+    @classmethod
+    def _frame_aad(cls, header: bytes, sequence: int, final: bool) -> bytes:
+        """Çerçeveyi başlığa, sırasına ve son olup olmadığına bağlar."""
+        return header + struct.pack(">QB", sequence, cls.FINAL_FLAG if final else 0)
+    
+    @staticmethod
+    def _read_blocks(src: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+        """Akışı sabit boyutlu bloklar halinde okur."""
+        while True:
+            block = src.read(chunk_size)
+            if not block:
+                return
+            yield block
+    
+    @staticmethod
+    def _reblock(chunks: Iterable[bytes], chunk_size: int) -> Iterator[bytes]:
+        """Farklı boyutlardaki parçaları chunk_size boyutlu bloklara böler; yalnızca sonuncusu kısa kalabilir."""
+        buffer = bytearray()
+        for chunk in chunks:
+            buffer += chunk
+            while len(buffer) >= chunk_size:
+                yield bytes(buffer[:chunk_size])
+                del buffer[:chunk_size]
+        if buffer:
+            yield bytes(buffer)
+    
+    @staticmethod
+    def _hashed(chunks: Iterable[bytes], digest) -> Iterator[bytes]:
+        """Parçaları değiştirmeden üretirken özetlerini digest'e ekler."""
+        for chunk in chunks:
+            digest.update(chunk)
+            yield chunk
+    
+    @staticmethod
+    def _sequence_chunks(chunks: Iterable[bytes]) -> Iterator[Tuple[int, bytes, bool]]:
+        """Parçaları (sıra, parça, son mu) üçlüleri halinde üretir; boş akış tek boş çerçeve olur."""
+        chunks = iter(chunks)
+        sequence = 0
+        chunk = next(chunks, b"")
+        while True:
+            next_chunk = next(chunks, None)
+            final = next_chunk is None
+            yield sequence, chunk, final
+            if final:
+                return
+            sequence += 1
+            chunk = next_chunk
+    
+    def _read_frames(self, src: BinaryIO, max_length: int) -> Iterator[Tuple[int, bytes, bool]]:
+        """Şifreli çerçeveleri (sıra, çerçeve, son mu) üçlüleri halinde okur."""
+        sequence = 0
+        while True:
+            frame_header = src.read(self.FRAME_HEADER.size)
+            if not frame_header:
+                return
+            if len(frame_header) != self.FRAME_HEADER.size:
+                raise ValueError("Şifreli akış kesilmiş: çerçeve başlığı eksik")
+            length, flags = self.FRAME_HEADER.unpack(frame_header)
+            # Çerçeve, başlıktaki parça boyutu ile doğrulama etiketinden uzun olamaz
+            if length > max_length:
+                raise ValueError(f"Şifreli çerçeve çok uzun: {length}")
+            frame = src.read(length)
+            if len(frame) != length:
+                raise ValueError("Şifreli akış kesilmiş: çerçeve eksik")
+            final = bool(flags & self.FINAL_FLAG)
+            yield sequence, frame, final
+            if final:
+                if src.read(1):
+                    raise ValueError("Son çerçeveden sonra beklenmeyen veri")
+                return
+            sequence += 1
+    
+    @staticmethod
+    def _map_ordered(func, items: Iterator, workers: int) -> Iterator:
+        """Öğeleri sırayı koruyarak işler; paralelde bellekte sınırlı sayıda parça tutulur."""
+        if workers <= 1:
+            for item in items:
+                yield func(item)
+            return
         
-        with open(output_file, "wb") as f:
-            f.write(decrypted_data)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = []
+            for item in items:
+                pending.append(executor.submit(func, item))
+                if len(pending) >= workers * 2:
+                    yield pending.pop(0).result()
+            for future in pending:
+                yield future.result()
     
     def rotate_key(self):
         """Şifreleme anahtarını değiştirir."""
-        # Eski anahtarı yedekle
-        backup_file = os.path.join(self.keys_dir, f"encryption.key.{int(time.time())}")
+        # Eski anahtarı yedekle; eski anahtar şifre çözmek için kullanılmaya devam eder
+        timestamp = int(time.time())
+        backup_file = os.path.join(self.keys_dir, f"encryption.key.{timestamp}")
+        while os.path.exists(backup_file):
+            timestamp += 1
+            backup_file = os.path.join(self.keys_dir, f"encryption.key.{timestamp}")
         os.rename(self.key_file, backup_file)
         
         # Yeni anahtar oluştur
@@ -83,6 +388,6 @@ class CryptoManager:
         with open(self.key_file, "wb") as f:
             f.write(self.key)
         
-        self._fernet = Fernet(self.key)
+        self._load_or_generate_key()
         
         return backup_file 
\ No newline at end of file
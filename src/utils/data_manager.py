@@ -2,16 +2,49 @@ from PyQt6.QtCore import QObject, pyqtSignal
 import json
 import os
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from PyQt6.QtCore import QTimer
 import uuid
+import shutil
+import tempfile
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from .logger import Logger
+from .search_index import SearchIndex, FieldIndex
+from .filters import Query, SortKeyCache, parse_datetime
+from .license_statistics import LicenseStatistics
+from .expiry_scheduler import ExpiryScheduler
+from .backup_store import BackupStore, DEFAULT_RETENTION, RETENTION_BUCKETS
+from .backup_archive import archive_name, is_archive, read_archive, write_archive
 
 class DataManager(QObject):
     """Mock veri yönetimi sınıfı."""
     
     data_changed = pyqtSignal()
+    backup_finished = pyqtSignal(bool)
+    # Geri yükleme kimlik doğrulama dosyalarını da değiştirdiğinden AuthManager bu sinyalle yeniden yüklenir
+    backup_restored = pyqtSignal()
+    
+    # Yedek girdi adı -> koleksiyonun tutulduğu öznitelik
+    BACKUP_COLLECTIONS = {
+        "users": "_users",
+        "licenses": "_licenses",
+        "groups": "_groups",
+        "categories": "_categories"
+    }
+    # Yedek girdi adı -> veri dizinindeki dosya; bu koleksiyonlar bellekte güncel tutulmadan
+    # doğrudan dosyadan okunup yazıldığı için bellekteki kopya değil dosyanın kendisi yedeklenir
+    BACKUP_FILES = {
+        "templates": os.path.join("mock", "templates.json"),
+        # İmza şablonları (signatures_file) ve get_signatures'ın okuduğu imzalar ayrı dosyalardadır
+        "signatures": "signatures.json",
+        "mock_signatures": os.path.join("mock", "signatures.json")
+    }
+    LEGACY_BACKUP_COLLECTIONS = ("users", "licenses", "templates")
+    # Kimlik doğrulama yöneticisinin veri dizinindeki dosyaları
+    AUTH_BACKUP_FILES = ("roles.json", "permissions.json", "password_policy.json")
     
     def __init__(self, data_dir: str = "data"):
         super().__init__()
@@ -22,12 +55,29 @@ class DataManager(QObject):
         self._signatures = None
         self._backup_timer = None
         self._backup_interval = 24 * 60 * 60 * 1000  # 24 saat
+        self._backup_retention = dict(DEFAULT_RETENTION)
+        self._backup_stores: Dict[str, BackupStore] = {}
+        # Yedek anlık görüntüsü ve geri yükleme bu kilitle koleksiyon değişikliklerinden ayrılır
+        self._data_lock = threading.RLock()
+        self._backup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="backup")
         self._categories = []  # Yeni kategori listesi
+        self._user_index = SearchIndex(("full_name", "email", "department"))
+        self._user_fields = FieldIndex(("department", "role", "is_active", "status"))
+        self._license_fields = FieldIndex(("status", "type", "user_id"), id_field="key")
+        self._user_sort_cache = SortKeyCache("id")
+        self._license_sort_cache = SortKeyCache("key")
+        self._license_stats = LicenseStatistics()
+        self.license_scheduler = ExpiryScheduler(parent=self)
+        self._versions = {"users": 0, "licenses": 0, "templates": 0}
+        self._template_index = SearchIndex(("name", "description", "content"))
+        self._template_index_stamp = None
         self.groups_file = os.path.join(data_dir, "groups.json")
         
         self.users_file = os.path.join(data_dir, "users.json")
         self.licenses_file = os.path.join(data_dir, "licenses.json")
         self.templates_file = os.path.join(data_dir, "templates.json")
+        # Şablon penceresi, şablon araması ve raporlar şablonları bu dosyadan okur
+        self.mock_templates_file = os.path.join(data_dir, "mock", "templates.json")
         
         self.signatures_file = os.path.join(data_dir, "signatures.json")
         self.logger = Logger()
@@ -54,6 +104,7 @@ class DataManager(QObject):
                 self._users = json.load(f)
         else:
             self._users = []
+        self._rebuild_user_indexes()
     
     def load_templates(self):
         """Şablon verilerini yükle"""
@@ -70,6 +121,7 @@ class DataManager(QObject):
                 self._licenses = json.load(f)
         else:
             self._licenses = []
+        self._rebuild_license_indexes()
     
     def load_signatures(self):
         """İmza verilerini yükle"""
@@ -108,6 +160,7 @@ class DataManager(QObject):
         os.makedirs(os.path.dirname(self.templates_file), exist_ok=True)
         with open(self.templates_file, "w", encoding="utf-8") as f:
             json.dump(templates, f, ensure_ascii=False, indent=4)
+        self._bump_version("templates")
     
     def save_licenses(self):
         """Lisans verilerini kaydet"""
@@ -136,23 +189,23 @@ class DataManager(QObject):
         if self._users is None:
             self.load_users()
         
-        users = self._users.copy()
+        query = self.query_users()
         
         if department:
-            users = [u for u in users if u["department"] == department]
+            query.where("department", department)
         
         if role:
-            users = [u for u in users if u["role"] == role]
+            query.where("role", role)
         
         if active_only:
-            users = [u for u in users if u["is_active"]]
+            query.filter(lambda u: u["is_active"])
         
-        return users
+        return query.all()
     
     def get_templates(self) -> list:
         """Tüm şablonları getir"""
         try:
-            with open(os.path.join(self.data_dir, "mock", "templates.json"), "r", encoding="utf-8") as f:
+            with open(self.mock_templates_file, "r", encoding="utf-8") as f:
                 return json.load(f)
         except FileNotFoundError:
             return []
@@ -168,25 +221,54 @@ class DataManager(QObject):
         if self._licenses is None:
             self.load_licenses()
         
-        licenses = self._licenses.copy()
+        query = self.query_licenses()
         
         if status:
-            licenses = [l for l in licenses if l["status"] == status]
+            query.where("status", status)
         
         if type:
-            licenses = [l for l in licenses if l["type"] == type]
+            query.where("type", type)
         
-        return licenses
+        return query.all()
     
     def get_user_by_id(self, user_id: int) -> Optional[Dict[str, Any]]:
         """ID'ye göre kullanıcı döndürür."""
         if self._users is None:
             self.load_users()
         
-        for user in self._users:
-            if user["id"] == user_id:
-                return user
-        return None
+        return self._user_fields.get(user_id)
+    
+    def query_users(self) -> Query:
+        """Kullanıcılar üzerinde ikincil indeksleri kullanan bir sorgu döndürür."""
+        if self._users is None:
+            self.load_users()
+        return Query(self._users, self._user_fields, self._user_sort_cache, self._versions["users"])
+    
+    def query_licenses(self) -> Query:
+        """Lisanslar üzerinde ikincil indeksleri kullanan bir sorgu döndürür."""
+        if self._licenses is None:
+            self.load_licenses()
+        return Query(self._licenses, self._license_fields, self._license_sort_cache, self._versions["licenses"])
+    
+    def query_templates(self) -> Query:
+        """Şablonlar üzerinde bir sorgu döndürür."""
+        return Query(self.get_templates())
+    
+    def search_users(self, text: str) -> Set[int]:
+        """Ad, e-posta veya departmanında arama metni geçen kullanıcı ID'lerini döndürür."""
+        if self._users is None:
+            self.load_users()
+        return self._user_index.search(text)
+    
+    def search_templates(self, text: str) -> Set[str]:
+        """Ad, açıklama veya içeriğinde arama metni geçen şablon ID'lerini döndürür."""
+        stamp = self._file_stamp(self.mock_templates_file)
+        
+        # Şablon dosyası değiştiyse indeksi yeniden oluştur
+        if stamp is None or stamp != self._template_index_stamp:
+            self._template_index.rebuild(self.get_templates())
+            self._template_index_stamp = stamp
+        return self._template_index.search(text)
     
     def get_template_by_id(self, template_id: str) -> dict:
         """ID'ye göre şablon getir"""
@@ -201,10 +283,7 @@ class DataManager(QObject):
         if self._licenses is None:
             self.load_licenses()
         
-        for license in self._licenses:
-            if license["key"] == key:
-                return license
-        return None
+        return self._license_fields.get(key)
     
     def add_template(self, name, content, description="", category_id=None, is_active=True):
         """Yeni şablon ekler."""
@@ -220,6 +299,7 @@ class DataManager(QObject):
         }
         self._templates.append(template)
         self.save_templates()
+        self._template_index_stamp = None
         return template
 
     def update_template(self, template_id, name=None, content=None, description=None, category_id=None, is_active=None):
@@ -238,6 +318,7 @@ class DataManager(QObject):
                     template["is_active"] = is_active
                 template["updated_at"] = datetime.now().isoformat()
                 self.save_templates()
+                self._template_index_stamp = None
                 return True
         return False
 
@@ -299,6 +380,7 @@ class DataManager(QObject):
             }
             
             self._licenses.append(new_license)
+            self._index_license(new_license)
             self.save_licenses()
             return True
             
@@ -322,6 +404,7 @@ class DataManager(QObject):
                 "status": license_data["status"],
                 "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             })
+            self._index_license(license)
             
             self.save_licenses()
             return True
@@ -338,6 +421,7 @@ class DataManager(QObject):
                 return False
                 
             self._licenses.remove(license)
+            self._unindex_license(key)
             self.save_licenses()
             return True
             
@@ -350,13 +434,27 @@ class DataManager(QObject):
         if self._users is None:
             self.load_users()
         
-        # Yeni ID oluştur
-        new_id = max(u["id"] for u in self._users) + 1 if self._users else 1
+        new_user = self.build_user(user_data, self.next_user_id())
+        
+        self._users.append(new_user)
+        self._index_user(new_user)
+        self.save_users()
         
-        # Yeni kullanıcıyı oluştur
-        new_user = {
-            "id": new_id,
-            "username": f"user{new_id}",
+        return new_user
+    
+    def next_user_id(self) -> int:
+        """Sıradaki boş kullanıcı ID'sini döndürür."""
+        if self._users is None:
+            self.load_users()
+        return max(u["id"] for u in self._users) + 1 if self._users else 1
+    
+    @staticmethod
+    def build_user(user_data: Dict[str, Any], user_id: int) -> Dict[str, Any]:
+        """Form veya içe aktarma verisinden varsayılanlarıyla tam bir kullanıcı kaydı oluşturur."""
+        now = datetime.now().isoformat()
+        return {
+            "id": user_id,
+            "username": f"user{user_id}",
             "email": user_data["email"],
             "full_name": user_data["full_name"],
             "title": "",  # TODO: Eklenecek
@@ -365,22 +463,18 @@ class DataManager(QObject):
             "mobile": "",  # TODO: Eklenecek
             "manager_id": None,  # TODO: Eklenecek
             "role": user_data["role"],
-            "is_active": user_data["is_active"],
+            "is_active": user_data.get("is_active", True),
             "last_login": None,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
+            "created_at": now,
+            "updated_at": now
         }
-        
-        self._users.append(new_user)
-        self.save_users()
-        
-        return new_user
     
     def update_user(self, user_id, user_data):
         """Kullanıcıyı günceller."""
         for i, user in enumerate(self._users):
             if user["id"] == user_id:
                 self._users[i].update(user_data)
+                self._index_user(self._users[i])
                 self.save_users()
                 return True
         return False
@@ -388,6 +482,7 @@ class DataManager(QObject):
     def delete_user(self, user_id):
         """Kullanıcıyı siler."""
         self._users = [u for u in self._users if u["id"] != user_id]
+        self._unindex_user(user_id)
         self.save_users()
         
     def bulk_update_users(self, user_ids, update_data):
@@ -395,30 +490,36 @@ class DataManager(QObject):
         for user in self._users:
             if user["id"] in user_ids:
                 user.update(update_data)
+                self._index_user(user)
         self.save_users()
         
     def bulk_delete_users(self, user_ids):
         """Birden fazla kullanıcıyı siler."""
         self._users = [u for u in self._users if u["id"] not in user_ids]
+        for user_id in user_ids:
+            self._unindex_user(user_id)
         self.save_users()
         
     def bulk_add_users(self, users):
         """Birden fazla kullanıcı ekler."""
+        if self._users is None:
+            self.load_users()
         max_id = max([u["id"] for u in self._users]) if self._users else 0
         for user in users:
             if "id" not in user:
                 max_id += 1
                 user["id"] = max_id
             self._users.append(user)
+            self._index_user(user)
         self.save_users()
         
     def get_licenses_by_user(self, user_id):
         """Belirtilen kullanıcıya ait lisansları döndürür."""
-        return [license for license in self._licenses if license["user_id"] == user_id]
+        return self.query_licenses().where("user_id", user_id).all()
     
     def get_active_licenses(self):
         """Aktif lisansları döndürür."""
-        return [license for license in self._licenses if license["status"] == "active"]
+        return self.query_licenses().where("status", "active").all()
     
     def get_expired_licenses(self):
         """Süresi dolmuş lisansları döndürür."""
@@ -480,27 +581,29 @@ class DataManager(QObject):
             return False
 
     def backup_data(self, backup_dir: str = None) -> bool:
-        """Verileri yedekler"""
+        """Verileri artımlı olarak yedekler; yalnızca değişen koleksiyonlar yeniden yazılır"""
+        return self._write_backup(backup_dir, self._iter_backup_entries())
+
+    def backup_data_async(self, backup_dir: str = None) -> Future:
+        """Anlık görüntüyü hemen alır; serileştirme ve yazma arka planda yapılır, düzenlemeler beklemez"""
+        entries = self._iter_backup_entries()
+        future = self._backup_executor.submit(self._write_backup, backup_dir, entries)
+        future.add_done_callback(lambda done: self.backup_finished.emit(done.result()))
+        return future
+
+    def _write_backup(self, backup_dir: Optional[str], entries: Iterator[Tuple[str, bytes]]) -> bool:
+        """Serileştirilen girdileri yedek deposuna yazar ve saklama politikasını uygular"""
         try:
-            if backup_dir is None:
-                backup_dir = os.path.join(self.data_dir, "backups")
-            
-            if not os.path.exists(backup_dir):
-                os.makedirs(backup_dir)
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_path = os.path.join(backup_dir, f"backup_{timestamp}")
-            
-            # Yedekleme dizini oluştur
-            os.makedirs(backup_path)
-            
-            # Verileri yedekle
-            for data_type in ["users", "licenses", "templates"]:
-                data = getattr(self, f"_{data_type}")
-                backup_file = os.path.join(backup_path, f"{data_type}.json")
-                with open(backup_file, "w", encoding="utf-8") as f:
-                    json.dump(data, f, ensure_ascii=False, indent=4)
+            store = self._backup_store(backup_dir)
+            manifest = store.create(dict(entries))
+            removed = store.prune(self._backup_retention)
             
+            stats = manifest["stats"]
+            self.logger.log_info(
+                "data",
+                f"Yedek oluşturuldu: {manifest['id']} ({stats['blobs_written']} yeni blob, "
+                f"{stats['bytes_written']} bayt, {len(removed)} eski yedek silindi)"
+            )
             return True
         except Exception as e:
             print(f"Yedekleme hatası: {str(e)}")
@@ -509,18 +612,25 @@ class DataManager(QObject):
     def restore_data(self, backup_path: str) -> bool:
         """Verileri geri yükler"""
         try:
-            # Mevcut verileri yedekle
-            self.backup_data()
-            
-            # Yedekten geri yükle
-            for data_type in ["users", "licenses", "templates"]:
-                backup_file = os.path.join(backup_path, f"{data_type}.json")
-                if os.path.exists(backup_file):
-                    with open(backup_file, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                        setattr(self, f"_{data_type}", data)
-                        self.save_all()
+            if is_archive(backup_path):
+                # Arşiv girdileri akış halinde okunur; manifest doğrulanmadan hiçbiri uygulanmaz
+                entries = dict(read_archive(backup_path))
+            elif os.path.isdir(backup_path):
+                # Eski biçimdeki (dizin) yedekler
+                entries = {}
+                for name in self.LEGACY_BACKUP_COLLECTIONS:
+                    backup_file = os.path.join(backup_path, f"{name}.json")
+                    if os.path.exists(backup_file):
+                        with open(backup_file, "rb") as f:
+                            entries[name] = f.read()
+            else:
+                backup_id = os.path.basename(backup_path)
+                store = self._backup_store(os.path.dirname(backup_path) or None)
+                entries = store.read(backup_id)
             
+            # Mevcut verileri yedekle; hedef yedek önceden okunduğu için saklama temizliğinden etkilenmez
+            self.backup_data()
+            self._restore_entries(entries)
             return True
         except Exception as e:
             print(f"Geri yükleme hatası: {str(e)}")
@@ -532,18 +642,240 @@ class DataManager(QObject):
         if not os.path.exists(backup_dir):
             return []
         
-        backups = []
+        backups = [manifest["id"] for manifest in self._backup_store().manifests()]
         for item in os.listdir(backup_dir):
-            if item.startswith("backup_") and os.path.isdir(os.path.join(backup_dir, item)):
+            path = os.path.join(backup_dir, item)
+            if item.startswith("backup_") and (os.path.isdir(path) or is_archive(path)):
                 backups.append(item)
         
         return sorted(backups, reverse=True)
 
+    def delete_backup(self, backup_name: str) -> bool:
+        """Yedeği siler; artık başvurulmayan içerik de temizlenir"""
+        try:
+            backup_path = os.path.join(self.data_dir, "backups", backup_name)
+            if os.path.isdir(backup_path):
+                shutil.rmtree(backup_path)
+            elif is_archive(backup_path):
+                os.remove(backup_path)
+            else:
+                self._backup_store().delete(backup_name)
+            return True
+        except Exception as e:
+            print(f"Yedek silme hatası: {str(e)}")
+            return False
+
+    def create_backup_archive(self, copy_dir: str = None, compression: str = None) -> Optional[Dict[str, Any]]:
+        """Tüm verileri tek bir sıkıştırılmış arşive yedekler; yol, boyut ve süre bilgisini döndürür.
+
+        Arşiv her zaman yedek dizinine yazılır, böylece yedek listesinde görünür ve geri yüklenebilir;
+        copy_dir verilirse arşivin bir kopyası oraya da konur.
+        """
+        return self._write_backup_archive(copy_dir, compression, self._iter_backup_entries(), time.perf_counter())
+
+    def create_backup_archive_async(self, copy_dir: str = None, compression: str = None) -> Future:
+        """Anlık görüntüyü hemen alır, arşivi arka planda yazar; sonucu Future olarak döndürür"""
+        started = time.perf_counter()
+        entries = self._iter_backup_entries()
+        return self._backup_executor.submit(self._write_backup_archive, copy_dir, compression, entries, started)
+
+    def _write_backup_archive(
+        self,
+        copy_dir: Optional[str],
+        compression: Optional[str],
+        entries: Iterator[Tuple[str, bytes]],
+        started: float
+    ) -> Optional[Dict[str, Any]]:
+        """Girdileri yedek dizinindeki arşive yazar, istenirse kopyalar; yol, boyut ve süre bilgisini döndürür"""
+        try:
+            created_at = datetime.now()
+            backup_dir = os.path.join(self.data_dir, "backups")
+            path = self._new_archive_path(backup_dir, created_at, compression)
+            try:
+                manifest = write_archive(path, entries, compression, created_at)
+            except BaseException:
+                # Ayrılan boş dosya yarım bir yedek gibi listede kalmaz
+                os.remove(path)
+                raise
+            
+            copy_path = None
+            if copy_dir and os.path.abspath(copy_dir) != os.path.abspath(backup_dir):
+                copy_path = os.path.join(copy_dir, os.path.basename(path))
+                shutil.copyfile(path, copy_path)
+            
+            result = {
+                "path": path,
+                "copy": copy_path,
+                "size": manifest["size"],
+                "duration": time.perf_counter() - started,
+                "compression": manifest["compression"],
+                "entries": len(manifest["entries"])
+            }
+            self.logger.log_info(
+                "data",
+                f"Yedek arşivi oluşturuldu: {path} ({result['size']} bayt, {result['duration']:.2f} sn)"
+            )
+            return result
+        except Exception as e:
+            print(f"Yedek arşivi oluşturma hatası: {str(e)}")
+            return None
+
+    @staticmethod
+    def _new_archive_path(backup_dir: str, created_at: datetime, compression: Optional[str]) -> str:
+        """Zaman damgasından benzersiz bir arşiv yolu üretir ve dosyayı oluşturarak ayırır.
+
+        Aynı saniyede başlayan yedekler birbirinin üzerine yazmaz; ada sayaç eklenir.
+        """
+        os.makedirs(backup_dir, exist_ok=True)
+        base = f"backup_{created_at.strftime('%Y%m%d_%H%M%S')}"
+        backup_id = base
+        counter = 1
+        while True:
+            path = os.path.join(backup_dir, archive_name(backup_id, compression))
+            try:
+                # Dosya atomik olarak oluşturulur; eşzamanlı yazımlar aynı adı alamaz
+                with open(path, "xb"):
+                    return path
+            except FileExistsError:
+                backup_id = f"{base}_{counter}"
+                counter += 1
+
+    def set_backup_retention(self, **retention: int):
+        """Saklama politikasını ayarlar (ör. last=10, hourly=24, daily=7, weekly=4, monthly=12)"""
+        unknown = set(retention) - set(RETENTION_BUCKETS)
+        if unknown:
+            raise ValueError(f"Bilinmeyen saklama periyodu: {', '.join(sorted(unknown))}")
+        self._backup_retention = {period: int(count) for period, count in retention.items()}
+
+    def _backup_store(self, backup_dir: Optional[str] = None) -> BackupStore:
+        """Yedek deposunu döndürür; aynı dizin için aynı depo (ve kilidi) kullanılır"""
+        root = os.path.abspath(backup_dir or os.path.join(self.data_dir, "backups"))
+        store = self._backup_stores.get(root)
+        if store is None:
+            store = self._backup_stores[root] = BackupStore(root)
+        return store
+
+    def _iter_backup_entries(self) -> Iterator[Tuple[str, bytes]]:
+        """Anlık görüntüyü hemen alır; girdileri üretildikçe tek tek serileştiren bir üreteç döndürür"""
+        return self._serialize_snapshot(self._snapshot())
+
+    def _snapshot(self) -> List[Tuple[str, Any]]:
+        """Koleksiyonların tutarlı bir anlık görüntüsünü alır.
+        
+        Kilit yalnızca listelerin ve kayıt sözlüklerinin sığ kopyası alınırken tutulur; kayıtlar
+        yerinde güncellendiği (dict.update) için sözlükler de kopyalanır. Serileştirme kilitsiz yapılır.
+        """
+        if self._users is None:
+            self.load_users()
+        if self._licenses is None:
+            self.load_licenses()
+        
+        with self._data_lock:
+            snapshot = []
+            for name, attribute in self.BACKUP_COLLECTIONS.items():
+                data = getattr(self, attribute) or []
+                snapshot.append((name, [dict(item) if isinstance(item, dict) else item for item in data]))
+        
+            for name, filename in self.BACKUP_FILES.items():
+                path = os.path.join(self.data_dir, filename)
+                if os.path.exists(path):
+                    with open(path, "rb") as f:
+                        snapshot.append((name, f.read()))
+        
+            # Kimlik doğrulama verileri dosya olarak, bayt bayt yedeklenir
+            for filename in self.AUTH_BACKUP_FILES:
+                path = os.path.join(self.data_dir, filename)
+                if os.path.exists(path):
+                    with open(path, "rb") as f:
+                        snapshot.append((f"auth/{filename}", f.read()))
+        return snapshot
+
+    @staticmethod
+    def _serialize_snapshot(snapshot: List[Tuple[str, Any]]) -> Iterator[Tuple[str, bytes]]:
+        """Anlık görüntü girdilerini birer birer baytlara çevirir"""
+        for name, value in snapshot:
+            if isinstance(value, bytes):
+                yield name, value
+            else:
+                yield name, json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def _restore_entries(self, entries: Dict[str, bytes]):
+        """Yedek girdilerini önce tümüyle çözümler, sonra diske tek seferde yazar ve belleğe uygular"""
+        # Girdilerden biri bozuksa hiçbir dosyaya dokunulmadan hata fırlatılır
+        collections = {
+            name: json.loads(entries[name].decode("utf-8"))
+            for name in self.BACKUP_COLLECTIONS
+            if name in entries
+        }
+        # Dosya olarak yedeklenenler de yazılmadan önce JSON olarak doğrulanır
+        file_entries = list(self.BACKUP_FILES) + [f"auth/{filename}" for filename in self.AUTH_BACKUP_FILES]
+        for name in file_entries:
+            if name in entries:
+                json.loads(entries[name].decode("utf-8"))
+        
+        targets = {
+            "users": (self.users_file, 4),
+            "licenses": (self.licenses_file, 4),
+            "groups": (self.groups_file, 4),
+            "categories": (os.path.join(self.data_dir, "mock", "categories.json"), 4)
+        }
+        files = {}
+        for name, data in collections.items():
+            path, indent = targets[name]
+            files[path] = json.dumps(data, ensure_ascii=False, indent=indent).encode("utf-8")
+        for name, filename in self.BACKUP_FILES.items():
+            if name in entries:
+                files[os.path.join(self.data_dir, filename)] = entries[name]
+        for filename in self.AUTH_BACKUP_FILES:
+            data = entries.get(f"auth/{filename}")
+            if data is not None:
+                files[os.path.join(self.data_dir, filename)] = data
+        
+        with self._data_lock:
+            self._replace_files(files)
+            for name, data in collections.items():
+                setattr(self, self.BACKUP_COLLECTIONS[name], data)
+            self._rebuild_user_indexes()
+            self._rebuild_license_indexes()
+            self._template_index_stamp = None
+            self._bump_version("templates")
+            self.signatures = self._load_signatures()
+            self.load_signatures()
+        self.data_changed.emit()
+        self.backup_restored.emit()
+
+    @staticmethod
+    def _replace_files(files: Dict[str, bytes]):
+        """Tüm dosyaları önce geçici olarak yazar, sonra hepsini art arda yerine koyar.
+        
+        Yazma aşamasında hata olursa hiçbir hedef dosya değişmez; değiştirme aşaması yalnızca
+        yeniden adlandırmalardan oluşur.
+        """
+        staged = []
+        try:
+            for path, data in files.items():
+                directory = os.path.dirname(path) or "."
+                os.makedirs(directory, exist_ok=True)
+                fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+                staged.append((temp_path, path))
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+        except BaseException:
+            for temp_path, _ in staged:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            raise
+        
+        for temp_path, path in staged:
+            os.replace(temp_path, path)
+
     def start_auto_backup(self):
         """Otomatik yedeklemeyi başlatır"""
         if self._backup_timer is None:
             self._backup_timer = QTimer()
-            self._backup_timer.timeout.connect(self.backup_data)
+            self._backup_timer.timeout.connect(self.backup_data_async)
             self._backup_timer.start(self._backup_interval)
 
     def stop_auto_backup(self):
@@ -606,47 +938,8 @@ class DataManager(QObject):
         if self._licenses is None:
             self.load_licenses()
         
-        total_licenses = len(self._licenses)
-        active_licenses = len([l for l in self._licenses if l["status"] == "ACTIVE"])
-        expired_licenses = len([l for l in self._licenses if l["status"] == "EXPIRED"])
-        suspended_licenses = len([l for l in self._licenses if l["status"] == "SUSPENDED"])
-        
-        # Lisans türlerine göre dağılım
-        type_distribution = {}
-        for license in self._licenses:
-            type_distribution[license["type"]] = type_distribution.get(license["type"], 0) + 1
-        
-        # Son 30 gün içinde eklenen lisanslar
-        thirty_days_ago = datetime.now() - timedelta(days=30)
-        new_licenses = len([
-            l for l in self._licenses
-            if datetime.fromisoformat(l["created_at"]) >= thirty_days_ago
-        ])
-        
-        # Yakında süresi dolacak lisanslar (30 gün içinde)
-        soon_to_expire = []
-        today = datetime.now()
-        for license in self._licenses:
-            if license["status"] != "ACTIVE":
-                continue
-            end_date = datetime.fromisoformat(license["end_date"])
-            days_left = (end_date - today).days
-            if 0 <= days_left <= 30:
-                soon_to_expire.append({
-                    "key": license["key"],
-                    "days_left": days_left,
-                    "user_id": license["user_id"]
-                })
-        
-        return {
-            "total": total_licenses,
-            "active": active_licenses,
-            "expired": expired_licenses,
-            "suspended": suspended_licenses,
-            "type_distribution": type_distribution,
-            "new_licenses_30d": new_licenses,
-            "soon_to_expire": soon_to_expire
-        }
+        # Sayaçlar ekleme/güncelleme/silme sırasında artımlı olarak tutulur
+        return self._license_stats.summary()
 
     def get_license_usage_history(self, license_key):
         """Lisans kullanım geçmişini döndürür."""
@@ -695,24 +988,18 @@ class DataManager(QObject):
         today = datetime.now()
         renewals = []
         
-        for license in self._licenses:
-            if license["status"] != "ACTIVE":
-                continue
-            
-            end_date = datetime.fromisoformat(license["end_date"])
-            days_left = (end_date - today).days
-            
-            if days_left <= 30:  # 30 gün veya daha az kaldıysa
-                user = self.get_user_by_id(license["user_id"])
-                renewals.append({
-                    "license_key": license["key"],
-                    "days_left": days_left,
-                    "user": user,
-                    "type": license["type"],
-                    "end_date": license["end_date"]
-                })
-        
-        return sorted(renewals, key=lambda x: x["days_left"])
+        # Bitiş tarihine göre sıralı indeksten yalnızca 30 gün içindekiler okunur
+        for end_date, license in self._license_stats.expiring(today + timedelta(days=31)):
+            user = self.get_user_by_id(license["user_id"])
+            renewals.append({
+                "license_key": license["key"],
+                "days_left": (end_date - today).days,
+                "user": user,
+                "type": license["type"],
+                "end_date": license["end_date"]
+            })
+        
+        return renewals
 
     def bulk_update_licenses(self, license_keys, update_data):
         """Birden fazla lisansı günceller."""
@@ -721,6 +1008,7 @@ class DataManager(QObject):
             license = self.get_license_by_key(key)
             if license:
                 license.update(update_data)
+                self._index_license(license)
                 updated += 1
         
         if updated > 0:
@@ -733,12 +1021,101 @@ class DataManager(QObject):
         initial_count = len(self._licenses)
         self._licenses = [l for l in self._licenses if l["key"] not in license_keys]
         deleted_count = initial_count - len(self._licenses)
+        for key in license_keys:
+            self._unindex_license(key)
         
         if deleted_count > 0:
             self.save_licenses()
         
         return deleted_count
 
+    def get_data_version(self, collection: Optional[str] = None) -> int:
+        """Koleksiyonun (verilmezse tüm verinin) değişiklik sürümünü döndürür."""
+        if collection is None:
+            return sum(self._versions.values())
+        return self._versions.get(collection, 0)
+    
+    def get_data_stamp(self, collection: str) -> Optional[Tuple[int, int]]:
+        """Koleksiyon dosyasının (değişiklik zamanı ns, boyut) damgasını döndürür.
+        
+        Sürüm sayaçlarının aksine damga açılışlar arasında korunur; her değişiklik dosyaya hemen
+        yazıldığından kalıcı önbellek anahtarlarında kullanılabilir. Dosya yoksa None döndürür.
+        """
+        files = {
+            "users": self.users_file,
+            "licenses": self.licenses_file,
+            "templates": self.mock_templates_file
+        }
+        if collection not in files:
+            raise ValueError(f"Bilinmeyen koleksiyon: {collection}")
+        return self._file_stamp(files[collection])
+    
+    @staticmethod
+    def _file_stamp(path: str) -> Optional[Tuple[int, int]]:
+        """Dosyanın (değişiklik zamanı ns, boyut) çiftini döndürür; dosya yoksa None döndürür."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _bump_version(self, collection: str):
+        """Koleksiyon sürümünü artırır; sürüme bağlı önbellekler geçersiz olur."""
+        self._versions[collection] = self._versions.get(collection, 0) + 1
+    
+    def _index_user(self, user: Dict[str, Any]):
+        """Kullanıcıyı arama ve alan indekslerine ekler veya günceller."""
+        self._user_index.update(user["id"], user)
+        self._user_fields.update(user)
+        self._bump_version("users")
+    
+    def _unindex_user(self, user_id: int):
+        """Kullanıcıyı tüm indekslerden çıkarır."""
+        self._user_index.remove(user_id)
+        self._user_fields.remove(user_id)
+        self._bump_version("users")
+    
+    def _rebuild_user_indexes(self):
+        """Kullanıcı indekslerini baştan oluşturur."""
+        self._user_index.rebuild(self._users)
+        self._user_fields.rebuild(self._users)
+        self._bump_version("users")
+    
+    def _index_license(self, license: Dict[str, Any]):
+        """Lisansı alan indekslerine ekler veya günceller."""
+        self._license_fields.update(license)
+        self._license_stats.update(license)
+        self._schedule_license(license)
+        self._bump_version("licenses")
+    
+    def _unindex_license(self, key: str):
+        """Lisansı indekslerden çıkarır."""
+        self._license_fields.remove(key)
+        self._license_stats.remove(key)
+        self.license_scheduler.cancel(key)
+        self._bump_version("licenses")
+    
+    def _rebuild_license_indexes(self):
+        """Lisans indekslerini baştan oluşturur."""
+        self._license_fields.rebuild(self._licenses)
+        self._license_stats.rebuild(self._licenses)
+        self.license_scheduler.clear()
+        for license in self._licenses:
+            self._schedule_license(license)
+        self._bump_version("licenses")
+    
+    def _schedule_license(self, license: Dict[str, Any]):
+        """Aktif lisansın 30 gün uyarısı ve bitiş olaylarını planlar, diğerlerini iptal eder."""
+        try:
+            end_date = parse_datetime(license["end_date"])
+        except (KeyError, TypeError, ValueError):
+            end_date = None
+        
+        if license.get("status") == "ACTIVE" and end_date is not None:
+            self.license_scheduler.schedule(license["key"], end_date)
+        else:
+            self.license_scheduler.cancel(license["key"])
+    
     def _load_groups(self) -> List[Dict[str, Any]]:
         """Grupları yükler."""
         if os.path.exists(self.groups_file):
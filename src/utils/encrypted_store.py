@@ -0,0 +1,182 @@
+import json
+import os
+import sqlite3
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from .crypto_manager import CryptoManager
+
+class EncryptedRecordStore(Mapping):
+    """Her kaydı ayrı şifreleyen, SQLite tabanlı kayıt deposu.
+    
+    Kayıtlar yalnızca erişildiklerinde çözülür ve bellekte tutulur. index_fields ile
+    belirtilen alanlar, şifre çözmeden filtreleme yapılabilmesi için SQL indeksli ayrı
+    sütunlarda AÇIK METİN olarak saklanır. Bu bilinçli bir ödünleşimdir: veritabanı
+    dosyasını okuyabilen biri bu alanları (ör. lisansın kullanıcısı, bitiş tarihi, aktifliği)
+    anahtar olmadan görebilir. Gizli kalması gereken alanlar index_fields'a eklenmemelidir.
+    """
+    
+    def __init__(self, db_file: str, crypto_manager: CryptoManager, index_fields: Iterable[str] = ()):
+        self.db_file = db_file
+        self.crypto_manager = crypto_manager
+        self.index_fields = tuple(index_fields)
+        for field in self.index_fields:
+            if not field.isidentifier():
+                raise ValueError(f"Geçersiz indeks alanı: {field}")
+        # Sütun adları kayıt alanlarıyla çakışmasın diye önek alır
+        self._columns = tuple(f"idx_{field}" for field in self.index_fields)
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_file, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+    
+    def _create_schema(self):
+        """Tabloyu ve indeks sütunlarını oluşturur; eski şemadaki verileri taşır."""
+        column_defs = "".join(f", {column}" for column in self._columns)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS records (id TEXT PRIMARY KEY{column_defs}, ciphertext TEXT NOT NULL)"
+        )
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(records)")}
+        
+        if "meta" in existing:
+            # Önceki sürüm indeks alanlarını tek bir JSON sütununda tutuyordu
+            rows = self._conn.execute("SELECT id, meta, ciphertext FROM records ORDER BY rowid").fetchall()
+            self._conn.execute("DROP TABLE records")
+            self._conn.execute(
+                f"CREATE TABLE records (id TEXT PRIMARY KEY{column_defs}, ciphertext TEXT NOT NULL)"
+            )
+            for record_id, meta, ciphertext in rows:
+                meta = json.loads(meta)
+                self._write_row(record_id, [meta.get(field) for field in self.index_fields], ciphertext)
+        else:
+            missing = [column for column in self._columns if column not in existing]
+            for column in missing:
+                self._conn.execute(f"ALTER TABLE records ADD COLUMN {column}")
+            if missing:
+                # Yeni eklenen indeks alanları kayıtlar çözülerek doldurulur
+                for record_id, ciphertext in self._conn.execute("SELECT id, ciphertext FROM records").fetchall():
+                    record = self._decrypt(record_id, ciphertext)
+                    self._write_row(record_id, [record.get(field) for field in self.index_fields], ciphertext)
+        
+        for column in self._columns:
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS records_{column} ON records ({column})")
+        self._conn.commit()
+    
+    def close(self):
+        """Veritabanı bağlantısını kapatır."""
+        self._conn.close()
+    
+    def __getitem__(self, record_id: str) -> Dict[str, Any]:
+        record = self._cache.get(record_id)
+        if record is not None:
+            return record
+        
+        row = self._conn.execute(
+            "SELECT ciphertext FROM records WHERE id = ?", (record_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(record_id)
+        
+        record = self._decrypt(record_id, row[0])
+        self._cache[record_id] = record
+        return record
+    
+    def __contains__(self, record_id: object) -> bool:
+        if record_id in self._cache:
+            return True
+        row = self._conn.execute("SELECT 1 FROM records WHERE id = ?", (record_id,)).fetchone()
+        return row is not None
+    
+    def __iter__(self) -> Iterator[str]:
+        for (record_id,) in self._conn.execute("SELECT id FROM records ORDER BY rowid"):
+            yield record_id
+    
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+    
+    def put(self, record_id: str, record: Dict[str, Any]):
+        """Kaydı şifreleyip tek satır olarak yazar."""
+        payload = json.dumps({"id": record_id, "record": record}, ensure_ascii=False)
+        ciphertext = self.crypto_manager.encrypt_string(payload)
+        
+        self._write_row(record_id, [record.get(field) for field in self.index_fields], ciphertext)
+        self._conn.commit()
+        self._cache[record_id] = record
+    
+    def _write_row(self, record_id: str, values: List[Any], ciphertext: str):
+        """Satırı indeks sütunlarıyla birlikte ekler veya günceller."""
+        columns = ("id",) + self._columns + ("ciphertext",)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in columns[1:])
+        self._conn.execute(
+            f"INSERT INTO records ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+            f"ON CONFLICT(id) DO UPDATE SET {updates}",
+            (record_id, *values, ciphertext)
+        )
+    
+    def delete(self, record_id: str) -> bool:
+        """Kaydı siler."""
+        cursor = self._conn.execute("DELETE FROM records WHERE id = ?", (record_id,))
+        self._conn.commit()
+        self._cache.pop(record_id, None)
+        return cursor.rowcount > 0
+    
+    def metadata(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Kayıtların açık metin indeks alanlarını şifre çözmeden üretir; bool değerler 0/1 olarak döner."""
+        columns = "".join(f", {column}" for column in self._columns)
+        for row in self._conn.execute(f"SELECT id{columns} FROM records ORDER BY rowid"):
+            yield row[0], dict(zip(self.index_fields, row[1:]))
+    
+    def find(self, **conditions: Any) -> List[str]:
+        """İndeks alanları eşleşen kayıtların ID'lerini döndürür."""
+        unknown = set(conditions) - set(self.index_fields)
+        if unknown:
+            raise ValueError(f"İndekslenmemiş alanlar: {', '.join(sorted(unknown))}")
+        # IS, NULL değerleri de eşitlik olarak karşılaştırır ve sütun indeksini kullanabilir
+        where = " AND ".join(f"idx_{field} IS ?" for field in conditions) or "1"
+        return [
+            record_id for (record_id,) in self._conn.execute(
+                f"SELECT id FROM records WHERE {where} ORDER BY rowid", tuple(conditions.values())
+            )
+        ]
+    
+    def stale_ids(self) -> List[str]:
+        """Güncel anahtarla şifrelenmemiş kayıtların ID'lerini şifre çözmeden döndürür."""
+        prefix = self.crypto_manager.key_id + self.crypto_manager.KEY_ID_SEPARATOR
+        return [
+            record_id for (record_id,) in self._conn.execute(
+                "SELECT id FROM records WHERE substr(ciphertext, 1, ?) != ? ORDER BY rowid",
+                (len(prefix), prefix)
+            )
+        ]
+    
+    def reencrypt(self, record_ids: Iterable[str]) -> int:
+        """Kayıtları güncel anahtarla yeniden şifreler; arka plan iş parçacıklarından çağrılabilir."""
+        # Her çağrı kendi bağlantısını açar; sqlite3 bağlantıları iş parçacıkları arasında paylaşılamaz
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        rotated = 0
+        try:
+            for record_id in record_ids:
+                row = conn.execute("SELECT ciphertext FROM records WHERE id = ?", (record_id,)).fetchone()
+                if row is None:
+                    continue
+                ciphertext = self.crypto_manager.reencrypt_string(row[0])
+                if ciphertext == row[0]:
+                    continue
+                # Bu arada put ile yazılmış kayıtların üzerine yazılmaz
+                cursor = conn.execute(
+                    "UPDATE records SET ciphertext = ? WHERE id = ? AND ciphertext = ?",
+                    (ciphertext, record_id, row[0])
+                )
+                rotated += cursor.rowcount
+            conn.commit()
+        finally:
+            conn.close()
+        return rotated
+    
+    def _decrypt(self, record_id: str, ciphertext: str) -> Dict[str, Any]:
+        """Şifreli satırı çözer ve satırın başka bir ID'ye taşınmadığını doğrular."""
+        payload = json.loads(self.crypto_manager.decrypt_string(ciphertext))
+        if payload.get("id") != record_id:
+            raise ValueError(f"Kayıt kimliği uyuşmuyor: {record_id}")
+        return payload["record"]
@@ -0,0 +1,98 @@
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+import heapq
+import itertools
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+class ExpiryScheduler(QObject):
+    """Lisans bitiş zamanlarını min-heap üzerinde tutar ve zamanı geldiğinde sinyal yayar."""
+    
+    license_expiring = pyqtSignal(str, int)  # lisans anahtarı, kalan gün
+    license_expired = pyqtSignal(str)  # lisans anahtarı
+    
+    EXPIRING = "expiring"
+    EXPIRED = "expired"
+    
+    # QTimer aralığı 32 bit ile sınırlı; uzak olaylar için zamanlayıcı günlük yeniden kurulur
+    MAX_TIMER_INTERVAL = 24 * 60 * 60 * 1000
+    
+    def __init__(self, warning_days: int = 30, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.warning_days = warning_days
+        self._heap: List[Tuple[datetime, int, str, str]] = []
+        self._scheduled: Dict[str, Tuple[int, datetime]] = {}
+        self._generations = itertools.count()
+        
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._process_due)
+    
+    def schedule(self, license_id: str, expiry: datetime):
+        """Lisansın uyarı ve bitiş olaylarını planlar; önceki planı geçersiz kılar."""
+        current = self._scheduled.get(license_id)
+        if current is not None and current[1] == expiry:
+            return
+        
+        generation = next(self._generations)
+        self._scheduled[license_id] = (generation, expiry)
+        
+        # Eski heap girdileri silinmez, nesil numarası uyuşmadığı için atlanır
+        if expiry > datetime.now():
+            warning_at = expiry - timedelta(days=self.warning_days)
+            heapq.heappush(self._heap, (warning_at, generation, license_id, self.EXPIRING))
+        heapq.heappush(self._heap, (expiry, generation, license_id, self.EXPIRED))
+        self._arm()
+    
+    def cancel(self, license_id: str):
+        """Lisansın bekleyen olaylarını iptal eder."""
+        if self._scheduled.pop(license_id, None) is not None:
+            self._arm()
+    
+    def clear(self):
+        """Tüm planlanmış olayları temizler."""
+        self._heap.clear()
+        self._scheduled.clear()
+        self._timer.stop()
+    
+    def is_scheduled(self, license_id: str) -> bool:
+        """Lisans için bekleyen olay olup olmadığını döndürür."""
+        return license_id in self._scheduled
+    
+    def next_event_time(self) -> Optional[datetime]:
+        """Sıradaki geçerli olayın zamanını döndürür."""
+        while self._heap and not self._is_current(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+    
+    def _is_current(self, entry: Tuple[datetime, int, str, str]) -> bool:
+        """Heap girdisinin hâlâ geçerli plana ait olup olmadığını döndürür."""
+        scheduled = self._scheduled.get(entry[2])
+        return scheduled is not None and scheduled[0] == entry[1]
+    
+    def _arm(self):
+        """Zamanlayıcıyı sıradaki olaya göre kurar."""
+        next_time = self.next_event_time()
+        if next_time is None:
+            self._timer.stop()
+            return
+        
+        delay = int((next_time - datetime.now()).total_seconds() * 1000)
+        self._timer.start(min(max(delay, 0), self.MAX_TIMER_INTERVAL))
+    
+    def _process_due(self):
+        """Zamanı gelen olayları yayar ve zamanlayıcıyı yeniden kurar."""
+        now = datetime.now()
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if not self._is_current(entry):
+                continue
+            
+            _, _, license_id, kind = entry
+            if kind == self.EXPIRING:
+                expiry = self._scheduled[license_id][1]
+                self.license_expiring.emit(license_id, max((expiry - now).days, 0))
+            else:
+                del self._scheduled[license_id]
+                self.license_expired.emit(license_id)
+        
+        self._arm()
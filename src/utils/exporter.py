@@ -0,0 +1,122 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, TextIO, Tuple
+from itertools import islice
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+
+JSON = "json"
+JSONL = "jsonl"
+CSV = "csv"
+# Dosya uzantısı -> biçim; ".gz" soneki ayrıca sıkıştırmayı belirtir
+EXTENSIONS = {".json": JSON, ".jsonl": JSONL, ".ndjson": JSONL, ".csv": CSV}
+GZIP_SUFFIX = ".gz"
+CHUNK_SIZE = 1000
+
+# CSV sütunu: (başlık, kayıttan değeri üreten fonksiyon)
+Column = Tuple[str, Callable[[Dict[str, Any]], Any]]
+
+
+def detect_format(path: str) -> Tuple[str, bool]:
+    """Dosya adından dışa aktarma biçimini ve gzip kullanılıp kullanılmayacağını döndürür."""
+    compress = path.lower().endswith(GZIP_SUFFIX)
+    base = path[:-len(GZIP_SUFFIX)] if compress else path
+    extension = os.path.splitext(base)[1].lower()
+    return EXTENSIONS.get(extension, JSON), compress
+
+
+def write_jsonl(rows: Iterable[Dict[str, Any]], f: TextIO, chunk_size: int = CHUNK_SIZE) -> int:
+    """Kayıtları satır başına bir JSON nesnesi olarak yazar ve yazılan kayıt sayısını döndürür."""
+    count = 0
+    for chunk in _chunks(rows, chunk_size):
+        f.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in chunk))
+        count += len(chunk)
+    return count
+
+
+def write_json_array(rows: Iterable[Dict[str, Any]], f: TextIO, chunk_size: int = CHUNK_SIZE) -> int:
+    """Kayıtları tek bir JSON dizisi olarak parça parça yazar ve yazılan kayıt sayısını döndürür."""
+    count = 0
+    f.write("[")
+    for chunk in _chunks(rows, chunk_size):
+        separator = ",\n" if count else "\n"
+        f.write(separator + ",\n".join(json.dumps(row, ensure_ascii=False) for row in chunk))
+        count += len(chunk)
+    f.write("\n]\n" if count else "]\n")
+    return count
+
+
+def write_csv(
+    rows: Iterable[Dict[str, Any]],
+    f: TextIO,
+    columns: Sequence[Column],
+    chunk_size: int = CHUNK_SIZE
+) -> int:
+    """Kayıtları verilen sütunlarla CSV olarak yazar ve yazılan kayıt sayısını döndürür."""
+    writer = csv.writer(f)
+    writer.writerow([header for header, _ in columns])
+    count = 0
+    for chunk in _chunks(rows, chunk_size):
+        writer.writerows([value(row) for _, value in columns] for row in chunk)
+        count += len(chunk)
+    return count
+
+
+def export_rows(
+    rows: Iterable[Dict[str, Any]],
+    path: str,
+    fmt: Optional[str] = None,
+    compress: Optional[bool] = None,
+    columns: Optional[Sequence[Column]] = None
+) -> int:
+    """Kayıtları bellekte biriktirmeden dosyaya akıtır ve yazılan kayıt sayısını döndürür.
+    
+    Biçim ve sıkıştırma verilmezse dosya adından çıkarılır. Yazım geçici bir dosyaya
+    yapılır; yarım kalan dışa aktarma hedef dosyayı bozmaz. Var olan hedefin izinleri korunur,
+    yeni dosya ise geçici dosyanın 0600 izniyle (yalnızca sahibi okuyabilir) oluşur.
+    """
+    detected_format, detected_compress = detect_format(path)
+    fmt = fmt or detected_format
+    compress = detected_compress if compress is None else compress
+    if fmt == CSV and not columns:
+        raise ValueError("CSV dışa aktarma için sütunlar gerekli")
+    if fmt not in (JSON, JSONL, CSV):
+        raise ValueError(f"Desteklenmeyen dışa aktarma biçimi: {fmt}")
+    
+    directory = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            binary = gzip.GzipFile(fileobj=raw, mode="wb") if compress else raw
+            f = io.TextIOWrapper(binary, encoding="utf-8", newline="" if fmt == CSV else None)
+            if fmt == JSONL:
+                count = write_jsonl(rows, f)
+            elif fmt == CSV:
+                count = write_csv(rows, f, columns)
+            else:
+                count = write_json_array(rows, f)
+            # Metin katmanı ayrılır; dosyayı os.fdopen bloğu kapatır
+            f.flush()
+            f.detach()
+            if compress:
+                binary.close()
+        if os.path.exists(path):
+            os.chmod(temp_path, os.stat(path).st_mode & 0o7777)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return count
+
+
+def _chunks(rows: Iterable[Dict[str, Any]], size: int) -> Iterable[List[Dict[str, Any]]]:
+    """Kayıtları en fazla size elemanlı listeler halinde üretir."""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
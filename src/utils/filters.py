@@ -1,5 +1,232 @@
-from typing import List, Dict, Any, Callable, Optional
+from typing import List, Dict, Any, Callable, Hashable, Iterable, Iterator, Optional, Tuple
 from datetime import datetime
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from itertools import islice
+import heapq
+from .search_index import FieldIndex
+
+
+@lru_cache(maxsize=65536)
+def parse_datetime(value: str) -> datetime:
+    """ISO formatındaki tarih metnini ayrıştırır; aynı metin tekrar geldiğinde sonuç lru_cache'ten döner."""
+    return datetime.fromisoformat(value)
+
+
+class SortKeyCache:
+    """Koleksiyon sürümü başına önceden sıralanmış anahtar listelerini tutar."""
+    
+    def __init__(self, id_field: str = "id"):
+        self.id_field = id_field
+        self._version: Optional[Hashable] = None
+        self._views: Dict[str, Tuple[List[Tuple[Any, Any]], List[Dict[str, Any]]]] = {}
+    
+    def invalidate(self):
+        """Önbelleği temizler."""
+        self._version = None
+        self._views.clear()
+    
+    def view(
+        self,
+        items: Iterable[Dict[str, Any]],
+        key: str,
+        version: Hashable
+    ) -> Tuple[List[Tuple[Any, Any]], List[Dict[str, Any]]]:
+        """(anahtar, id) çiftlerini ve aynı sıradaki kayıtları artan sırada döndürür."""
+        if version != self._version:
+            self._views.clear()
+            self._version = version
+        
+        view = self._views.get(key)
+        if view is None:
+            id_field = self.id_field
+            entries = sorted(
+                (((item[key], item[id_field]), item) for item in items),
+                key=lambda entry: entry[0]
+            )
+            view = ([entry[0] for entry in entries], [entry[1] for entry in entries])
+            self._views[key] = view
+        return view
+
+
+class Query:
+    """Tüm koşulları tek geçişte uygulayan, birleştirilebilir sorgu."""
+    
+    def __init__(
+        self,
+        items: Iterable[Dict[str, Any]],
+        index: Optional[FieldIndex] = None,
+        sort_cache: Optional[SortKeyCache] = None,
+        version: Optional[Hashable] = None
+    ):
+        self._items = items
+        self._index = index
+        self._sort_cache = sort_cache
+        self._version = version
+        self._equals: List[Tuple[str, Any]] = []
+        self._predicates: List[Callable[[Dict[str, Any]], bool]] = []
+        self._order: Optional[Tuple[str, bool]] = None
+    
+    def where(self, field: str, value: Any) -> "Query":
+        """Alan değeri eşitlik koşulu ekler."""
+        self._equals.append((field, value))
+        return self
+    
+    def filter(self, condition: Callable[[Dict[str, Any]], bool]) -> "Query":
+        """Özel bir koşul ekler."""
+        self._predicates.append(condition)
+        return self
+    
+    def date_range(
+        self,
+        date_field: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> "Query":
+        """Tarih aralığı koşulu ekler."""
+        if start_date is None and end_date is None:
+            return self
+        
+        def in_range(item: Dict[str, Any]) -> bool:
+            value = parse_datetime(item[date_field])
+            if start_date is not None and value < start_date:
+                return False
+            if end_date is not None and value > end_date:
+                return False
+            return True
+        
+        return self.filter(in_range)
+    
+    def order_by(self, key: str, reverse: bool = False) -> "Query":
+        """Sonuçların sıralanacağı alanı belirler."""
+        self._order = (key, reverse)
+        return self
+    
+    def _source(self) -> Tuple[Iterable[Dict[str, Any]], List[Tuple[str, Any]], bool]:
+        """Taranacak kayıtları, kalan eşitlik koşullarını ve indeks kullanılıp kullanılmadığını döndürür."""
+        if self._index is None:
+            return self._items, self._equals, False
+        
+        indexed = [cond for cond in self._equals if cond[0] in self._index]
+        if not indexed:
+            return self._items, self._equals, False
+        
+        # En küçük indeks kovasından başlanır, kalan koşullar tarama sırasında uygulanır
+        best = min(indexed, key=lambda cond: len(self._index.lookup(*cond)))
+        remaining = [cond for cond in self._equals if cond is not best]
+        # Kova ekleme sırasında değil, koleksiyon sırasında taranır; tablo sırası güncellemelerle değişmez
+        return self._index.ordered(self._index.lookup(*best)), remaining, True
+    
+    def _accepts(self, equals: List[Tuple[str, Any]]) -> Callable[[Dict[str, Any]], bool]:
+        """Eşitlik koşulları ve özel koşulları birleştiren tek bir kontrol döndürür."""
+        predicates = self._predicates
+        
+        def accepts(item: Dict[str, Any]) -> bool:
+            return all(item.get(field) == value for field, value in equals) and \
+                all(predicate(item) for predicate in predicates)
+        
+        return accepts
+    
+    def _matches(self) -> Iterator[Dict[str, Any]]:
+        """Koşulları sağlayan kayıtları sırasız olarak üretir."""
+        source, equals, _ = self._source()
+        return filter(self._accepts(equals), source)
+    
+    def _sorted_view(self) -> Optional[Tuple[List[Tuple[Any, Any]], List[Dict[str, Any]]]]:
+        """Önbellekte sıralı görünüm kullanılabiliyorsa döndürür."""
+        if self._order is None or self._sort_cache is None or self._version is None:
+            return None
+        view = self._sort_cache.view(self._items, self._order[0], self._version)
+        
+        # İndeks kovası çok küçükse kovayı sıralamak tüm görünümü taramaktan ucuzdur
+        source, _, indexed = self._source()
+        if indexed and len(source) * 8 < len(view[1]):
+            return None
+        return view
+    
+    def _ordered(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Sıralı sonuçları üretir; sıralı görünüm varsa tam sıralama yapılmaz."""
+        key, reverse = self._order
+        view = self._sorted_view()
+        if view is not None:
+            _, records = view
+            accepts = self._accepts(self._equals)
+            ordered = reversed(records) if reverse else iter(records)
+            return islice(filter(accepts, ordered), start, stop)
+        
+        sort_key = lambda x: (x[key],)
+        if stop is not None:
+            # İlk sayfalar için yalnızca ilk k kayıt seçilir (heap tabanlı top-k)
+            select = heapq.nlargest if reverse else heapq.nsmallest
+            return iter(select(stop, self._matches(), key=sort_key)[start:])
+        return islice(iter(sorted(self._matches(), key=sort_key, reverse=reverse)), start, None)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if self._order is None:
+            return self._matches()
+        return self._ordered()
+    
+    def all(self) -> List[Dict[str, Any]]:
+        """Tüm sonuçları liste olarak döndürür."""
+        return list(self)
+    
+    def first(self) -> Optional[Dict[str, Any]]:
+        """İlk sonucu döndürür."""
+        if self._order is None:
+            return next(self._matches(), None)
+        return next(self._ordered(0, 1), None)
+    
+    def count(self) -> int:
+        """Sonuç sayısını liste oluşturmadan döndürür."""
+        return sum(1 for _ in self._matches())
+    
+    def page(self, page: int, per_page: int) -> List[Dict[str, Any]]:
+        """İstenen sayfadaki sonuçları döndürür."""
+        start = (page - 1) * per_page
+        if self._order is None:
+            return list(islice(self._matches(), start, start + per_page))
+        return list(self._ordered(start, start + per_page))
+    
+    def page_after(
+        self,
+        cursor: Optional[Tuple[Any, Any]],
+        per_page: int,
+        id_field: str = "id"
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[Any, Any]]]:
+        """İmleç (keyset) sayfalaması yapar; sayfayı ve sonraki sayfanın imlecini döndürür.
+        
+        İmleç, önceki sayfanın son kaydının (sıralama anahtarı, id) çiftidir.
+        """
+        if self._order is None:
+            raise ValueError("İmleç sayfalaması için order_by gereklidir")
+        key, reverse = self._order
+        
+        view = self._sorted_view()
+        if view is not None:
+            keys, records = view
+            id_field = self._sort_cache.id_field
+            accepts = self._accepts(self._equals)
+            if reverse:
+                stop = bisect_left(keys, cursor) if cursor is not None else len(records)
+                candidates = (records[i] for i in range(stop - 1, -1, -1))
+            else:
+                begin = bisect_right(keys, cursor) if cursor is not None else 0
+                candidates = (records[i] for i in range(begin, len(records)))
+            page = list(islice(filter(accepts, candidates), per_page))
+        else:
+            sort_key = lambda x: (x[key], x[id_field])
+            matches = self._matches()
+            if cursor is not None:
+                if reverse:
+                    matches = (item for item in matches if sort_key(item) < cursor)
+                else:
+                    matches = (item for item in matches if sort_key(item) > cursor)
+            select = heapq.nlargest if reverse else heapq.nsmallest
+            page = select(per_page, matches, key=sort_key)
+        
+        next_cursor = (page[-1][key], page[-1][id_field]) if len(page) == per_page else None
+        return page, next_cursor
+
 
 class Filter:
     """Veri filtreleme sınıfı."""
@@ -9,21 +236,22 @@ class Filter:
         users: List[Dict[str, Any]],
         department: Optional[str] = None,
         role: Optional[str] = None,
-        active_only: bool = False
+        active_only: bool = False,
+        index: Optional[FieldIndex] = None
     ) -> List[Dict[str, Any]]:
         """Kullanıcıları filtreler."""
-        filtered_users = users.copy()
+        query = Query(users, index)
         
         if department:
-            filtered_users = [u for u in filtered_users if u["department"] == department]
+            query.where("department", department)
         
         if role:
-            filtered_users = [u for u in filtered_users if u["role"] == role]
+            query.where("role", role)
         
         if active_only:
-            filtered_users = [u for u in filtered_users if u["is_active"]]
+            query.filter(lambda u: u["is_active"])
         
-        return filtered_users
+        return query.all()
     
     @staticmethod
     def filter_templates(
@@ -32,32 +260,33 @@ class Filter:
         is_default: Optional[bool] = None
     ) -> List[Dict[str, Any]]:
         """Şablonları filtreler."""
-        filtered_templates = templates.copy()
+        query = Query(templates)
         
         if department:
-            filtered_templates = [t for t in filtered_templates if t["department"] == department]
+            query.where("department", department)
         
         if is_default is not None:
-            filtered_templates = [t for t in filtered_templates if t["is_default"] == is_default]
+            query.where("is_default", is_default)
         
-        return filtered_templates
+        return query.all()
     
     @staticmethod
     def filter_licenses(
         licenses: List[Dict[str, Any]],
         status: Optional[str] = None,
-        type: Optional[str] = None
+        type: Optional[str] = None,
+        index: Optional[FieldIndex] = None
     ) -> List[Dict[str, Any]]:
         """Lisansları filtreler."""
-        filtered_licenses = licenses.copy()
+        query = Query(licenses, index)
         
         if status:
-            filtered_licenses = [l for l in filtered_licenses if l["status"] == status]
+            query.where("status", status)
         
         if type:
-            filtered_licenses = [l for l in filtered_licenses if l["type"] == type]
+            query.where("type", type)
         
-        return filtered_licenses
+        return query.all()
     
     @staticmethod
     def filter_by_date_range(
@@ -67,21 +296,7 @@ class Filter:
         end_date: Optional[datetime] = None
     ) -> List[Dict[str, Any]]:
         """Tarih aralığına göre filtreler."""
-        filtered_items = items.copy()
-        
-        if start_date:
-            filtered_items = [
-                item for item in filtered_items
-                if datetime.fromisoformat(item[date_field]) >= start_date
-            ]
-        
-        if end_date:
-            filtered_items = [
-                item for item in filtered_items
-                if datetime.fromisoformat(item[date_field]) <= end_date
-            ]
-        
-        return filtered_items
+        return Query(items).date_range(date_field, start_date, end_date).all()
     
     @staticmethod
     def filter_by_custom_condition(
@@ -95,18 +310,47 @@ class Filter:
     def sort_items(
         items: List[Dict[str, Any]],
         key: str,
-        reverse: bool = False
+        reverse: bool = False,
+        limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """Öğeleri belirtilen alana göre sıralar."""
+        """Öğeleri belirtilen alana göre sıralar; limit verilirse yalnızca ilk k öğeyi seçer."""
+        if limit is not None:
+            select = heapq.nlargest if reverse else heapq.nsmallest
+            return select(limit, items, key=lambda x: x[key])
         return sorted(items, key=lambda x: x[key], reverse=reverse)
     
     @staticmethod
     def paginate_items(
-        items: List[Dict[str, Any]],
+        items: Iterable[Dict[str, Any]],
         page: int,
         per_page: int
     ) -> List[Dict[str, Any]]:
         """Öğeleri sayfalar."""
         start = (page - 1) * per_page
         end = start + per_page
-        return items[start:end] 
\ No newline at end of file
+        if isinstance(items, list):
+            return items[start:end]
+        return list(islice(items, start, end))
+    
+    @staticmethod
+    def paginate_sorted(
+        items: Iterable[Dict[str, Any]],
+        key: str,
+        page: int,
+        per_page: int,
+        reverse: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Tüm listeyi sıralamadan, sıralı sonuçların istenen sayfasını döndürür."""
+        return Query(items).order_by(key, reverse).page(page, per_page)
+    
+    @staticmethod
+    def paginate_by_cursor(
+        items: Iterable[Dict[str, Any]],
+        key: str,
+        per_page: int,
+        cursor: Optional[Tuple[Any, Any]] = None,
+        reverse: bool = False,
+        id_field: str = "id"
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[Any, Any]]]:
+        """İmleç tabanlı sayfalama yapar; sayfayı ve sonraki imleci döndürür."""
+        return Query(items).order_by(key, reverse).page_after(cursor, per_page, id_field)
@@ -0,0 +1,108 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable, List, Optional, Tuple
+from .crypto_manager import CryptoManager
+from .encrypted_store import EncryptedRecordStore
+
+class ReencryptionJob(QObject):
+    """Anahtar döndürme sonrası şifreli kayıt ve dosyaları arka planda yeniden şifreler.
+    
+    Her şifreli veri hangi anahtarla yazıldığını başlığında taşıdığından iş kesintiye
+    uğrarsa yeniden başlatıldığında yalnızca eski anahtarla kalan veriler işlenir.
+    """
+    
+    progress = pyqtSignal(int, int)  # başarıyla işlenen, toplam
+    finished = pyqtSignal(int, int)  # yeniden şifrelenen, hatalı
+    
+    def __init__(
+        self,
+        crypto_manager: CryptoManager,
+        stores: Iterable[EncryptedRecordStore] = (),
+        files: Iterable[str] = (),
+        workers: int = 4,
+        batch_size: int = 256,
+        parent: Optional[QObject] = None
+    ):
+        super().__init__(parent)
+        self.crypto_manager = crypto_manager
+        self.stores = list(stores)
+        self.files = list(files)
+        self.workers = workers
+        self.batch_size = batch_size
+        self._cancelled = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        """İşi arka plan iş parçacığında başlatır."""
+        if self.is_running():
+            return
+        self._cancelled.clear()
+        # Eski kayıtlar çağıran iş parçacığında toplanır; depoların sqlite bağlantısı başka iş parçacığında kullanılamaz
+        tasks = self._collect_tasks()
+        self._thread = threading.Thread(target=self.run, args=(tasks,), daemon=True)
+        self._thread.start()
+    
+    def cancel(self):
+        """Bekleyen partileri iptal eder; tamamlanan partiler korunur."""
+        self._cancelled.set()
+    
+    def is_running(self) -> bool:
+        """İşin çalışıp çalışmadığını döndürür."""
+        return self._thread is not None and self._thread.is_alive()
+    
+    def wait(self, timeout: Optional[float] = None):
+        """İşin bitmesini bekler."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+    
+    def run(self, tasks: Optional[List[Tuple[Callable[[], int], int]]] = None) -> Tuple[int, int]:
+        """Eski anahtarla kalan verileri paralel partiler halinde yeniden şifreler.
+        
+        tasks verilmezse eski veriler bu iş parçacığında toplanır.
+        """
+        if tasks is None:
+            tasks = self._collect_tasks()
+        total = sum(size for _, size in tasks)
+        processed = rotated = failed = 0
+        self.progress.emit(0, total)
+        
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self._run_task, task): size for task, size in tasks}
+            for future in as_completed(futures):
+                size = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"Yeniden şifreleme sırasında hata oluştu: {e}")
+                    failed += size
+                    continue
+                # İptal edilen partiler ilerleme sayılmaz
+                if result is None:
+                    continue
+                rotated += result
+                processed += size
+                self.progress.emit(processed, total)
+        
+        self.finished.emit(rotated, failed)
+        return rotated, failed
+    
+    def _collect_tasks(self) -> List[Tuple[Callable[[], int], int]]:
+        """Yeniden şifrelenecek verileri (iş, öğe sayısı) partilerine böler."""
+        tasks: List[Tuple[Callable[[], int], int]] = []
+        for store in self.stores:
+            stale_ids = store.stale_ids()
+            for start in range(0, len(stale_ids), self.batch_size):
+                batch = stale_ids[start:start + self.batch_size]
+                tasks.append((lambda store=store, batch=batch: store.reencrypt(batch), len(batch)))
+        
+        for path in self.files:
+            if self.crypto_manager.file_key_id(path) != self.crypto_manager.key_id:
+                tasks.append((lambda path=path: int(self.crypto_manager.reencrypt_file(path)), 1))
+        return tasks
+    
+    def _run_task(self, task: Callable[[], int]) -> Optional[int]:
+        """İptal edilmediyse partiyi çalıştırır; iptal edildiyse None döndürür."""
+        if self._cancelled.is_set():
+            return None
+        return task()
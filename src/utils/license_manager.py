@@ -4,41 +4,69 @@ import uuid
 from datetime import datetime, timedelta
 from cryptography.fernet import Fernet
 from .crypto_manager import CryptoManager
+from .encrypted_store import EncryptedRecordStore
+from .expiry_scheduler import ExpiryScheduler
+from .key_rotation import ReencryptionJob
 
 class LicenseManager:
     """Lisans yönetimi sınıfı."""
     
     def __init__(self):
         self.crypto_manager = CryptoManager()
-        self.licenses_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "licenses.json")
-        self.licenses = self._load_licenses()
+        data_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+        self.licenses_file = os.path.join(data_dir, "licenses.json")
+        
+        # Her lisans ayrı şifrelenir; tek lisans değişikliği tüm dosyanın yeniden yazılmasını gerektirmez
+        self.licenses = EncryptedRecordStore(
+            os.path.join(data_dir, "licenses.db"),
+            self.crypto_manager,
+            index_fields=("user_id", "expiry_date", "is_active")
+        )
+        self._migrate_legacy_file()
+        self._reencryption_job = None
+        
+        # Süre dolumları sorgulanmadan, zamanı geldiğinde bildirilir
+        self.expiry_scheduler = ExpiryScheduler()
+        self.expiry_scheduler.license_expired.connect(self._on_license_expired)
+        for license_id, meta in self.licenses.metadata():
+            if meta["is_active"]:
+                self.expiry_scheduler.schedule(license_id, datetime.fromisoformat(meta["expiry_date"]))
+    
+    def _schedule_expiry(self, license_id):
+        """Lisansın bitiş olaylarını planlar."""
+        expiry_date = datetime.fromisoformat(self.licenses[license_id]["expiry_date"])
+        self.expiry_scheduler.schedule(license_id, expiry_date)
+    
+    def _on_license_expired(self, license_id):
+        """Süresi dolan lisansı devre dışı bırakır."""
+        license_data = self.licenses.get(license_id)
+        if license_data and license_data["is_active"]:
+            license_data["is_active"] = False
+            self._save_license(license_id)
     
-    def _load_licenses(self):
-        """Lisansları yükler."""
+    def _migrate_legacy_file(self):
+        """Tek parça şifreli lisans dosyasını kayıt bazlı depoya aktarır."""
         if not os.path.exists(self.licenses_file):
-            return {}
-            
+            return
+        
         try:
             with open(self.licenses_file, "r") as f:
                 encrypted_data = f.read()
-                decrypted_data = self.crypto_manager.decrypt_string(encrypted_data)
-                return json.loads(decrypted_data)
+                licenses = json.loads(self.crypto_manager.decrypt_string(encrypted_data))
+            for license_id, license_data in licenses.items():
+                if license_id not in self.licenses:
+                    self.licenses.put(license_id, license_data)
+            os.replace(self.licenses_file, self.licenses_file + ".migrated")
         except Exception as e:
-            print(f"Lisanslar yüklenirken hata oluştu: {e}")
-            return {}
+            print(f"Eski lisans dosyası aktarılırken hata oluştu: {e}")
     
-    def _save_licenses(self):
-        """Lisansları kaydeder."""
+    def _save_license(self, license_id):
+        """Tek bir lisansı şifreleyip kaydeder."""
         try:
-            data = json.dumps(self.licenses)
-            encrypted_data = self.crypto_manager.encrypt_string(data)
-            
-            os.makedirs(os.path.dirname(self.licenses_file), exist_ok=True)
-            with open(self.licenses_file, "w") as f:
-                f.write(encrypted_data)
+            self.licenses.put(license_id, self.licenses[license_id])
             return True
         except Exception as e:
-            print(f"Lisanslar kaydedilirken hata oluştu: {e}")
+            print(f"Lisans kaydedilirken hata oluştu: {e}")
             return False
     
     def create_license(self, user_id, duration_days, features=None):
@@ -56,35 +84,37 @@ class LicenseManager:
             "is_active": True
         }
         
-        self.licenses[license_id] = license_data
-        self._save_licenses()
+        self.licenses.put(license_id, license_data)
+        self._schedule_expiry(license_id)
         return license_id
     
     def validate_license(self, license_id):
         """Lisansı doğrular."""
         if license_id not in self.licenses:
             return False, "Lisans bulunamadı"
-            
+        
         license_data = self.licenses[license_id]
         
         # Lisans süresi kontrolü
         expiry_date = datetime.fromisoformat(license_data["expiry_date"])
         if datetime.now() > expiry_date:
-            license_data["is_active"] = False
-            self._save_licenses()
+            if license_data["is_active"]:
+                license_data["is_active"] = False
+                self._save_license(license_id)
+                self.expiry_scheduler.cancel(license_id)
             return False, "Lisans süresi dolmuş"
-            
+        
         # Aktiflik kontrolü
         if not license_data["is_active"]:
             return False, "Lisans aktif değil"
-            
+        
         return True, "Lisans geçerli"
     
     def renew_license(self, license_id, duration_days):
         """Lisansı yeniler."""
         if license_id not in self.licenses:
             return False, "Lisans bulunamadı"
-            
+        
         license_data = self.licenses[license_id]
         expiry_date = datetime.fromisoformat(license_data["expiry_date"])
         
@@ -93,20 +123,22 @@ class LicenseManager:
             new_expiry_date = expiry_date + timedelta(days=duration_days)
         else:
             new_expiry_date = datetime.now() + timedelta(days=duration_days)
-            
+        
         license_data["expiry_date"] = new_expiry_date.isoformat()
         license_data["is_active"] = True
         
-        self._save_licenses()
+        self._save_license(license_id)
+        self._schedule_expiry(license_id)
         return True, "Lisans başarıyla yenilendi"
     
     def deactivate_license(self, license_id):
         """Lisansı devre dışı bırakır."""
         if license_id not in self.licenses:
             return False, "Lisans bulunamadı"
-            
+        
         self.licenses[license_id]["is_active"] = False
-        self._save_licenses()
+        self._save_license(license_id)
+        self.expiry_scheduler.cancel(license_id)
         return True, "Lisans devre dışı bırakıldı"
     
     def get_license(self, license_id):
@@ -115,8 +147,23 @@ class LicenseManager:
     
     def get_user_licenses(self, user_id):
         """Kullanıcının lisanslarını döndürür."""
-        return {k: v for k, v in self.licenses.items() if v["user_id"] == user_id}
+        # Eşleşme açık metin indeks alanında yapılır; yalnızca kullanıcının lisansları çözülür
+        return {k: self.licenses[k] for k in self.licenses.find(user_id=user_id)}
     
     def get_all_licenses(self):
         """Tüm lisansları döndürür."""
-        return self.licenses 
\ No newline at end of file
+        return self.licenses
+    
+    def rotate_encryption_key(self, workers=4):
+        """Şifreleme anahtarını döndürür ve lisansları arka planda yeni anahtarla yeniden şifreler."""
+        self.crypto_manager.rotate_key()
+        self._reencryption_job = ReencryptionJob(self.crypto_manager, stores=[self.licenses], workers=workers)
+        self._reencryption_job.start()
+        return self._reencryption_job
+    
+    def resume_reencryption(self, workers=4):
+        """Yarıda kalan yeniden şifreleme işini sürdürür; eski anahtarla kalan lisansları işler."""
+        if self._reencryption_job is None or not self._reencryption_job.is_running():
+            self._reencryption_job = ReencryptionJob(self.crypto_manager, stores=[self.licenses], workers=workers)
+            self._reencryption_job.start()
+        return self._reencryption_job
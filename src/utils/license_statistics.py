@@ -0,0 +1,157 @@
+from bisect import bisect_left, insort
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from .filters import parse_datetime
+
+
+def _parse(value: Any) -> Optional[datetime]:
+    """Tarih metnini ayrıştırır, geçersizse None döndürür."""
+    if not value:
+        return None
+    try:
+        return parse_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class LicenseStatistics:
+    """Lisans ekleme/güncelleme/silme ile artımlı güncellenen istatistik toplayıcısı."""
+    
+    ACTIVE_STATUS = "ACTIVE"
+    
+    def __init__(self):
+        self._entries: Dict[str, Tuple[str, str, Optional[datetime], Optional[datetime]]] = {}
+        self._status_counts: Counter = Counter()
+        self._type_counts: Counter = Counter()
+        self._created: List[datetime] = []
+        self._expiry: List[Tuple[datetime, str]] = []
+        self._licenses: Dict[str, Dict[str, Any]] = {}
+    
+    def clear(self):
+        """Tüm sayaçları sıfırlar."""
+        self._entries.clear()
+        self._status_counts.clear()
+        self._type_counts.clear()
+        self._created.clear()
+        self._expiry.clear()
+        self._licenses.clear()
+    
+    def rebuild(self, licenses: List[Dict[str, Any]]):
+        """Sayaçları lisans listesinden yeniden oluşturur.
+        
+        Anahtar lisansın kimliğidir; aynı anahtar birden çok kez geçerse add ve alan indeksindeki
+        gibi son kayıt geçerli olur, öncekiler sayılmaz.
+        """
+        self.clear()
+        for license in {license["key"]: license for license in licenses}.values():
+            status, _, created, expiry = self._add_entry(license)
+            if created is not None:
+                self._created.append(created)
+            if status == self.ACTIVE_STATUS and expiry is not None:
+                self._expiry.append((expiry, license["key"]))
+        self._created.sort()
+        self._expiry.sort()
+    
+    def add(self, license: Dict[str, Any]):
+        """Lisansı istatistiklere ekler; varsa önceki değerlerini günceller."""
+        self.remove(license["key"])
+        status, _, created, expiry = self._add_entry(license)
+        if created is not None:
+            insort(self._created, created)
+        if status == self.ACTIVE_STATUS and expiry is not None:
+            insort(self._expiry, (expiry, license["key"]))
+    
+    def update(self, license: Dict[str, Any]):
+        """Lisansın istatistiklerdeki değerlerini günceller."""
+        self.add(license)
+    
+    def remove(self, key: str):
+        """Lisansı istatistiklerden çıkarır."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        status, type_, created, expiry = entry
+        self._licenses.pop(key, None)
+        self._decrement(self._status_counts, status)
+        self._decrement(self._type_counts, type_)
+        if created is not None:
+            position = bisect_left(self._created, created)
+            if position < len(self._created) and self._created[position] == created:
+                del self._created[position]
+        if status == self.ACTIVE_STATUS and expiry is not None:
+            position = bisect_left(self._expiry, (expiry, key))
+            if position < len(self._expiry) and self._expiry[position] == (expiry, key):
+                del self._expiry[position]
+    
+    def count(self, status: Optional[str] = None) -> int:
+        """Toplam veya belirtilen durumdaki lisans sayısını döndürür."""
+        if status is None:
+            return len(self._entries)
+        return self._status_counts.get(status, 0)
+    
+    def type_distribution(self) -> Dict[str, int]:
+        """Lisans türlerine göre dağılımı döndürür."""
+        return dict(self._type_counts)
+    
+    def created_since(self, since: datetime) -> int:
+        """Belirtilen tarihten sonra oluşturulan lisans sayısını döndürür."""
+        return len(self._created) - bisect_left(self._created, since)
+    
+    def expiring(
+        self,
+        until: datetime,
+        since: Optional[datetime] = None
+    ) -> Iterator[Tuple[datetime, Dict[str, Any]]]:
+        """Bitiş tarihi [since, until) aralığındaki aktif lisansları bitiş sırasıyla üretir."""
+        start = 0 if since is None else bisect_left(self._expiry, (since, ""))
+        stop = bisect_left(self._expiry, (until, ""))
+        for expiry, key in self._expiry[start:stop]:
+            yield expiry, self._licenses[key]
+    
+    def next_expiry(self) -> Optional[datetime]:
+        """En yakın aktif lisans bitiş tarihini döndürür."""
+        return self._expiry[0][0] if self._expiry else None
+    
+    def summary(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """get_license_statistics ile aynı biçimde özet döndürür."""
+        now = now or datetime.now()
+        soon_to_expire = []
+        for end_date, license in self.expiring(now + timedelta(days=31), since=now):
+            soon_to_expire.append({
+                "key": license["key"],
+                "days_left": (end_date - now).days,
+                "user_id": license["user_id"]
+            })
+        
+        return {
+            "total": self.count(),
+            "active": self.count("ACTIVE"),
+            "expired": self.count("EXPIRED"),
+            "suspended": self.count("SUSPENDED"),
+            "type_distribution": self.type_distribution(),
+            "new_licenses_30d": self.created_since(now - timedelta(days=30)),
+            "soon_to_expire": soon_to_expire
+        }
+    
+    def _add_entry(self, license: Dict[str, Any]) -> Tuple[str, str, Optional[datetime], Optional[datetime]]:
+        """Kaydı ve sayaçları günceller; sıralı listelere ekleme çağırana bırakılır."""
+        key = license["key"]
+        entry = (
+            license.get("status"),
+            license.get("type"),
+            _parse(license.get("created_at")),
+            _parse(license.get("end_date"))
+        )
+        self._entries[key] = entry
+        self._licenses[key] = license
+        self._status_counts[entry[0]] += 1
+        self._type_counts[entry[1]] += 1
+        return entry
+    
+    @staticmethod
+    def _decrement(counter: Counter, value: Any):
+        """Sayacı azaltır, sıfırlanan anahtarı siler."""
+        counter[value] -= 1
+        if counter[value] <= 0:
+            del counter[value]
@@ -0,0 +1,218 @@
+import json
+import os
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+# Yan indeks dosyası, log dosyasının adına eklenen bu uzantıyla tutulur
+INDEX_SUFFIX = ".idx"
+BUCKET_SECONDS = 60
+BLOCK_SIZE = 64 * 1024
+
+# JSON öncesi çok satırlı metin biçiminin başlık satırı
+LEGACY_HEADER = re.compile(rb"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) - (\w+) - (\S+) - (.*)$")
+
+TimeBound = Union[datetime, str, None]
+
+
+def index_path(log_file: str) -> str:
+    """Log dosyasının yan indeks dosyasının yolunu döndürür."""
+    return log_file + INDEX_SUFFIX
+
+
+def _to_timestamp(value: TimeBound) -> Optional[float]:
+    """Tarih sınırını epoch saniyesine çevirir."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp()
+
+
+def reverse_lines(path: str, start: int = 0, end: Optional[int] = None, block_size: int = BLOCK_SIZE) -> Iterator[bytes]:
+    """Dosyanın [start, end) aralığındaki satırları sondan başa doğru, bloklar halinde okuyarak üretir.
+    
+    Bellekte en fazla bir blok ve yarım kalan bir satır tutulur; okuma EOF'tan başladığı için
+    son kayıtlara ulaşmak dosya boyutundan bağımsızdır.
+    """
+    with open(path, "rb") as f:
+        if end is None:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+        position = end
+        remainder = b""
+        while position > start:
+            size = min(block_size, position - start)
+            position -= size
+            f.seek(position)
+            block = f.read(size) + remainder
+            lines = block.split(b"\n")
+            # İlk parça bir önceki bloğun devamı olabilir; sonraki tura bırakılır
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line:
+                    yield line.rstrip(b"\r")
+        if remainder:
+            yield remainder.rstrip(b"\r")
+
+
+def tail_json_lines(path: str, limit: int) -> List[Dict[str, Any]]:
+    """JSON satır dosyasının son kayıtlarını eskiden yeniye döndürür."""
+    entries = []
+    if limit <= 0 or not os.path.exists(path):
+        return entries
+    for line in reverse_lines(path):
+        try:
+            entries.append(json.loads(line))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
+        if len(entries) >= limit:
+            break
+    entries.reverse()
+    return entries
+
+
+def read_index(log_file: str) -> List[Dict[str, Any]]:
+    """Yan indeksteki tamamlanmış zaman dilimi kayıtlarını okur."""
+    entries = []
+    try:
+        with open(index_path(log_file), "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Yazılmakta olan son satır yarım olabilir
+                    continue
+    except FileNotFoundError:
+        pass
+    return entries
+
+
+class LogQuery:
+    """JSON satır log dosyalarında, yan indeksi kullanarak yeniden eskiye sorgu yapar."""
+    
+    def __init__(
+        self,
+        log_file: str,
+        backup_count: int = 0,
+        log_type: str = "all",
+        severity: Optional[str] = None,
+        since: TimeBound = None,
+        until: TimeBound = None
+    ):
+        self.log_file = log_file
+        self.backup_count = backup_count
+        self.log_type = None if log_type in (None, "all") else log_type
+        self.severity = severity.upper() if severity else None
+        self.since = _to_timestamp(since)
+        self.until = _to_timestamp(until)
+    
+    def files(self) -> List[str]:
+        """Aktif dosya önce olmak üzere mevcut log dosyalarını yeniden eskiye döndürür."""
+        candidates = [self.log_file] + [f"{self.log_file}.{i}" for i in range(1, self.backup_count + 1)]
+        return [path for path in candidates if os.path.exists(path)]
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for path in self.files():
+            for entry in self._iter_file(path):
+                yield entry
+    
+    def newest(self, limit: int) -> List[Dict[str, Any]]:
+        """Filtreye uyan en yeni kayıtları yeniden eskiye döndürür."""
+        results = []
+        if limit <= 0:
+            return results
+        for entry in self:
+            results.append(entry)
+            if len(results) >= limit:
+                break
+        return results
+    
+    def _iter_file(self, path: str) -> Iterator[Dict[str, Any]]:
+        """Dosyanın ilgili bölümlerindeki kayıtları yeniden eskiye üretir."""
+        for start, end in reversed(self._segments(path)):
+            for entry in self._read_segment(path, start, end):
+                if self._matches(entry):
+                    yield entry
+    
+    def _segments(self, path: str) -> List[Tuple[int, Optional[int]]]:
+        """Filtreye göre okunması gereken (başlangıç, bitiş) bayt aralıklarını döndürür."""
+        segments = []
+        position = 0
+        for entry in sorted(read_index(path), key=lambda entry: entry["offset"]):
+            # İndekslenmemiş aralıklar (indeksten önce yazılmış eski metin kayıtları, kapanmadan
+            # kalmış dilimler) hakkında bilgi olmadığından her zaman taranır
+            if entry["offset"] > position:
+                segments.append((position, entry["offset"]))
+            if self._bucket_may_match(entry):
+                segments.append((entry["offset"], entry["end"]))
+            position = max(position, entry["end"])
+        
+        # İndekse henüz yazılmamış kuyruk (açık zaman dilimi) her zaman taranır
+        segments.append((position, None))
+        return segments
+    
+    def _bucket_may_match(self, entry: Dict[str, Any]) -> bool:
+        """İndeks kaydına göre zaman diliminde eşleşen kayıt olabilir mi döndürür."""
+        bucket_start = entry["start"]
+        if self.since is not None and bucket_start + BUCKET_SECONDS <= self.since:
+            return False
+        if self.until is not None and bucket_start > self.until:
+            return False
+        if self.severity and not entry["levels"].get(self.severity):
+            return False
+        if self.log_type and not entry["types"].get(self.log_type):
+            return False
+        return True
+    
+    def _read_segment(self, path: str, start: int, end: Optional[int]) -> Iterator[Dict[str, Any]]:
+        """Bayt aralığındaki kayıtları sondan okuyarak yeniden eskiye üretir."""
+        # Eski metin biçiminde devam satırları başlıktan önce okunur; başlık gelene kadar biriktirilir
+        continuation: List[bytes] = []
+        for line in reverse_lines(path, start, end):
+            if line.startswith(b"{"):
+                continuation.clear()
+                try:
+                    yield json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                continue
+            
+            match = LEGACY_HEADER.match(line)
+            if match is None:
+                continuation.append(line)
+                continue
+            yield self._parse_legacy(match, reversed(continuation))
+            continuation.clear()
+    
+    @staticmethod
+    def _parse_legacy(match: "re.Match", lines: Iterator[bytes]) -> Dict[str, Any]:
+        """Eski çok satırlı metin kaydını JSON kayıtlarıyla aynı biçime çevirir."""
+        timestamp, level, log_type, message = (group.decode("utf-8", "replace") for group in match.groups())
+        context_lines = [line.decode("utf-8", "replace") for line in lines]
+        if context_lines and context_lines[0].startswith("Context:"):
+            context_lines[0] = context_lines[0][len("Context:"):].strip()
+        return {
+            "timestamp": timestamp.replace(" ", "T"),
+            "level": level,
+            "type": log_type,
+            "message": message.strip(),
+            "context": "\n".join(context_lines).strip()
+        }
+    
+    def _matches(self, entry: Dict[str, Any]) -> bool:
+        """Kaydın filtrelere uyup uymadığını döndürür."""
+        if self.log_type and entry.get("type") != self.log_type:
+            return False
+        if self.severity and entry.get("level") != self.severity:
+            return False
+        if self.since is not None or self.until is not None:
+            try:
+                timestamp = datetime.fromisoformat(entry["timestamp"]).timestamp()
+            except (KeyError, TypeError, ValueError):
+                return False
+            if self.since is not None and timestamp < self.since:
+                return False
+            if self.until is not None and timestamp > self.until:
+                return False
+        return True
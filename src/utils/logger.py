@@ -1,14 +1,230 @@
+import atexit
 import logging
 import os
 import json
+import queue
+import random
+import threading
 import traceback
 from datetime import datetime
 from typing import Optional, Dict, Any, Union
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from .log_index import BUCKET_SECONDS, LogQuery, TimeBound, index_path, tail_json_lines
+
+
+class BatchedRotatingFileHandler(RotatingFileHandler):
+    """Her kayıtta değil, yazıcı iş parçacığı bir partiyi bitirdiğinde diske boşaltan dosya handler'ı."""
+    
+    def flush(self):
+        # Kayıt başına boşaltma yapılmaz; flush_batch yazıcı iş parçacığından çağrılır
+        pass
+    
+    def flush_batch(self):
+        """Tamponu diske boşaltır."""
+        super().flush()
+    
+    def close(self):
+        self.flush_batch()
+        super().close()
+
+
+class IndexedRotatingFileHandler(BatchedRotatingFileHandler):
+    """Kayıtların bayt konumlarını izleyip zaman dilimi başına yan indeks yazan dosya handler'ı.
+    
+    İndeksteki her satır bir dakikalık dilimi anlatır: başlangıç zamanı, dosyadaki bayt aralığı,
+    seviye ve tür sayıları. Sorgular bu sayede ilgisiz dilimleri okumadan atlar.
+    """
+    
+    def __init__(self, filename: str, **kwargs):
+        super().__init__(filename, **kwargs)
+        self._offset = os.path.getsize(self.baseFilename) if os.path.exists(self.baseFilename) else 0
+        self._index_stream = open(index_path(self.baseFilename), "a", encoding="utf-8")
+        self._bucket: Optional[Dict[str, Any]] = None
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            line = self.format(record) + self.terminator
+            size = len(line.encode(self.encoding or "utf-8"))
+            # Dönüşüm kararı izlenen konumdan verilir; kayıt ikinci kez biçimlenmez
+            if self.maxBytes > 0 and self._offset > 0 and self._offset + size > self.maxBytes:
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            
+            bucket_start = int(record.created // BUCKET_SECONDS) * BUCKET_SECONDS
+            if self._bucket is None or self._bucket["start"] != bucket_start:
+                self._close_bucket()
+                self._bucket = {"start": bucket_start, "offset": self._offset, "end": self._offset, "levels": {}, "types": {}}
+            
+            self.stream.write(line)
+            self._offset += size
+            bucket = self._bucket
+            bucket["end"] = self._offset
+            bucket["levels"][record.levelname] = bucket["levels"].get(record.levelname, 0) + 1
+            bucket["types"][record.name] = bucket["types"].get(record.name, 0) + 1
+        except Exception:
+            self.handleError(record)
+    
+    def _close_bucket(self):
+        """Açık zaman dilimini indekse yazar."""
+        if self._bucket is not None and self._bucket["end"] > self._bucket["offset"]:
+            self._index_stream.write(json.dumps(self._bucket, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._bucket = None
+    
+    def flush_batch(self):
+        super().flush_batch()
+        if not self._index_stream.closed:
+            self._index_stream.flush()
+    
+    def doRollover(self):
+        self._close_bucket()
+        self._index_stream.close()
+        super().doRollover()
+        
+        # İndeks dosyaları log dosyalarıyla aynı sırada kaydırılır
+        for i in range(self.backupCount - 1, 0, -1):
+            source = index_path(self.rotation_filename(f"{self.baseFilename}.{i}"))
+            target = index_path(self.rotation_filename(f"{self.baseFilename}.{i + 1}"))
+            if os.path.exists(source):
+                os.replace(source, target)
+        current = index_path(self.baseFilename)
+        if os.path.exists(current):
+            os.replace(current, index_path(self.rotation_filename(f"{self.baseFilename}.1")))
+        
+        self._offset = 0
+        self._index_stream = open(current, "a", encoding="utf-8")
+    
+    def close(self):
+        # logging'in kendi kapanışı ve Logger.shutdown handler'ı iki kez kapatabilir
+        if not self._index_stream.closed:
+            self._close_bucket()
+            self._index_stream.close()
+        super().close()
+
+
+class JsonLineFormatter(logging.Formatter):
+    """Kaydı tek satırlık JSON nesnesi olarak biçimler."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        context = getattr(record, "context", None)
+        if isinstance(context, LazyContext):
+            context = context.value
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "type": record.name,
+            "message": record.getMessage(),
+            "context": context
+        }
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class FastQueueHandler(QueueHandler):
+    """Kaydı kopyalamadan ve biçimlendirmeden kuyruğa ekleyen handler; biçimlendirme yazıcı iş parçacığında yapılır."""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Argümanlar ve istisna bilgisi kuyruğa girmeden metne çevrilir, gerisi yazıcıya bırakılır
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        # Doğrudan verilen bağlam da çağıranın değiştirebileceği haliyle kuyruğa girmesin
+        context = getattr(record, "context", None)
+        if isinstance(context, (dict, list)):
+            record.context = LazyContext(context)
+        return record
+
+
+class BatchQueueListener(QueueListener):
+    """Kuyruktaki kayıtları partiler halinde işleyip parti sonunda handler'ları boşaltan dinleyici."""
+    
+    def __init__(self, log_queue: queue.SimpleQueue, *handlers: logging.Handler, batch_size: int = 512):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Kuyruğa o ana kadar eklenen kayıtlar yazılana kadar bekler."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self.queue.put(done)
+        return done.wait(timeout)
+    
+    def _monitor(self):
+        q = self.queue
+        while True:
+            # İlk kayıt için beklenir, ardından kuyrukta biriken kayıtlar beklemeden alınır
+            records = [q.get()]
+            while len(records) < self.batch_size:
+                try:
+                    records.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stop = False
+            waiters = []
+            for record in records:
+                if record is self._sentinel:
+                    stop = True
+                elif isinstance(record, threading.Event):
+                    waiters.append(record)
+                else:
+                    self.handle(record)
+            
+            for handler in self.handlers:
+                if isinstance(handler, BatchedRotatingFileHandler):
+                    handler.flush_batch()
+                else:
+                    handler.flush()
+            
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                break
+
+
+class LazyContext:
+    """Bağlamı yalnızca kayıt yazılırken, tek satır JSON olarak metne çeviren sarmalayıcı."""
+    
+    __slots__ = ("value",)
+    
+    def __init__(self, value: Any):
+        # Yazım başka iş parçacığında yapılır; çağıranın sözlüğü sonradan değişirse
+        # kayıt oluşturulduğu andaki hali yazılsın diye kaplar burada yüzeysel kopyalanır
+        self.value = _copy_containers(value, depth=2)
+    
+    def __str__(self) -> str:
+        value = self.value
+        if value is None:
+            return "No context provided"
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+        return str(value)
+
+
+def _copy_containers(value: Any, depth: int) -> Any:
+    """Sözlük ve listeleri verilen derinliğe kadar yüzeysel kopyalar; diğer değerleri olduğu gibi döndürür."""
+    if depth <= 0:
+        return value
+    if isinstance(value, dict):
+        return {key: _copy_containers(item, depth - 1) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_containers(item, depth - 1) for item in value]
+    return value
+
 
 class Logger:
     _instance = None
     _initialized = False
+    
+    AUDIT_LOGGER = 'audit'
+    ERROR_LOGGER = 'error_log'
+    # Log dosyalarının yazıldığı klasör; ilk Logger() çağrısından önce değiştirilebilir
+    LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
@@ -20,7 +236,7 @@ class Logger:
             Logger._initialized = True
             
             # Log klasörünü oluştur
-            self.log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
+            self.log_dir = self.LOG_DIR
             os.makedirs(self.log_dir, exist_ok=True)
             
             # Log dosyası ayarları
@@ -31,42 +247,95 @@ class Logger:
                 datefmt='%Y-%m-%d %H:%M:%S'
             )
             
-            # Dosya handler'ı (10MB limit, 5 backup)
-            file_handler = RotatingFileHandler(
+            # Denetim ve hata kayıtları kendi dosyalarına gider, ana log'a karışmaz
+            dedicated_loggers = {self.AUDIT_LOGGER, self.ERROR_LOGGER}
+            
+            # Dosya handler'ı (10MB limit, 5 backup); satır başına bir JSON kaydı ve yan indeks
+            file_handler = IndexedRotatingFileHandler(
                 log_file,
                 maxBytes=10*1024*1024,  # 10MB
                 backupCount=5,
                 encoding='utf-8'
             )
-            file_handler.setFormatter(formatter)
+            file_handler.setFormatter(JsonLineFormatter())
             file_handler.setLevel(logging.DEBUG)
+            file_handler.addFilter(lambda record: record.name not in dedicated_loggers)
             
             # Konsol handler'ı
             console_handler = logging.StreamHandler()
             console_handler.setFormatter(formatter)
             console_handler.setLevel(logging.INFO)
+            console_handler.addFilter(lambda record: record.name not in dedicated_loggers)
+            
+            # Denetim ve hata dosyaları açık tutulur; her kayıtta açılıp kapanmaz
+            json_formatter = logging.Formatter('%(message)s')
+            audit_handler = BatchedRotatingFileHandler(
+                os.path.join(self.log_dir, "audit.log"), maxBytes=10*1024*1024, backupCount=5, encoding='utf-8'
+            )
+            audit_handler.setFormatter(json_formatter)
+            audit_handler.addFilter(logging.Filter(self.AUDIT_LOGGER))
+            error_handler = BatchedRotatingFileHandler(
+                os.path.join(self.log_dir, "error.log"), maxBytes=10*1024*1024, backupCount=5, encoding='utf-8'
+            )
+            error_handler.setFormatter(json_formatter)
+            error_handler.addFilter(logging.Filter(self.ERROR_LOGGER))
+            
+            # Çağıran iş parçacığı yalnızca kuyruğa ekler; yazma işini ayrı bir iş parçacığı yapar
+            self._queue: queue.SimpleQueue = queue.SimpleQueue()
+            self._listener = BatchQueueListener(
+                self._queue, file_handler, console_handler, audit_handler, error_handler
+            )
+            self._listener.start()
+            self._log_file = log_file
+            self._backup_count = file_handler.backupCount
+            atexit.register(self.shutdown)
             
             # Root logger'ı yapılandır
             root_logger = logging.getLogger()
             root_logger.setLevel(logging.DEBUG)
-            root_logger.addHandler(file_handler)
-            root_logger.addHandler(console_handler)
+            root_logger.addHandler(FastQueueHandler(self._queue))
             
             # Özel logger'lar oluştur
             self.app_logger = logging.getLogger('app')
             self.security_logger = logging.getLogger('security')
             self.data_logger = logging.getLogger('data')
             self.outlook_logger = logging.getLogger('outlook')
+            self.audit_logger = logging.getLogger(self.AUDIT_LOGGER)
+            self.error_file_logger = logging.getLogger(self.ERROR_LOGGER)
+            
+            # Uyarılarda yığın izi varsayılan olarak alınmaz; gerekirse açılır veya örneklenir
+            self.capture_warning_stack = False
+            self.warning_stack_sample_rate = 0.0
             
             self.app_logger.info("Logger başlatıldı", extra={'context': 'Initialization'})
     
-    def _format_context(self, context: Union[str, Dict, None]) -> str:
-        """Bağlam bilgisini formatlar."""
-        if context is None:
-            return "No context provided"
-        elif isinstance(context, dict):
-            return json.dumps(context, ensure_ascii=False, indent=2)
-        return str(context)
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Kuyruktaki tüm kayıtlar diske yazılana kadar bekler."""
+        return self._listener.flush(timeout)
+    
+    def shutdown(self):
+        """Yazıcı iş parçacığını durdurur; bekleyen kayıtlar yazılır."""
+        if self._listener._thread is not None:
+            self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+    
+    def configure_stack_capture(self, enabled: bool = False, sample_rate: float = 0.0):
+        """Uyarı kayıtlarında yığın izi alınmasını açar/kapatır veya örnekleme oranını ayarlar."""
+        self.capture_warning_stack = enabled
+        self.warning_stack_sample_rate = max(0.0, min(sample_rate, 1.0))
+    
+    def _format_context(self, context: Union[str, Dict, None]) -> LazyContext:
+        """Bağlam bilgisini yazım anında biçimlenecek şekilde sarar."""
+        return LazyContext(context)
+    
+    def _should_capture_stack(self, capture_stack: Optional[bool]) -> bool:
+        """Bu uyarı için yığın izi alınıp alınmayacağını döndürür."""
+        if capture_stack is not None:
+            return capture_stack
+        if self.capture_warning_stack:
+            return True
+        return self.warning_stack_sample_rate > 0 and random.random() < self.warning_stack_sample_rate
     
     def _get_stack_trace(self, error: Optional[Exception] = None) -> str:
         """Stack trace bilgisini formatlar."""
@@ -98,18 +367,23 @@ class Logger:
     def log_info(self, logger_name: str, message: str, context: Any = None):
         """Geliştirilmiş bilgi loglama."""
         logger = logging.getLogger(logger_name)
+        if not logger.isEnabledFor(logging.INFO):
+            return
         logger.info(
             message,
             extra={'context': self._format_context(context)}
         )
     
-    def log_warning(self, logger_name: str, message: str, context: Any = None):
+    def log_warning(self, logger_name: str, message: str, context: Any = None, capture_stack: Optional[bool] = None):
         """Geliştirilmiş uyarı loglama."""
         logger = logging.getLogger(logger_name)
-        formatted_context = self._format_context({
-            'warning_details': context,
-            'stack_trace': ''.join(self._get_stack_trace())
-        })
+        if not logger.isEnabledFor(logging.WARNING):
+            return
+        
+        warning_context = {'warning_details': context}
+        if self._should_capture_stack(capture_stack):
+            warning_context['stack_trace'] = ''.join(self._get_stack_trace())
+        formatted_context = self._format_context(warning_context)
         logger.warning(
             message,
             extra={'context': formatted_context}
@@ -117,6 +391,8 @@ class Logger:
     
     def log_security_event(self, event_type: str, user_id: str, details: Dict = None):
         """Geliştirilmiş güvenlik olayı loglama."""
+        if not self.security_logger.isEnabledFor(logging.INFO):
+            return
         context = {
             'event_type': event_type,
             'user_id': user_id,
@@ -131,6 +407,8 @@ class Logger:
     
     def log_data_operation(self, operation: str, entity_type: str, entity_id: str = None, details: Dict = None):
         """Geliştirilmiş veri işlemi loglama."""
+        if not self.data_logger.isEnabledFor(logging.INFO):
+            return
         context = {
             'operation': operation,
             'entity_type': entity_type,
@@ -146,6 +424,8 @@ class Logger:
     
     def log_outlook_operation(self, operation: str, status: str, details: Dict = None):
         """Geliştirilmiş Outlook işlemi loglama."""
+        if not self.outlook_logger.isEnabledFor(logging.INFO):
+            return
         context = {
             'operation': operation,
             'status': status,
@@ -158,63 +438,40 @@ class Logger:
             extra={'context': self._format_context(context)}
         )
     
-    def get_recent_logs(self, log_type: str = "all", limit: int = 100, severity: str = None) -> list[Dict[str, Any]]:
-        """Geliştirilmiş log getirme fonksiyonu."""
-        log_file = os.path.join(self.log_dir, "app.log")
-        
-        if not os.path.exists(log_file):
-            return []
-        
-        logs = []
-        with open(log_file, "r", encoding="utf-8") as f:
-            current_log = {}
-            for line in f:
-                if line.startswith(datetime.now().strftime("%Y")):  # Yeni log girişi
-                    if current_log:
-                        if self._should_include_log(current_log, log_type, severity):
-                            logs.append(current_log)
-                    current_log = self._parse_log_line(line)
-                elif current_log:  # Mevcut log girişine ek bilgi
-                    if line.startswith("Context:"):
-                        current_log["context"] = line[8:].strip()
-                    elif line.strip():
-                        current_log.setdefault("details", []).append(line.strip())
-            
-            # Son log girişini ekle
-            if current_log and self._should_include_log(current_log, log_type, severity):
-                logs.append(current_log)
+    def query_logs(
+        self,
+        log_type: str = "all",
+        severity: Optional[str] = None,
+        since: TimeBound = None,
+        until: TimeBound = None
+    ) -> LogQuery:
+        """Döndürülmüş dosyalar dahil logları yeniden eskiye sorgulayan nesne döndürür."""
+        # Kuyrukta bekleyen kayıtlar da sorguya dahil olsun
+        self.flush(timeout=1.0)
+        return LogQuery(self._log_file, self._backup_count, log_type, severity, since, until)
         
-        return logs[-limit:]
-    
-    def _should_include_log(self, log: Dict[str, Any], log_type: str, severity: str) -> bool:
-        """Log filtreleme mantığı."""
-        if log_type != "all" and log.get("type") != log_type:
-            return False
-        if severity and log.get("level") != severity.upper():
-            return False
-        return True
-    
-    def _parse_log_line(self, line: str) -> Dict[str, Any]:
-        """Log satırını ayrıştırır."""
-        try:
-            parts = line.split(" - ", 3)
-            return {
-                "timestamp": parts[0],
-                "level": parts[1],
-                "type": parts[2],
-                "message": parts[3].strip(),
-                "context": "",
-                "details": []
-            }
-        except IndexError:
-            return {
-                "timestamp": datetime.now().isoformat(),
-                "level": "ERROR",
-                "type": "parser",
-                "message": "Log satırı ayrıştırılamadı",
-                "context": line,
-                "details": []
-            }
+    def get_recent_logs(
+        self,
+        log_type: str = "all",
+        limit: int = 100,
+        severity: Optional[str] = None,
+        since: TimeBound = None,
+        until: TimeBound = None
+    ) -> list[Dict[str, Any]]:
+        """Filtreye uyan son logları eskiden yeniye sıralı döndürür."""
+        logs = self.query_logs(log_type, severity, since, until).newest(limit)
+        logs.reverse()
+        return logs
+    
+    def get_recent_audit_logs(self, limit: int = 100) -> list[Dict[str, Any]]:
+        """Son denetim kayıtlarını dosyayı sondan okuyarak döndürür."""
+        self.flush(timeout=1.0)
+        return tail_json_lines(os.path.join(self.log_dir, "audit.log"), limit)
+    
+    def get_recent_errors(self, limit: int = 100) -> list[Dict[str, Any]]:
+        """Son hata kayıtlarını dosyayı sondan okuyarak döndürür."""
+        self.flush(timeout=1.0)
+        return tail_json_lines(os.path.join(self.log_dir, "error.log"), limit)
     
     def get_app_logger(self):
         """Uygulama logları için logger döndürür."""
@@ -248,6 +505,8 @@ class Logger:
     
     def log_debug(self, message: str, details: Optional[Dict[str, Any]] = None):
         """Debug logu kaydeder."""
+        if not self.app_logger.isEnabledFor(logging.DEBUG):
+            return
         self.app_logger.debug(
             f"{message}",
             extra={'context': self._format_context(details)}
@@ -262,9 +521,7 @@ class Logger:
             "details": details
         }
         
-        with open(os.path.join(self.log_dir, "audit.log"), "a", encoding="utf-8") as f:
-            json.dump(log_entry, f, ensure_ascii=False)
-            f.write("\n")
+        self.audit_logger.info(json.dumps(log_entry, ensure_ascii=False))
     
     def _write_error_log(self, error_type: str, error_message: str, traceback: Optional[str] = None):
         """Hata logu yazar."""
@@ -276,28 +533,8 @@ class Logger:
             "traceback": traceback
         }
         
-        with open(os.path.join(self.log_dir, "error.log"), "a", encoding="utf-8") as f:
-            json.dump(log_entry, f, ensure_ascii=False)
-            f.write("\n")
+        self.error_file_logger.error(json.dumps(log_entry, ensure_ascii=False))
     
     def _get_timestamp(self) -> str:
         """Zaman damgası oluşturur."""
         return datetime.now().isoformat()
-    
-    def get_recent_logs(self, log_type: str = "all", limit: int = 100) -> list[Dict[str, Any]]:
-        """Son logları getirir."""
-        log_file = os.path.join(self.log_dir, "app.log")
-        
-        if not os.path.exists(log_file):
-            return []
-        
-        logs = []
-        with open(log_file, "r", encoding="utf-8") as f:
-            for line in f:
-                try:
-                    log_entry = json.loads(line)
-                    logs.append(log_entry)
-                except json.JSONDecodeError:
-                    continue
-        
-        return logs[-limit:] 
\ No newline at end of file
@@ -0,0 +1,133 @@
+import hashlib
+import hmac
+import secrets
+import time
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    from argon2.low_level import Type, hash_secret_raw
+except ImportError:  # argon2-cffi isteğe bağlıdır
+    hash_secret_raw = None
+
+PBKDF2 = "pbkdf2_sha256"
+SCRYPT = "scrypt"
+ARGON2 = "argon2id"
+
+# Parametre kaydı olmayan eski kullanıcı hash'lerinin üretildiği ayarlar
+LEGACY_PARAMS = {"algorithm": PBKDF2, "iterations": 100000}
+
+
+def available_algorithms() -> list:
+    """Bu ortamda kullanılabilen algoritmaları tercih sırasıyla döndürür."""
+    algorithms = []
+    if hash_secret_raw is not None:
+        algorithms.append(ARGON2)
+    if hasattr(hashlib, "scrypt"):
+        algorithms.append(SCRYPT)
+    algorithms.append(PBKDF2)
+    return algorithms
+
+
+class PasswordHasher:
+    """Kullanıcı başına parametre saklayan, ayarlanabilir maliyetli şifre hash'leyici."""
+    
+    MIN_PBKDF2_ITERATIONS = LEGACY_PARAMS["iterations"]
+    SCRYPT_MAX_MEMORY = 256 * 1024 * 1024
+    CACHE_TTL = 15 * 60
+    
+    def __init__(self, params: Optional[Dict[str, Any]] = None):
+        self.params = dict(params or LEGACY_PARAMS)
+        # Doğrulanmış şifreler için süreç anahtarıyla etiketlenmiş önbellek; şifrenin kendisi saklanmaz
+        self._cache_secret = secrets.token_bytes(32)
+        self._verified: Dict[str, Tuple[bytes, float]] = {}
+    
+    def hash(self, password: str, salt: Optional[str] = None, params: Optional[Dict[str, Any]] = None) -> Tuple[str, str, Dict[str, Any]]:
+        """Şifreyi hash'ler; (hash, tuz, parametreler) döndürür."""
+        params = dict(params or self.params)
+        if salt is None:
+            salt = secrets.token_hex(16)
+        return self._derive(password, salt, params).hex(), salt, params
+    
+    def verify(self, password: str, password_hash: str, salt: str, params: Optional[Dict[str, Any]] = None) -> bool:
+        """Şifreyi kayıtlı hash ile karşılaştırır."""
+        tag = hmac.new(self._cache_secret, (salt + "\0" + password).encode("utf-8"), hashlib.sha256).digest()
+        cached = self._verified.get(password_hash)
+        if cached is not None and cached[1] > time.monotonic() and hmac.compare_digest(cached[0], tag):
+            return True
+        
+        derived = self._derive(password, salt, params or LEGACY_PARAMS).hex()
+        if not hmac.compare_digest(derived, password_hash):
+            return False
+        
+        self._verified[password_hash] = (tag, time.monotonic() + self.CACHE_TTL)
+        return True
+    
+    def forget(self, password_hash: str):
+        """Hash için önbelleğe alınmış doğrulamayı siler."""
+        self._verified.pop(password_hash, None)
+    
+    def needs_upgrade(self, params: Optional[Dict[str, Any]]) -> bool:
+        """Kayıtlı parametrelerin güncel politikadan zayıf veya farklı olup olmadığını döndürür."""
+        params = params or LEGACY_PARAMS
+        if params.get("algorithm") != self.params["algorithm"]:
+            return True
+        return any(params.get(name, 0) < value for name, value in self.params.items() if name != "algorithm")
+    
+    @classmethod
+    def calibrate(cls, target_seconds: float = 0.25, algorithm: Optional[str] = None) -> Dict[str, Any]:
+        """Hash süresi hedef gecikmeye yaklaşacak şekilde maliyet parametrelerini ölçer."""
+        algorithm = algorithm or available_algorithms()[0]
+        
+        if algorithm == PBKDF2:
+            sample = 20000
+            elapsed = cls._time(lambda: hashlib.pbkdf2_hmac("sha256", b"benchmark", b"salt", sample))
+            iterations = int(sample * target_seconds / max(elapsed, 1e-6))
+            return {"algorithm": PBKDF2, "iterations": max(iterations, cls.MIN_PBKDF2_ITERATIONS)}
+        
+        if algorithm == SCRYPT:
+            # Bellek maliyeti n ile doğrusal artar; hedefe ulaşana kadar ikiye katlanır
+            params = {"algorithm": SCRYPT, "n": 2 ** 14, "r": 8, "p": 1}
+            while 128 * params["r"] * params["n"] * 2 <= cls.SCRYPT_MAX_MEMORY // 2:
+                elapsed = cls._time(lambda: cls._derive("benchmark", "salt", params))
+                if elapsed >= target_seconds / 2:
+                    break
+                params["n"] *= 2
+            return params
+        
+        if algorithm == ARGON2:
+            params = {"algorithm": ARGON2, "time_cost": 2, "memory_cost": 64 * 1024, "parallelism": 2}
+            elapsed = cls._time(lambda: cls._derive("benchmark", "salt", params))
+            params["time_cost"] = max(2, int(params["time_cost"] * target_seconds / max(elapsed, 1e-6)))
+            return params
+        
+        raise ValueError(f"Desteklenmeyen algoritma: {algorithm}")
+    
+    @classmethod
+    def _derive(cls, password: str, salt: str, params: Dict[str, Any]) -> bytes:
+        """Parametrelerde belirtilen algoritmayla anahtar türetir."""
+        algorithm = params.get("algorithm", PBKDF2)
+        secret = password.encode("utf-8")
+        salt_bytes = salt.encode("utf-8")
+        
+        if algorithm == PBKDF2:
+            return hashlib.pbkdf2_hmac("sha256", secret, salt_bytes, params["iterations"])
+        if algorithm == SCRYPT:
+            return hashlib.scrypt(
+                secret, salt=salt_bytes, n=params["n"], r=params["r"], p=params["p"],
+                maxmem=cls.SCRYPT_MAX_MEMORY, dklen=32
+            )
+        if algorithm == ARGON2:
+            if hash_secret_raw is None:
+                raise ValueError("argon2 hash'i için argon2-cffi paketi gerekli")
+            return hash_secret_raw(
+                secret, salt_bytes, time_cost=params["time_cost"], memory_cost=params["memory_cost"],
+                parallelism=params["parallelism"], hash_len=32, type=Type.ID
+            )
+        raise ValueError(f"Desteklenmeyen algoritma: {algorithm}")
+    
+    @staticmethod
+    def _time(func) -> float:
+        """Fonksiyonun çalışma süresini saniye olarak döndürür."""
+        start = time.perf_counter()
+        func()
+        return time.perf_counter() - start
@@ -0,0 +1,149 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+
+class ReportCache:
+    """Üretilmiş rapor dosyalarını parametre anahtarıyla saklayan, boyuta göre LRU tahliyeli disk önbelleği."""
+    
+    DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+    
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self._total = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._scan()
+    
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Parametrelerden kararlı bir önbellek anahtarı üretir."""
+        payload = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    @property
+    def total_bytes(self) -> int:
+        return self._total
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: str) -> Optional[str]:
+        """Anahtarın dosya yolunu döndürür ve kaydı en son kullanılan yapar; yoksa None döndürür."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            path = entry[0]
+            if not os.path.exists(path):
+                # Dosya dışarıdan silinmişse kayıt da düşülür
+                self._forget(key)
+                return None
+            self._entries.move_to_end(key)
+        try:
+            # Son kullanım zamanı yeniden başlatmalarda da korunur
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+    
+    def put(self, key: str, write: Callable[[str], None], name: str, extension: str) -> str:
+        """write(geçici_yol) ile dosyayı üretir, önbelleğe taşır ve kalıcı yolunu döndürür."""
+        fd, temp_path = tempfile.mkstemp(prefix=".tmp-", suffix=f".{extension}", dir=self.cache_dir)
+        os.close(fd)
+        try:
+            write(temp_path)
+            path = os.path.join(self.cache_dir, f"{name}_{key[:16]}.{extension}")
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        
+        size = os.path.getsize(path)
+        with self._lock:
+            self._forget(key, remove_file=False)
+            self._entries[key] = (path, size)
+            self._total += size
+            self._evict()
+            self._write_index()
+        return path
+    
+    def clear(self):
+        """Önbellekteki tüm dosyaları siler."""
+        with self._lock:
+            for key in list(self._entries):
+                self._forget(key)
+            self._write_index()
+    
+    def _evict(self):
+        """Toplam boyut sınırı aşıldıkça en uzun süredir kullanılmayan dosyaları siler."""
+        # En son eklenen kayıt, tek başına sınırı aşsa bile tutulur
+        while self._total > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            self._forget(key)
+    
+    def _forget(self, key: str, remove_file: bool = True):
+        """Kaydı önbellekten çıkarır, istenirse dosyasını siler."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        path, size = entry
+        self._total -= size
+        if remove_file:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    def _index_path(self) -> str:
+        return os.path.join(self.cache_dir, "index.json")
+    
+    def _write_index(self):
+        """Anahtar -> dosya eşlemesini LRU sırasıyla diske yazar; kilit tutulurken çağrılır."""
+        index = {key: os.path.basename(path) for key, (path, _) in self._entries.items()}
+        temp_path = self._index_path() + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(temp_path, self._index_path())
+        except OSError as e:
+            print(f"Rapor önbellek indeksi yazılamadı: {str(e)}")
+    
+    def _scan(self):
+        """Diskteki önbelleği son kullanım sırasına göre yükler, sahipsiz dosyaları siler."""
+        try:
+            with open(self._index_path(), "r", encoding="utf-8") as f:
+                index: Dict[str, str] = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        
+        entries = []
+        known = set()
+        for key, filename in index.items():
+            path = os.path.join(self.cache_dir, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, key, path, stat.st_size))
+            known.add(filename)
+        
+        for filename in os.listdir(self.cache_dir):
+            if filename == "index.json" or filename in known:
+                continue
+            try:
+                os.remove(os.path.join(self.cache_dir, filename))
+            except OSError:
+                pass
+        
+        for _, key, path, size in sorted(entries):
+            self._entries[key] = (path, size)
+            self._total += size
+        self._evict()
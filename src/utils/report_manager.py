@@ -1,28 +1,251 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 import csv
-from typing import List, Dict, Any
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, islice
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 import os
+import shutil
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
 from reportlab.lib.styles import getSampleStyleSheet
-import pandas as pd
+from openpyxl import Workbook
+from .analytics import ReportAnalytics
+from .report_cache import ReportCache
+
+# Rapor tablosunun stili; her PDF parçası aynı stille çizilir
+PDF_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 14),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 12),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+
+class _FlowableStream(list):
+    """reportlab'e liste gibi görünen, elemanları üreteçten ihtiyaç oldukça çeken akış.
+    
+    SimpleDocTemplate.build yalnızca listenin başına bakar ve baştan eleman siler; bu sayede
+    tüm tablo parçaları aynı anda bellekte tutulmaz.
+    """
+    
+    def __init__(self, flowables: Iterable[Any], lookahead: int = 2):
+        super().__init__()
+        self._source = iter(flowables)
+        self._lookahead = lookahead
+    
+    def _fill(self):
+        while list.__len__(self) < self._lookahead:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                break
+    
+    def __len__(self) -> int:
+        self._fill()
+        return list.__len__(self)
+    
+    def __getitem__(self, index):
+        self._fill()
+        return list.__getitem__(self, index)
+
+
+class _RowTee:
+    """Tek bir satır akışını, her yazıcıya ayrı ve sınırlı bir kuyruk üzerinden dağıtır.
+    
+    Satırlar partiler halinde iletilir; en yavaş yazıcı üreticiyi yavaşlatır, böylece
+    bellekte yazıcı başına en fazla birkaç parti tutulur.
+    """
+    
+    _END = object()
+    
+    class _Failed:
+        """Üretici hata verdiğinde akışın sonuna konan işaret; yazıcılar yarım dosyayı tamamlamaz."""
+        
+        __slots__ = ("error",)
+        
+        def __init__(self, error: BaseException):
+            self.error = error
+    
+    def __init__(self, consumers: int, batch_size: int = 500, max_batches: int = 4):
+        self.batch_size = batch_size
+        self._queues = [queue.Queue(maxsize=max_batches) for _ in range(consumers)]
+        self._closed = [threading.Event() for _ in range(consumers)]
+    
+    def feed(self, rows: Iterable[Dict[str, Any]]):
+        """Satırları okuyup tüm açık kuyruklara dağıtır."""
+        rows = iter(rows)
+        end = self._END
+        try:
+            while True:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    break
+                for index in range(len(self._queues)):
+                    self._put(index, batch)
+        except BaseException as e:
+            end = self._Failed(e)
+            raise
+        finally:
+            for index in range(len(self._queues)):
+                self._put(index, end)
+    
+    def consumer(self, index: int) -> Iterator[Dict[str, Any]]:
+        """Belirtilen yazıcının satır akışını döndürür."""
+        try:
+            while True:
+                batch = self._queues[index].get()
+                if batch is self._END:
+                    return
+                if isinstance(batch, self._Failed):
+                    # Yazıcı da hata verir; önbellek yarım dosyayı kaydetmeden siler
+                    raise RuntimeError("Rapor satırları üretilirken hata oluştu") from batch.error
+                yield from batch
+        finally:
+            self.close(index)
+    
+    def close(self, index: int):
+        """Yazıcıyı kapatır; hata verip erken çıkan yazıcı üreticiyi bekletmez."""
+        self._closed[index].set()
+    
+    def _put(self, index: int, item: Any):
+        """Kuyruğa ekler; kuyruğun yazıcısı kapandıysa atlar."""
+        while not self._closed[index].is_set():
+            try:
+                self._queues[index].put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
 
 class ReportManager:
-    def __init__(self, data_manager):
+    PDF_CHUNK_ROWS = 200
+    # Biçim adı ile dosya uzantısı farklı olanlar
+    FILE_EXTENSIONS = {"excel": "xlsx"}
+    REPORT_TYPES = ("user_activity", "license_usage", "template_statistics", "summary")
+    # Rapor türlerinin bağlı olduğu veri koleksiyonları; önbellek anahtarı bunların dosya damgalarını içerir
+    REPORT_COLLECTIONS = {
+        "user_activity": ("users",),
+        "license_usage": ("licenses",),
+        "template_statistics": ("templates",),
+        "summary": ("users", "licenses")
+    }
+
+    def __init__(self, data_manager, report_dir: Optional[str] = None, cache_dir: Optional[str] = None):
         self.data_manager = data_manager
-        self.report_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "reports")
+        self.analytics = ReportAnalytics(data_manager)
+        self.report_dir = report_dir or os.path.join(os.path.dirname(os.path.dirname(__file__)), "reports")
         if not os.path.exists(self.report_dir):
             os.makedirs(self.report_dir)
+        # Önbellek boyut sınırına göre dosya sildiğinden kullanıcıya her zaman report_dir'deki kopya verilir
+        self.cache = ReportCache(cache_dir or os.path.join(self.report_dir, "cache"))
+        # Son export çağrısında her yazıcının süresi (saniye) ve yazdığı satır sayısı
+        self.last_export_timings: Dict[str, Dict[str, Any]] = {}
 
     def generate_user_activity_report(self, start_date: str = None, end_date: str = None, output_format: str = "pdf") -> str:
         """Kullanıcı aktivite raporu oluşturur"""
-        users = self.data_manager.get_users()
-        report_data = []
+        return self._save_report("user_activity", start_date, end_date, output_format)
+
+    def generate_license_usage_report(self, start_date: str = None, end_date: str = None, output_format: str = "pdf") -> str:
+        """Lisans kullanım raporu oluşturur"""
+        return self._save_report("license_usage", start_date, end_date, output_format)
+
+    def generate_template_statistics(self, start_date: str = None, end_date: str = None, output_format: str = "pdf") -> str:
+        """Şablon kullanım istatistikleri oluşturur"""
+        return self._save_report("template_statistics", start_date, end_date, output_format)
+
+    def generate_summary_report(self, start_date: str = None, end_date: str = None, output_format: str = "pdf") -> str:
+        """Departman, rol, lisans türü ve bitiş ayına göre özet rapor oluşturur"""
+        return self._save_report("summary", start_date, end_date, output_format)
+
+    def get_data_version(self, report_type: str) -> Tuple[Any, ...]:
+        """Raporun bağlı olduğu koleksiyonların açılışlar arasında korunan dosya damgalarını döndürür"""
+        collections = self.REPORT_COLLECTIONS.get(report_type)
+        if collections is None:
+            raise ValueError(f"Bilinmeyen rapor türü: {report_type}")
+        return tuple(self.data_manager.get_data_stamp(collection) for collection in collections)
+
+    def export(self, report_type: str, formats: List[str], start_date: str = None, end_date: str = None) -> Dict[str, str]:
+        """Raporu tek veri geçişiyle birden çok formatta, yazıcıları paralel çalıştırarak üretir"""
+        formats = list(dict.fromkeys(formats))
+        paths: Dict[str, str] = {}
+        timings: Dict[str, Dict[str, Any]] = {}
+        
+        # Önbellekte bulunan formatlar yeniden üretilmez
+        pending = []
+        for output_format in formats:
+            cached = self.cache.get(self._cache_key(report_type, start_date, end_date, output_format))
+            if cached is None:
+                pending.append(output_format)
+            else:
+                paths[output_format] = self._publish(report_type, cached)
+                timings[output_format] = {"seconds": 0.0, "rows": 0, "cached": True}
+        
+        if not pending:
+            self.last_export_timings = timings
+            return paths
+        
+        rows = self._report_rows(report_type, start_date, end_date)
+        tee = _RowTee(len(pending))
+        
+        def run_writer(index: int, output_format: str) -> str:
+            counted = {"rows": 0}
+            
+            def counting_rows():
+                for row in tee.consumer(index):
+                    counted["rows"] += 1
+                    yield row
+            
+            start = time.perf_counter()
+            try:
+                filepath = self._save_report(report_type, start_date, end_date, output_format, counting_rows())
+            finally:
+                tee.close(index)
+            timings[output_format] = {"seconds": time.perf_counter() - start, "rows": counted["rows"], "cached": False}
+            return filepath
+        
+        with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix="report") as executor:
+            futures = {
+                output_format: executor.submit(run_writer, index, output_format)
+                for index, output_format in enumerate(pending)
+            }
+            start = time.perf_counter()
+            tee.feed(rows)
+            timings["_collect"] = {"seconds": time.perf_counter() - start, "rows": 0, "cached": False}
+            for output_format, future in futures.items():
+                paths[output_format] = future.result()
         
-        for user in users:
-            user_data = {
+        self.last_export_timings = timings
+        return {output_format: paths[output_format] for output_format in formats}
+
+    def _report_rows(self, report_type: str, start_date: str = None, end_date: str = None) -> Iterator[Dict[str, Any]]:
+        """Rapor türüne göre satır üretecini döndürür"""
+        if report_type == "user_activity":
+            return self._user_activity_rows(start_date, end_date)
+        if report_type == "license_usage":
+            return self._license_usage_rows(start_date, end_date)
+        if report_type == "template_statistics":
+            return self._template_statistics_rows(start_date, end_date)
+        if report_type == "summary":
+            return self._summary_rows(start_date, end_date)
+        raise ValueError(f"Bilinmeyen rapor türü: {report_type}")
+
+    def _user_activity_rows(self, start_date: str = None, end_date: str = None) -> Iterator[Dict[str, Any]]:
+        """Kullanıcı aktivite raporunun satırlarını tek tek üretir"""
+        for user in self.data_manager.query_users():
+            yield {
                 "Kullanıcı ID": user["id"],
                 "Ad Soyad": user["full_name"],
                 "E-posta": user["email"],
@@ -32,17 +255,11 @@ class ReportManager:
                 "Son Giriş": user.get("last_login", "Bilinmiyor"),
                 "Oluşturulma Tarihi": user["created_at"]
             }
-            report_data.append(user_data)
-        
-        return self._save_report("user_activity", report_data, output_format)
 
-    def generate_license_usage_report(self, start_date: str = None, end_date: str = None, output_format: str = "pdf") -> str:
-        """Lisans kullanım raporu oluşturur"""
-        licenses = self.data_manager.get_licenses()
-        report_data = []
-        
-        for license in licenses:
-            license_data = {
+    def _license_usage_rows(self, start_date: str = None, end_date: str = None) -> Iterator[Dict[str, Any]]:
+        """Lisans kullanım raporunun satırlarını tek tek üretir"""
+        for license in self.data_manager.query_licenses():
+            yield {
                 "Lisans ID": license["id"],
                 "Lisans Anahtarı": license["key"],
                 "Tip": license["type"],
@@ -52,17 +269,11 @@ class ReportManager:
                 "Kullanıcı ID": license["user_id"],
                 "Oluşturulma Tarihi": license["created_at"]
             }
-            report_data.append(license_data)
-        
-        return self._save_report("license_usage", report_data, output_format)
 
-    def generate_template_statistics(self, start_date: str = None, end_date: str = None, output_format: str = "pdf") -> str:
-        """Şablon kullanım istatistikleri oluşturur"""
-        templates = self.data_manager.get_templates()
-        report_data = []
-        
-        for template in templates:
-            template_data = {
+    def _template_statistics_rows(self, start_date: str = None, end_date: str = None) -> Iterator[Dict[str, Any]]:
+        """Şablon istatistikleri raporunun satırlarını tek tek üretir"""
+        for template in self.data_manager.get_templates():
+            yield {
                 "Şablon ID": template["id"],
                 "Ad": template["name"],
                 "Departman": template["department"],
@@ -71,78 +282,143 @@ class ReportManager:
                 "Son Kullanım": template.get("last_used", "Bilinmiyor"),
                 "Oluşturulma Tarihi": template["created_at"]
             }
-            report_data.append(template_data)
-        
-        return self._save_report("template_statistics", report_data, output_format)
 
-    def _save_report(self, report_type: str, data: List[Dict[str, Any]], output_format: str) -> str:
-        """Raporu belirtilen formatta kaydeder"""
+    def _summary_rows(self, start_date: str = None, end_date: str = None) -> Iterator[Dict[str, Any]]:
+        """Özet raporun satırlarını vektörel toplamlardan üretir"""
+        start = datetime.fromisoformat(start_date) if start_date else None
+        end = datetime.fromisoformat(end_date) if end_date else None
+        if end is not None and len(end_date) == 10:
+            # Yalnızca gün verilmişse bitiş günü de aralığa dahil edilir
+            end += timedelta(days=1, microseconds=-1)
+        sections = (
+            ("Departman", self.analytics.users_by_department(start, end)),
+            ("Rol", self.analytics.users_by_role(start, end)),
+            ("Lisans Türü", self.analytics.licenses_by_type()),
+            ("Lisans Bitiş Ayı", self.analytics.licenses_by_expiry_month())
+        )
+        for category, counts in sections:
+            for value, count in counts.items():
+                yield {"Kategori": category, "Değer": value, "Sayı": count}
+
+    def _save_report(
+        self,
+        report_type: str,
+        start_date: str,
+        end_date: str,
+        output_format: str,
+        rows: Optional[Iterable[Dict[str, Any]]] = None
+    ) -> str:
+        """Raporu önbellekten alır ya da akış halinde üretir; rapor klasöründeki kopyanın yolunu döndürür"""
+        key = self._cache_key(report_type, start_date, end_date, output_format)
+        cached = self.cache.get(key)
+        if cached is None:
+            if rows is None:
+                rows = self._report_rows(report_type, start_date, end_date)
+            extension = self.FILE_EXTENSIONS.get(output_format, output_format)
+            cached = self.cache.put(
+                key,
+                lambda filepath: self._write_report(filepath, rows, output_format),
+                report_type,
+                extension
+            )
+        return self._publish(report_type, cached)
+
+    def _publish(self, report_type: str, cached_path: str) -> str:
+        """Önbellekteki raporu zaman damgalı adla rapor klasörüne kopyalar ve kopyanın yolunu döndürür"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{report_type}_{timestamp}.{output_format}"
-        filepath = os.path.join(self.report_dir, filename)
+        extension = os.path.splitext(cached_path)[1]
+        filepath = os.path.join(self.report_dir, f"{report_type}_{timestamp}{extension}")
+        shutil.copyfile(cached_path, filepath)
+        return filepath
         
+    def _cache_key(self, report_type: str, start_date: str, end_date: str, output_format: str) -> str:
+        """Rapor parametreleri ve veri damgalarından önbellek anahtarı üretir"""
+        return ReportCache.make_key(
+            report_type,
+            start_date,
+            end_date,
+            output_format,
+            self.get_data_version(report_type)
+        )
+
+    def _write_report(self, filepath: str, rows: Iterable[Dict[str, Any]], output_format: str):
+        """Satırları belirtilen formatta dosyaya yazar"""
         if output_format == "pdf":
-            self._save_as_pdf(filepath, data)
+            self._save_as_pdf(filepath, rows)
         elif output_format == "excel":
-            self._save_as_excel(filepath, data)
+            self._save_as_excel(filepath, rows)
         elif output_format == "csv":
-            self._save_as_csv(filepath, data)
+            self._save_as_csv(filepath, rows)
         elif output_format == "json":
-            self._save_as_json(filepath, data)
-        
-        return filepath
+            self._save_as_json(filepath, rows)
+        else:
+            raise ValueError(f"Desteklenmeyen rapor formatı: {output_format}")
+
+    @staticmethod
+    def _peek_headers(rows: Iterable[Dict[str, Any]]) -> Tuple[Optional[List[str]], Iterator[Dict[str, Any]]]:
+        """İlk satırdan sütun başlıklarını alır; satır akışını tüketmeden geri verir"""
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return None, iter(())
+        return list(first.keys()), chain([first], rows)
 
-    def _save_as_pdf(self, filepath: str, data: List[Dict[str, Any]]):
-        """Raporu PDF formatında kaydeder"""
+    def _save_as_pdf(self, filepath: str, rows: Iterable[Dict[str, Any]]):
+        """Raporu PDF formatında, sayfalara bölünebilen tablo parçalarıyla kaydeder"""
         doc = SimpleDocTemplate(filepath, pagesize=letter)
-        elements = []
         
         # Başlık
         styles = getSampleStyleSheet()
         title = Paragraph("Rapor", styles["Title"])
-        elements.append(title)
         
-        # Tablo verilerini hazırla
-        if data:
-            headers = list(data[0].keys())
-            table_data = [headers]
-            for row in data:
-                table_data.append([str(row[header]) for header in headers])
-            
-            # Tablo oluştur
-            table = Table(table_data)
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 14),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 12),
-                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            elements.append(table)
+        headers, rows = self._peek_headers(rows)
+        
+        def flowables():
+            yield title
+            if headers is None:
+                return
+            # Tek dev tablo yerine başlığı tekrarlanan parçalar; her parça sayfalara bölünebilir
+            while True:
+                chunk = list(islice(rows, self.PDF_CHUNK_ROWS))
+                if not chunk:
+                    return
+                table_data = [headers] + [[str(row[header]) for header in headers] for row in chunk]
+                table = Table(table_data, repeatRows=1)
+                table.setStyle(PDF_TABLE_STYLE)
+                yield table
+        
+        doc.build(_FlowableStream(flowables()))
+
+    def _save_as_excel(self, filepath: str, rows: Iterable[Dict[str, Any]]):
+        """Raporu Excel formatında, write_only modunda satır satır kaydeder"""
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Rapor")
+        
+        headers, rows = self._peek_headers(rows)
+        if headers is not None:
+            sheet.append(headers)
+            for row in rows:
+                sheet.append([row[header] for header in headers])
         
-        doc.build(elements)
-
-    def _save_as_excel(self, filepath: str, data: List[Dict[str, Any]]):
-        """Raporu Excel formatında kaydeder"""
-        df = pd.DataFrame(data)
-        df.to_excel(filepath, index=False)
-
-    def _save_as_csv(self, filepath: str, data: List[Dict[str, Any]]):
-        """Raporu CSV formatında kaydeder"""
-        if data:
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=data[0].keys())
+        workbook.save(filepath)
+
+    def _save_as_csv(self, filepath: str, rows: Iterable[Dict[str, Any]]):
+        """Raporu CSV formatında satır satır kaydeder"""
+        headers, rows = self._peek_headers(rows)
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            if headers is not None:
+                writer = csv.DictWriter(f, fieldnames=headers)
                 writer.writeheader()
-                writer.writerows(data)
+                for row in rows:
+                    writer.writerow(row)
 
-    def _save_as_json(self, filepath: str, data: List[Dict[str, Any]]):
-        """Raporu JSON formatında kaydeder"""
+    def _save_as_json(self, filepath: str, rows: Iterable[Dict[str, Any]]):
+        """Raporu JSON formatında, diziyi eleman eleman yazarak kaydeder"""
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4) 
\ No newline at end of file
+            f.write("[")
+            separator = "\n"
+            for row in rows:
+                f.write(separator)
+                f.write("    " + json.dumps(row, ensure_ascii=False, indent=4).replace("\n", "\n    "))
+                separator = ",\n"
+            f.write("\n]" if separator == ",\n" else "]")
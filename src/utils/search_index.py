@@ -0,0 +1,205 @@
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set
+
+
+def turkish_fold(text: Any) -> str:
+    """Metni Türkçe kurallarına göre küçük harfe çevirir ve aramaya uygun hale getirir."""
+    if not text:
+        return ""
+    text = str(text).replace("İ", "i").replace("I", "ı").lower()
+    # Klavye farklılıklarını tolere etmek için noktasız ı, i ile eşlenir
+    return text.replace("ı", "i")
+
+
+class SearchIndex:
+    """Alt dize aramaları için artımlı n-gram indeksi."""
+
+    NGRAM_SIZE = 3
+    FIELD_SEPARATOR = "\n"
+
+    def __init__(self, fields: Iterable[str]):
+        self.fields = tuple(fields)
+        self._documents: Dict[Hashable, str] = {}
+        self._grams: Dict[str, Set[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def clear(self):
+        """İndeksi temizler."""
+        self._documents.clear()
+        self._grams.clear()
+
+    def rebuild(self, items: Iterable[Dict[str, Any]], id_field: str = "id"):
+        """İndeksi verilen kayıtlardan yeniden oluşturur."""
+        self.clear()
+        for item in items:
+            self.add(item[id_field], item)
+
+    def add(self, item_id: Hashable, item: Dict[str, Any]):
+        """Kaydı indekse ekler."""
+        if item_id in self._documents:
+            self.remove(item_id)
+
+        document = self.FIELD_SEPARATOR.join(turkish_fold(item.get(field)) for field in self.fields)
+        self._documents[item_id] = document
+
+        for gram in self._iter_grams(document):
+            self._grams.setdefault(gram, set()).add(item_id)
+
+    def update(self, item_id: Hashable, item: Dict[str, Any]):
+        """Kaydın indeks girdilerini günceller."""
+        self.add(item_id, item)
+
+    def remove(self, item_id: Hashable):
+        """Kaydı indeksten çıkarır."""
+        document = self._documents.pop(item_id, None)
+        if document is None:
+            return
+
+        for gram in self._iter_grams(document):
+            self._discard(self._grams, gram, item_id)
+
+    def search(self, text: str) -> Set[Hashable]:
+        """Arama metnini içeren kayıtların ID'lerini döndürür."""
+        query = turkish_fold(text).strip()
+        if not query:
+            return set(self._documents)
+
+        # N-gram'dan kısa sorgular indekslenemez; belgeler üzerinde alt dize taraması yapılır
+        if len(query) < self.NGRAM_SIZE:
+            return {item_id for item_id, document in self._documents.items() if query in document}
+
+        postings: List[Set[Hashable]] = []
+        for gram in set(self._iter_grams(query)):
+            posting = self._grams.get(gram)
+            if not posting:
+                return set()
+            postings.append(posting)
+
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates &= posting
+            if not candidates:
+                return candidates
+
+        # N-gram kesişimi aday üretir; gerçek alt dize kontrolü ile doğrulanır
+        if len(query) == self.NGRAM_SIZE:
+            return candidates
+        return {item_id for item_id in candidates if query in self._documents[item_id]}
+
+    def _iter_grams(self, document: str) -> Set[str]:
+        """Metindeki tekil n-gram'ları döndürür."""
+        size = self.NGRAM_SIZE
+        return {document[i:i + size] for i in range(len(document) - size + 1)}
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[Hashable]], key: str, item_id: Hashable):
+        """Posting listesinden ID'yi çıkarır, boş kalırsa anahtarı siler."""
+        posting = index.get(key)
+        if posting is None:
+            return
+        posting.discard(item_id)
+        if not posting:
+            del index[key]
+
+
+class FieldIndex:
+    """Eşitlik sorguları için ikincil alan indeksi."""
+
+    def __init__(self, fields: Iterable[str], id_field: str = "id"):
+        self.fields = tuple(fields)
+        self.id_field = id_field
+        self._buckets: Dict[str, Dict[Any, Dict[Hashable, Dict[str, Any]]]] = {
+            field: {} for field in self.fields
+        }
+        self._values: Dict[Hashable, tuple] = {}
+        self._items: Dict[Hashable, Dict[str, Any]] = {}
+        # Kayıtların ilk eklenme sırası; koleksiyon listesindeki sırayla aynıdır
+        self._positions: Dict[Hashable, int] = {}
+        self._next_position = 0
+
+    def __contains__(self, field: str) -> bool:
+        return field in self._buckets
+
+    def clear(self):
+        """İndeksi temizler."""
+        for buckets in self._buckets.values():
+            buckets.clear()
+        self._values.clear()
+        self._items.clear()
+        self._positions.clear()
+        self._next_position = 0
+
+    def rebuild(self, items: Iterable[Dict[str, Any]]):
+        """İndeksi verilen kayıtlardan yeniden oluşturur."""
+        self.clear()
+        for item in items:
+            self.add(item)
+
+    def add(self, item: Dict[str, Any]):
+        """Kaydı indekse ekler; kayıt zaten varsa yalnızca değişen alanları taşır."""
+        item_id = item[self.id_field]
+        old_values = self._values.get(item_id)
+        new_values = tuple(item.get(field) for field in self.fields)
+
+        for position, field in enumerate(self.fields):
+            buckets = self._buckets[field]
+            value = new_values[position]
+            if old_values is not None and old_values[position] == value:
+                buckets[value][item_id] = item
+                continue
+            if old_values is not None:
+                self._discard(buckets, old_values[position], item_id)
+            buckets.setdefault(value, {})[item_id] = item
+
+        self._values[item_id] = new_values
+        self._items[item_id] = item
+        if item_id not in self._positions:
+            self._positions[item_id] = self._next_position
+            self._next_position += 1
+
+    def update(self, item: Dict[str, Any]):
+        """Kaydın indeks girdilerini günceller."""
+        self.add(item)
+
+    def remove(self, item_id: Hashable):
+        """Kaydı indeksten çıkarır."""
+        old_values = self._values.pop(item_id, None)
+        if old_values is None:
+            return
+        self._items.pop(item_id, None)
+        self._positions.pop(item_id, None)
+        for position, field in enumerate(self.fields):
+            self._discard(self._buckets[field], old_values[position], item_id)
+
+    def get(self, item_id: Hashable) -> Optional[Dict[str, Any]]:
+        """ID'ye göre kaydı döndürür."""
+        return self._items.get(item_id)
+
+    def lookup(self, field: str, value: Any) -> Dict[Hashable, Dict[str, Any]]:
+        """Alan değeri eşleşen kayıtları ID -> kayıt sözlüğü olarak döndürür."""
+        try:
+            return self._buckets[field].get(value, {})
+        except TypeError:
+            # Hashlenemeyen değerler indekslenmez
+            return {}
+
+    def ordered(self, bucket: Dict[Hashable, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Kovadaki kayıtları koleksiyondaki sıralarıyla döndürür."""
+        positions = self._positions
+        return [bucket[item_id] for item_id in sorted(bucket, key=positions.__getitem__)]
+
+    def values(self, field: str) -> List[Any]:
+        """Alanda bulunan farklı değerleri döndürür."""
+        return list(self._buckets[field])
+
+    @staticmethod
+    def _discard(buckets: Dict[Any, Dict[Hashable, Dict[str, Any]]], value: Any, item_id: Hashable):
+        """Kaydı değer kovasından çıkarır, boş kalırsa kovayı siler."""
+        bucket = buckets.get(value)
+        if bucket is None:
+            return
+        bucket.pop(item_id, None)
+        if not bucket:
+            del buckets[value]
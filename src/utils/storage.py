@@ -0,0 +1,26 @@
+import json
+import os
+import tempfile
+from typing import Any, Optional
+
+
+def atomic_write_json(path: str, data: Any, indent: Optional[int] = None):
+    """JSON verisini geçici dosyaya yazıp tek adımda hedefin yerine koyar.
+    
+    Yazma yarıda kesilirse hedef dosya eski haliyle kalır; yarım yazılmış JSON oluşmaz.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    separators = None if indent is not None else (",", ":")
+    
+    fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent, separators=separators)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,171 @@
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from itertools import islice
+import csv
+import json
+from .validator import Validator
+
+# Dışa aktarılan CSV başlıkları -> kullanıcı alanları
+CSV_COLUMNS = {
+    "ID": "id",
+    "Ad Soyad": "full_name",
+    "E-posta": "email",
+    "Departman": "department",
+    "Rol": "role",
+    "Durum": "is_active"
+}
+ACTIVE_LABEL = "Aktif"
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def iter_csv_users(f: TextIO) -> Iterator[Dict[str, Any]]:
+    """CSV satırlarını kullanıcı sözlüklerine çevirerek tek tek üretir."""
+    for row in csv.DictReader(f):
+        user = {}
+        for column, value in row.items():
+            if column is None:
+                continue
+            field = CSV_COLUMNS.get(column, column)
+            if field == "is_active":
+                value = value in (ACTIVE_LABEL, "True", "true", "1")
+            user[field] = value
+        yield user
+
+
+def iter_json_records(f: TextIO, chunk_size: int = READ_CHUNK_SIZE) -> Iterator[Any]:
+    """JSON dizisindeki veya JSON Lines dosyasındaki kayıtları dosyayı bütünüyle okumadan üretir."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    in_array = None
+
+    while True:
+        # Ayraçları ve boşlukları atla
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position < len(buffer) or eof:
+                break
+            buffer, position = f.read(chunk_size), 0
+            eof = not buffer
+
+        if position >= len(buffer):
+            if in_array:
+                raise ValueError("JSON dizisi kapanmadan dosya bitti")
+            return
+
+        char = buffer[position]
+        if in_array is None:
+            in_array = char == "["
+            if in_array:
+                position += 1
+                continue
+        elif in_array and char == "]":
+            return
+
+        try:
+            record, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # Kayıt tamponun sonunda bölünmüş olabilir; daha fazla oku
+            if eof:
+                raise
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+
+        if end == len(buffer) and not eof:
+            # Sayı gibi değerler tampon sonunda eksik ayrıştırılmış olabilir
+            chunk = f.read(chunk_size)
+            if chunk:
+                buffer, position = buffer[position:] + chunk, 0
+                continue
+            eof = True
+
+        position = end
+        yield record
+
+
+class UserImporter:
+    """Kullanıcıları akış halinde okuyup partiler halinde doğrulayan ve tek yazımla ekleyen içe aktarıcı."""
+
+    BATCH_SIZE = 1000
+
+    def __init__(
+        self,
+        data_manager,
+        batch_size: int = BATCH_SIZE,
+        progress: Optional[Callable[[int], None]] = None
+    ):
+        self.data_manager = data_manager
+        self.batch_size = batch_size
+        self.progress = progress
+
+    def import_file(self, file_path: str, dry_run: bool = False) -> Dict[str, Any]:
+        """CSV veya JSON (dizi ya da JSON Lines) dosyasından kullanıcıları içe aktarır."""
+        if file_path.lower().endswith(".csv"):
+            with open(file_path, "r", encoding="utf-8", newline="") as f:
+                return self.run(iter_csv_users(f), dry_run)
+        with open(file_path, "r", encoding="utf-8") as f:
+            return self.run(iter_json_records(f), dry_run)
+
+    def run(self, rows: Iterable[Dict[str, Any]], dry_run: bool = False) -> Dict[str, Any]:
+        """Satırları doğrular, e-postaya göre tekilleştirir ve geçerli olanları tek seferde ekler.
+
+        dry_run=True ise hiçbir şey yazılmaz; sonuç gerçek içe aktarmada ne olacağını gösterir.
+        """
+        emails = {
+            str(user.get("email", "")).strip().lower()
+            for user in self.data_manager.query_users()
+        }
+        next_id = self.data_manager.next_user_id()
+        new_users: List[Dict[str, Any]] = []
+        errors: List[Tuple[int, str]] = []
+        duplicates = 0
+        processed = 0
+
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+
+            for offset, (row, row_errors) in enumerate(self._validate_batch(batch)):
+                index = processed + offset
+                if row_errors:
+                    errors.extend((index, error) for error in row_errors)
+                    continue
+
+                email = row["email"].strip().lower()
+                if email in emails:
+                    duplicates += 1
+                    continue
+                emails.add(email)
+
+                new_users.append(self.data_manager.build_user(row, next_id))
+                next_id += 1
+
+            processed += len(batch)
+            if self.progress is not None:
+                self.progress(processed)
+
+        if new_users and not dry_run:
+            self.data_manager.bulk_add_users(new_users)
+
+        return {
+            "total": processed,
+            "imported": len(new_users),
+            "duplicates": duplicates,
+            "invalid": len({index for index, _ in errors}),
+            "errors": errors,
+            "dry_run": dry_run
+        }
+
+    @staticmethod
+    def _validate_batch(batch: List[Any]) -> Iterator[Tuple[Dict[str, Any], List[str]]]:
+        """Partiyi tek seferde doğrular ve her satırı hata mesajlarıyla birlikte döndürür."""
+        errors: Dict[int, List[str]] = {}
+        for index, field, code in Validator.validate_many(batch, "user"):
+            errors.setdefault(index, []).append(Validator.message(field, code))
+        for index, row in enumerate(batch):
+            yield row, errors.get(index, [])
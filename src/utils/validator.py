@@ -1,103 +1,198 @@
 import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Union
+from itertools import islice
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
+
+# Desenler modül yüklenirken bir kez derlenir
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PHONE_PATTERN = re.compile(r'^\+?[0-9]{10,15}$')
+LICENSE_KEY_PATTERN = re.compile(r'^[A-Z0-9]{5}-[A-Z0-9]{5}-[A-Z0-9]{5}-[A-Z0-9]{5}$')
+DATE_FORMAT = "%Y-%m-%d"
+
+# Hata kodları
+REQUIRED = "required"
+INVALID_FORMAT = "invalid_format"
+INVALID_DATE = "invalid_date"
+DATE_ORDER = "date_order"
+TOO_SHORT = "too_short"
+INVALID_RECORD = "invalid_record"
+
+# (alan, kod) -> kullanıcıya gösterilen hata mesajı; zorunlu alan mesajı alan adından üretilir
+MESSAGES = {
+    ("email", INVALID_FORMAT): "Geçersiz e-posta formatı",
+    ("phone", INVALID_FORMAT): "Geçersiz telefon numarası formatı",
+    ("key", INVALID_FORMAT): "Geçersiz lisans anahtarı formatı",
+    ("start_date", INVALID_DATE): "Geçersiz başlangıç tarihi formatı",
+    ("end_date", INVALID_DATE): "Geçersiz bitiş tarihi formatı",
+    ("end_date", DATE_ORDER): "Bitiş tarihi başlangıç tarihinden sonra olmalıdır",
+    ("content", TOO_SHORT): "Şablon içeriği çok kısa",
+    (None, INVALID_RECORD): "Kayıt bir nesne değil"
+}
+
+# Doğrulama raporu girdisi: (satır indeksi, alan, hata kodu)
+Issue = Tuple[int, Optional[str], str]
 
 class Validator:
+    # validate_many için toplu doğrulamanın paralelleştirileceği parça boyutu
+    CHUNK_SIZE = 5000
+    
     @staticmethod
     def validate_email(email: str) -> bool:
         """E-posta adresini doğrular"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        return isinstance(email, str) and EMAIL_PATTERN.match(email) is not None
         
     @staticmethod
     def validate_phone(phone: str) -> bool:
         """Telefon numarasını doğrular"""
-        pattern = r'^\+?[0-9]{10,15}$'
-        return bool(re.match(pattern, phone))
+        return isinstance(phone, str) and PHONE_PATTERN.match(phone) is not None
         
     @staticmethod
-    def validate_date(date_str: str, format: str = "%Y-%m-%d") -> bool:
+    def validate_date(date_str: str, format: str = DATE_FORMAT) -> bool:
         """Tarih formatını doğrular"""
+        return Validator.parse_date(date_str, format) is not None
+        
+    @staticmethod
+    def parse_date(date_str: str, format: str = DATE_FORMAT) -> Optional[datetime]:
+        """Tarihi ayrıştırır; geçersizse None döndürür"""
         try:
-            datetime.strptime(date_str, format)
-            return True
-        except ValueError:
-            return False
+            return datetime.strptime(date_str, format)
+        except (TypeError, ValueError):
+            return None
             
     @staticmethod
     def validate_license_key(key: str) -> bool:
         """Lisans anahtarını doğrular"""
-        pattern = r'^[A-Z0-9]{5}-[A-Z0-9]{5}-[A-Z0-9]{5}-[A-Z0-9]{5}$'
-        return bool(re.match(pattern, key))
+        return isinstance(key, str) and LICENSE_KEY_PATTERN.match(key) is not None
+        
+    @staticmethod
+    def message(field: Optional[str], code: str) -> str:
+        """Hata kodunu kullanıcıya gösterilecek mesaja çevirir"""
+        if code == REQUIRED:
+            return f"{field} alanı zorunludur"
+        return MESSAGES.get((field, code), f"{field}: {code}")
         
     @staticmethod
     def validate_user_data(data: Dict[str, Any]) -> List[str]:
         """Kullanıcı verilerini doğrular"""
-        errors = []
+        return [Validator.message(field, code) for field, code in Validator.user_issues(data)]
+        
+    @staticmethod
+    def validate_license_data(data: Dict[str, Any]) -> List[str]:
+        """Lisans verilerini doğrular"""
+        return [Validator.message(field, code) for field, code in Validator.license_issues(data)]
+        
+    @staticmethod
+    def validate_template_data(data: Dict[str, Any]) -> List[str]:
+        """Şablon verilerini doğrular"""
+        return [Validator.message(field, code) for field, code in Validator.template_issues(data)]
+        
+    @staticmethod
+    def user_issues(data: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """Kullanıcı verisindeki hataları (alan, kod) olarak döndürür"""
+        issues = Validator._missing(data, ("full_name", "email", "department", "role"))
         
-        # Zorunlu alanları kontrol et
-        required_fields = ["full_name", "email", "department", "role"]
-        for field in required_fields:
-            if field not in data or not data[field]:
-                errors.append(f"{field} alanı zorunludur")
-                
         # E-posta formatını kontrol et
         if "email" in data and not Validator.validate_email(data["email"]):
-            errors.append("Geçersiz e-posta formatı")
+            issues.append(("email", INVALID_FORMAT))
             
         # Telefon numarasını kontrol et
         if "phone" in data and data["phone"] and not Validator.validate_phone(data["phone"]):
-            errors.append("Geçersiz telefon numarası formatı")
+            issues.append(("phone", INVALID_FORMAT))
             
-        return errors
+        return issues
         
     @staticmethod
-    def validate_license_data(data: Dict[str, Any]) -> List[str]:
-        """Lisans verilerini doğrular"""
-        errors = []
+    def license_issues(data: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """Lisans verisindeki hataları (alan, kod) olarak döndürür"""
+        issues = Validator._missing(data, ("key", "type", "start_date", "end_date", "user_id"))
         
-        # Zorunlu alanları kontrol et
-        required_fields = ["key", "type", "start_date", "end_date", "user_id"]
-        for field in required_fields:
-            if field not in data or not data[field]:
-                errors.append(f"{field} alanı zorunludur")
-                
         # Lisans anahtarını kontrol et
         if "key" in data and not Validator.validate_license_key(data["key"]):
-            errors.append("Geçersiz lisans anahtarı formatı")
-            
-        # Tarihleri kontrol et
-        if "start_date" in data and not Validator.validate_date(data["start_date"]):
-            errors.append("Geçersiz başlangıç tarihi formatı")
+            issues.append(("key", INVALID_FORMAT))
             
-        if "end_date" in data and not Validator.validate_date(data["end_date"]):
-            errors.append("Geçersiz bitiş tarihi formatı")
-            
-        # Tarih sıralamasını kontrol et
-        if "start_date" in data and "end_date" in data:
-            try:
-                start = datetime.strptime(data["start_date"], "%Y-%m-%d")
-                end = datetime.strptime(data["end_date"], "%Y-%m-%d")
-                if end <= start:
-                    errors.append("Bitiş tarihi başlangıç tarihinden sonra olmalıdır")
-            except ValueError:
-                pass
+        # Tarihler bir kez ayrıştırılır; sıralama kontrolü aynı değerleri kullanır
+        start = end = None
+        if "start_date" in data:
+            start = Validator.parse_date(data["start_date"])
+            if start is None:
+                issues.append(("start_date", INVALID_DATE))
+                
+        if "end_date" in data:
+            end = Validator.parse_date(data["end_date"])
+            if end is None:
+                issues.append(("end_date", INVALID_DATE))
                 
-        return errors
+        if start is not None and end is not None and end <= start:
+            issues.append(("end_date", DATE_ORDER))
+            
+        return issues
         
     @staticmethod
-    def validate_template_data(data: Dict[str, Any]) -> List[str]:
-        """Şablon verilerini doğrular"""
-        errors = []
+    def template_issues(data: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """Şablon verisindeki hataları (alan, kod) olarak döndürür"""
+        issues = Validator._missing(data, ("name", "content", "type"))
         
-        # Zorunlu alanları kontrol et
-        required_fields = ["name", "content", "type"]
-        for field in required_fields:
-            if field not in data or not data[field]:
-                errors.append(f"{field} alanı zorunludur")
-                
         # İçerik uzunluğunu kontrol et
         if "content" in data and len(data["content"]) < 10:
-            errors.append("Şablon içeriği çok kısa")
+            issues.append(("content", TOO_SHORT))
+            
+        return issues
+        
+    @staticmethod
+    def validate_many(
+        records: Iterable[Any],
+        kind: str = "user",
+        processes: Optional[int] = None,
+        chunk_size: int = CHUNK_SIZE
+    ) -> List[Issue]:
+        """Kayıtları toplu doğrular ve (satır indeksi, alan, kod) listesi döndürür.
+        
+        processes verilirse kayıtlar chunk_size boyutlu parçalar halinde süreç havuzunda
+        doğrulanır; çok büyük içe aktarmalar dışında tek süreç daha hızlıdır.
+        """
+        if kind not in _ISSUES:
+            raise ValueError(f"Bilinmeyen kayıt türü: {kind}")
             
-        return errors 
\ No newline at end of file
+        if not processes:
+            return _validate_chunk(kind, 0, records)
+            
+        report: List[Issue] = []
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = []
+            records = iter(records)
+            start = 0
+            while True:
+                chunk = list(islice(records, chunk_size))
+                if not chunk:
+                    break
+                futures.append(executor.submit(_validate_chunk, kind, start, chunk))
+                start += len(chunk)
+            for future in futures:
+                report.extend(future.result())
+        return report
+        
+    @staticmethod
+    def _missing(data: Dict[str, Any], fields: Tuple[str, ...]) -> List[Tuple[str, str]]:
+        """Boş veya eksik zorunlu alanları döndürür"""
+        return [(field, REQUIRED) for field in fields if not data.get(field)]
+
+
+# Kayıt türü -> hata listesi üreten fonksiyon
+_ISSUES = {
+    "user": Validator.user_issues,
+    "license": Validator.license_issues,
+    "template": Validator.template_issues
+}
+
+
+def _validate_chunk(kind: str, start: int, records: Iterable[Any]) -> List[Issue]:
+    """Bir kayıt parçasını doğrular; süreç havuzuna gönderilebilmesi için modül düzeyindedir."""
+    issues_of = _ISSUES[kind]
+    report: List[Issue] = []
+    for index, record in enumerate(records, start):
+        if not isinstance(record, dict):
+            report.append((index, None, INVALID_RECORD))
+            continue
+        report.extend((index, field, code) for field, code in issues_of(record))
+    return report
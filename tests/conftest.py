@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+# Uygulama modülleri "utils.*" ve "gui.*" olarak src dizininden içe aktarılır
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+# Qt sınıfları testlerde ekran olmadan çalışır
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+@pytest.fixture
+def app():
+    # İş parçacığından yayılan sinyaller ana iş parçacığının olay döngüsünde teslim edilir
+    from PyQt6.QtCore import QCoreApplication
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture(autouse=True, scope="session")
+def stop_logger(tmp_path_factory):
+    # Testler kaynak ağacındaki src/logs yerine geçici bir klasöre log yazar
+    from utils.logger import Logger
+    Logger.LOG_DIR = str(tmp_path_factory.mktemp("logs"))
+    yield
+    # Logger'ın konsol handler'ı pytest'in yakaladığı akışa yazar; akış kapanmadan yazıcı durdurulur
+    if Logger._initialized:
+        Logger().shutdown()
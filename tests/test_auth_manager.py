@@ -0,0 +1,52 @@
+import json
+import threading
+
+import pytest
+
+from utils.auth_manager import AuthManager
+from utils.password_hasher import PBKDF2, PasswordHasher
+
+
+@pytest.fixture
+def fast_policy(monkeypatch):
+    # Testler hızlı kalsın diye ölçüm en düşük maliyeti döndürür; çağıran iş parçacığı kaydedilir
+    threads = []
+
+    def calibrate(target_seconds=0.25, algorithm=None):
+        threads.append(threading.current_thread())
+        return {"algorithm": PBKDF2, "iterations": PasswordHasher.MIN_PBKDF2_ITERATIONS}
+
+    monkeypatch.setattr(PasswordHasher, "calibrate", staticmethod(calibrate))
+    return threads
+
+
+def test_calibration_runs_off_the_calling_thread(tmp_path, fast_policy):
+    auth = AuthManager(str(tmp_path))
+    assert auth.register_async("admin", "secret", "admin").result()
+
+    assert fast_policy and fast_policy[0] is not threading.current_thread()
+    with open(tmp_path / "password_policy.json", encoding="utf-8") as f:
+        assert json.load(f)["iterations"] == PasswordHasher.MIN_PBKDF2_ITERATIONS
+
+    # Kaydedilen politika sonraki açılışta yeniden ölçülmeden kullanılır
+    AuthManager(str(tmp_path))
+    assert len(fast_policy) == 1
+
+
+def test_async_operations_keep_users_consistent(tmp_path, fast_policy):
+    auth = AuthManager(str(tmp_path))
+    futures = [auth.register_async(f"user{number}", "secret") for number in range(5)]
+    # Arka planda kayıt sürerken arayüz iş parçacığı kullanıcıları düzenler
+    for _ in range(50):
+        for user in list(auth.get_all_users()):
+            auth.update_user(user["id"], {"role": "user"})
+    assert all(future.result() for future in futures)
+
+    ids = [user["id"] for user in auth.get_all_users()]
+    assert len(set(ids)) == 5
+    assert auth.login_async("user3", "secret").result()
+    assert auth.current_username == "user3"
+    assert auth.get_user(auth.current_user_id)["username"] == "user3"
+
+    with open(tmp_path / "users.json", encoding="utf-8") as f:
+        assert sorted(user["username"] for user in json.load(f)) == [f"user{number}" for number in range(5)]
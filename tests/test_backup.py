@@ -0,0 +1,177 @@
+import json
+import os
+import threading
+
+import pytest
+
+from utils.auth_manager import AuthManager
+from utils.data_manager import DataManager
+from utils.password_hasher import PBKDF2, PasswordHasher
+
+TEMPLATE = {"id": "1", "name": "Kurumsal", "content": "<p>Saygılarımla</p>", "description": ""}
+USER = {"department": "BT", "role": "user"}
+SIGNATURE = {"id": "7", "name": "Destek", "content": "<p>Destek Ekibi</p>"}
+
+
+@pytest.fixture
+def data_manager(app, tmp_path):
+    manager = DataManager(str(tmp_path))
+    yield manager
+    manager.stop_auto_backup()
+
+
+def write_templates(manager, templates):
+    os.makedirs(os.path.dirname(manager.mock_templates_file), exist_ok=True)
+    with open(manager.mock_templates_file, "w", encoding="utf-8") as f:
+        json.dump(templates, f)
+
+
+def write_signatures(manager, signatures):
+    with open(os.path.join(manager.data_dir, "mock", "signatures.json"), "w", encoding="utf-8") as f:
+        json.dump(signatures, f)
+
+
+def change_data(manager):
+    # Yedekten sonra şablonlar ve iki imza dosyası uygulamanın kullandığı dosyalarda değişir
+    write_templates(manager, [])
+    write_signatures(manager, [])
+    assert manager.delete_signature_template(manager.signatures[0]["id"])
+    assert manager.get_templates() == [] and manager.signatures == [] and manager.get_signatures() == []
+
+
+def assert_restored(manager):
+    assert manager.get_templates() == [TEMPLATE]
+    assert manager.get_signatures() == [SIGNATURE]
+    assert [signature["name"] for signature in manager.signatures] == ["Yeni imza"]
+    with open(manager.signatures_file, encoding="utf-8") as f:
+        assert [signature["name"] for signature in json.load(f)] == ["Yeni imza"]
+
+
+@pytest.fixture
+def prepared(data_manager):
+    write_templates(data_manager, [TEMPLATE])
+    write_signatures(data_manager, [SIGNATURE])
+    assert data_manager.add_signature_template({"name": "Yeni imza", "content": "<b>İmza</b>"})
+    return data_manager
+
+
+def test_incremental_backup_round_trips_templates_and_signatures(prepared):
+    assert prepared.backup_data()
+    backup_id = prepared.get_backups()[0]
+
+    change_data(prepared)
+    assert prepared.restore_data(os.path.join(prepared.data_dir, "backups", backup_id))
+    assert_restored(prepared)
+
+
+def test_archive_round_trips_templates_and_signatures(prepared):
+    result = prepared.create_backup_archive()
+    assert result is not None
+
+    change_data(prepared)
+    assert prepared.restore_data(result["path"])
+    assert_restored(prepared)
+
+
+def test_archive_copied_elsewhere_is_listed_restorable_and_deletable(prepared, tmp_path):
+    elsewhere = tmp_path / "usb"
+    elsewhere.mkdir()
+    result = prepared.create_backup_archive(str(elsewhere))
+    name = os.path.basename(result["path"])
+
+    # Arşiv yedek dizinine yazılır, seçilen konuma yalnızca kopyalanır
+    assert os.listdir(elsewhere) == [name]
+    assert result["copy"] == str(elsewhere / name)
+    assert name in prepared.get_backups()
+
+    change_data(prepared)
+    assert prepared.restore_data(os.path.join(prepared.data_dir, "backups", name))
+    assert_restored(prepared)
+
+    assert prepared.delete_backup(name)
+    assert name not in prepared.get_backups()
+    assert os.path.exists(result["copy"])
+
+
+def test_archives_started_in_the_same_second_do_not_overwrite(prepared, monkeypatch):
+    import utils.data_manager as data_manager_module
+
+    class FrozenDatetime(data_manager_module.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls(2024, 5, 1, 10, 30, 0)
+
+    monkeypatch.setattr(data_manager_module, "datetime", FrozenDatetime)
+    first = prepared.create_backup_archive()
+    change_data(prepared)
+    second = prepared.create_backup_archive()
+
+    # İkinci arşiv sayaç ekiyle ayrı bir dosyaya yazılır
+    assert first["path"] != second["path"]
+    names = [os.path.basename(result["path"]) for result in (first, second)]
+    assert all(name in prepared.get_backups() for name in names)
+    assert prepared.restore_data(first["path"])
+    assert_restored(prepared)
+
+
+def test_corrupt_auth_file_in_archive_is_not_restored(prepared):
+    roles_file = os.path.join(prepared.data_dir, "roles.json")
+    with open(roles_file, "w", encoding="utf-8") as f:
+        f.write("{bozuk")
+    result = prepared.create_backup_archive()
+    with open(roles_file, "w", encoding="utf-8") as f:
+        json.dump({"admin": ["*"]}, f)
+    change_data(prepared)
+
+    # Bozuk girdi varsa hiçbir dosyaya dokunulmaz
+    assert not prepared.restore_data(result["path"])
+    assert prepared.get_templates() == []
+    with open(roles_file, encoding="utf-8") as f:
+        assert json.load(f) == {"admin": ["*"]}
+
+
+def test_restore_reloads_auth_manager(prepared, monkeypatch):
+    policy = {"algorithm": PBKDF2, "iterations": PasswordHasher.MIN_PBKDF2_ITERATIONS}
+    monkeypatch.setattr(PasswordHasher, "calibrate", staticmethod(lambda target_seconds=0.25, algorithm=None: policy))
+    auth = AuthManager(prepared.data_dir)
+    auth._executor.submit(lambda: None).result()
+    prepared.backup_restored.connect(auth.reload)
+    result = prepared.create_backup_archive()
+
+    assert auth.add_role("denetci", ["view_reports"])
+    auth.password_hasher.params = {"algorithm": PBKDF2, "iterations": 1}
+    assert prepared.restore_data(result["path"])
+
+    # Bellekteki roller ve şifre politikası yedektekiyle aynıdır
+    assert "denetci" not in auth.get_all_roles()
+    assert auth.password_hasher.params == policy
+
+
+def test_async_backup_keeps_the_snapshot_taken_at_call_time(data_manager):
+    for number in range(3):
+        data_manager.add_user({**USER, "full_name": f"Kişi {number}", "email": f"kisi{number}@firma.com"})
+    assert data_manager.add_license({
+        "key": "LIC-1", "type": "standart", "start_date": "2024-01-01", "end_date": "2025-01-01",
+        "user_id": 1, "status": "ACTIVE"
+    })
+    expected_users = json.loads(json.dumps(data_manager.query_users().all()))
+    expected_licenses = json.loads(json.dumps(data_manager.query_licenses().all()))
+
+    # Yedekleme iş parçacığı meşgulken anlık görüntü alınır, yazım düzenlemelerden sonra yapılır
+    release = threading.Event()
+    data_manager._backup_executor.submit(release.wait)
+    future = data_manager.backup_data_async()
+
+    # Kayıtlar yerinde güncellenir, silinir ve eklenir
+    first_id = expected_users[0]["id"]
+    data_manager.update_user(first_id, {"full_name": "Değişti"})
+    data_manager.delete_user(expected_users[1]["id"])
+    data_manager.add_user({**USER, "full_name": "Sonradan", "email": "sonra@firma.com"})
+    assert data_manager.update_license("LIC-1", {**expected_licenses[0], "status": "SUSPENDED"})
+    release.set()
+    assert future.result(timeout=30)
+
+    backup_id = data_manager.get_backups()[0]
+    assert data_manager.restore_data(os.path.join(data_manager.data_dir, "backups", backup_id))
+    assert data_manager.query_users().all() == expected_users
+    assert data_manager.query_licenses().all() == expected_licenses
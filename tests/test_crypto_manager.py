@@ -0,0 +1,92 @@
+import io
+import os
+
+import pytest
+
+from utils.crypto_manager import CryptoManager
+
+
+@pytest.fixture
+def crypto(tmp_path):
+    return CryptoManager(str(tmp_path / "data"))
+
+
+def encrypt_bytes(crypto, data, chunk_size=None, workers=1):
+    dst = io.BytesIO()
+    crypto.encrypt_stream(io.BytesIO(data), dst, chunk_size=chunk_size, workers=workers)
+    return dst.getvalue()
+
+
+def decrypt_bytes(crypto, data, workers=1):
+    dst = io.BytesIO()
+    crypto.decrypt_stream(io.BytesIO(data), dst, workers=workers)
+    return dst.getvalue()
+
+
+@pytest.mark.parametrize("size", [0, 1, 4096, 10000])
+@pytest.mark.parametrize("workers", [1, 3])
+def test_stream_round_trip(crypto, size, workers):
+    data = os.urandom(size)
+    encrypted = encrypt_bytes(crypto, data, chunk_size=1024, workers=workers)
+    assert decrypt_bytes(crypto, encrypted, workers=workers) == data
+
+
+def test_file_round_trip_and_legacy_format(crypto, tmp_path):
+    plain = tmp_path / "plain.bin"
+    plain.write_bytes(os.urandom(3 * 1024 * 1024 + 5))
+    crypto.encrypt_file(str(plain), str(tmp_path / "enc.bin"))
+    crypto.decrypt_file(str(tmp_path / "enc.bin"), str(tmp_path / "out.bin"))
+    assert (tmp_path / "out.bin").read_bytes() == plain.read_bytes()
+
+    # Eski tek parça Fernet dosyaları okunmaya devam eder
+    (tmp_path / "legacy.bin").write_bytes(crypto._fernet.encrypt(b"eski veri"))
+    crypto.decrypt_file(str(tmp_path / "legacy.bin"), str(tmp_path / "legacy.out"))
+    assert (tmp_path / "legacy.out").read_bytes() == b"eski veri"
+
+
+def test_tampered_file_is_rejected_without_leaving_plaintext(crypto, tmp_path):
+    encrypted = bytearray(encrypt_bytes(crypto, os.urandom(5000), chunk_size=1024))
+    encrypted[-3] ^= 0x01
+    (tmp_path / "enc.bin").write_bytes(bytes(encrypted))
+
+    with pytest.raises(Exception):
+        crypto.decrypt_file(str(tmp_path / "enc.bin"), str(tmp_path / "out.bin"))
+    assert not (tmp_path / "out.bin").exists()
+    assert not (tmp_path / "out.bin.tmp").exists()
+
+
+def test_truncated_stream_is_rejected(crypto, tmp_path):
+    encrypted = encrypt_bytes(crypto, os.urandom(5000), chunk_size=1024)
+    # Son çerçeve tamamen kesilirse akış yine de reddedilir
+    frame = crypto.FRAME_HEADER.size + 1024 + crypto.GCM_TAG_SIZE
+    truncated = encrypted[:crypto.STREAM_HEADER.size + 4 * frame]
+    with pytest.raises(ValueError):
+        decrypt_bytes(crypto, truncated)
+
+    (tmp_path / "enc.bin").write_bytes(truncated)
+    with pytest.raises(ValueError):
+        crypto.decrypt_file(str(tmp_path / "enc.bin"), str(tmp_path / "out.bin"))
+    assert sorted(os.listdir(tmp_path)) == ["data", "enc.bin"]
+
+
+def test_oversized_frame_length_is_rejected(crypto):
+    encrypted = encrypt_bytes(crypto, b"abc", chunk_size=1024)
+    header = encrypted[:crypto.STREAM_HEADER.size]
+    forged = header + crypto.FRAME_HEADER.pack(0xFFFFFFFF, crypto.FINAL_FLAG)
+    with pytest.raises(ValueError, match="çok uzun"):
+        decrypt_bytes(crypto, forged)
+
+
+def test_reencrypt_file_after_key_rotation(crypto, tmp_path):
+    plain = tmp_path / "plain.bin"
+    plain.write_bytes(b"gizli" * 1000)
+    crypto.encrypt_file(str(plain), str(tmp_path / "enc.bin"))
+    old_key_id = crypto.key_id
+
+    crypto.rotate_key()
+    assert crypto.file_key_id(str(tmp_path / "enc.bin")) == old_key_id
+    assert crypto.reencrypt_file(str(tmp_path / "enc.bin"))
+    assert crypto.file_key_id(str(tmp_path / "enc.bin")) == crypto.key_id
+
+    crypto.decrypt_file(str(tmp_path / "enc.bin"), str(tmp_path / "out.bin"))
+    assert (tmp_path / "out.bin").read_bytes() == plain.read_bytes()
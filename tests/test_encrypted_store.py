@@ -0,0 +1,68 @@
+import json
+import sqlite3
+
+import pytest
+
+from utils.crypto_manager import CryptoManager
+from utils.encrypted_store import EncryptedRecordStore
+
+INDEX_FIELDS = ("user_id", "expiry_date", "is_active")
+
+
+@pytest.fixture
+def crypto(tmp_path):
+    return CryptoManager(str(tmp_path / "data"))
+
+
+def make_license(user_id, is_active=True):
+    return {"user_id": user_id, "expiry_date": "2030-01-01T00:00:00", "is_active": is_active, "features": ["x"]}
+
+
+def test_find_uses_index_columns(tmp_path, crypto):
+    store = EncryptedRecordStore(str(tmp_path / "licenses.db"), crypto, INDEX_FIELDS)
+    store.put("a", make_license("u1"))
+    store.put("b", make_license("u2"))
+    store.put("c", make_license("u1", is_active=False))
+
+    assert store.find(user_id="u1") == ["a", "c"]
+    assert store.find(user_id="u1", is_active=True) == ["a"]
+    assert store.find(user_id=None) == []
+    with pytest.raises(ValueError):
+        store.find(features=["x"])
+
+    meta = dict(store.metadata())
+    assert meta["b"] == {"user_id": "u2", "expiry_date": "2030-01-01T00:00:00", "is_active": 1}
+    store.close()
+
+
+def test_records_are_encrypted_at_rest(tmp_path, crypto):
+    db_file = str(tmp_path / "licenses.db")
+    store = EncryptedRecordStore(db_file, crypto, INDEX_FIELDS)
+    store.put("a", make_license("u1"))
+    store.close()
+
+    conn = sqlite3.connect(db_file)
+    (ciphertext,) = conn.execute("SELECT ciphertext FROM records").fetchone()
+    conn.close()
+    assert "features" not in ciphertext
+
+    reopened = EncryptedRecordStore(db_file, crypto, INDEX_FIELDS)
+    assert reopened["a"] == make_license("u1")
+    reopened.close()
+
+
+def test_migrates_json_meta_schema(tmp_path, crypto):
+    db_file = str(tmp_path / "licenses.db")
+    conn = sqlite3.connect(db_file)
+    conn.execute("CREATE TABLE records (id TEXT PRIMARY KEY, meta TEXT NOT NULL, ciphertext TEXT NOT NULL)")
+    record = make_license("u1")
+    ciphertext = crypto.encrypt_string(json.dumps({"id": "a", "record": record}))
+    meta = json.dumps({field: record[field] for field in INDEX_FIELDS})
+    conn.execute("INSERT INTO records VALUES (?, ?, ?)", ("a", meta, ciphertext))
+    conn.commit()
+    conn.close()
+
+    store = EncryptedRecordStore(db_file, crypto, INDEX_FIELDS)
+    assert store.find(user_id="u1") == ["a"]
+    assert store["a"] == record
+    store.close()
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import utils.expiry_scheduler as expiry_scheduler_module
+from utils.expiry_scheduler import ExpiryScheduler
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+    
+    def advance(self, **delta):
+        self.now += timedelta(**delta)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock(datetime(2024, 6, 1, 12, 0, 0))
+    
+    class FakeDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return clock.now
+    
+    monkeypatch.setattr(expiry_scheduler_module, "datetime", FakeDatetime)
+    return clock
+
+
+@pytest.fixture
+def scheduler(app, clock):
+    scheduler = ExpiryScheduler(warning_days=30)
+    events = []
+    scheduler.license_expiring.connect(lambda key, days: events.append(("expiring", key, days)))
+    scheduler.license_expired.connect(lambda key: events.append(("expired", key)))
+    scheduler.events = events
+    yield scheduler
+    scheduler.clear()
+
+
+def run_until(scheduler, clock, moment):
+    # Zamanlayıcının tetikleyeceği işlem sahte saat ilerletilerek doğrudan çağrılır
+    clock.now = moment
+    scheduler._process_due()
+
+
+def test_warning_and_expiry_fire_in_order(scheduler, clock):
+    start = clock.now
+    scheduler.schedule("KEY-2", start + timedelta(days=40))
+    scheduler.schedule("KEY-1", start + timedelta(days=35))
+    assert scheduler.next_event_time() == start + timedelta(days=5)
+    
+    run_until(scheduler, clock, start + timedelta(days=4))
+    assert scheduler.events == []
+    
+    # Kalan gün olayın işlendiği andan hesaplanır
+    run_until(scheduler, clock, start + timedelta(days=10))
+    assert scheduler.events == [("expiring", "KEY-1", 25), ("expiring", "KEY-2", 30)]
+    
+    run_until(scheduler, clock, start + timedelta(days=36))
+    assert scheduler.events[2:] == [("expired", "KEY-1")]
+    assert not scheduler.is_scheduled("KEY-1") and scheduler.is_scheduled("KEY-2")
+
+
+def test_rescheduled_and_cancelled_licenses_drop_old_events(scheduler, clock):
+    start = clock.now
+    scheduler.schedule("KEY-1", start + timedelta(days=35))
+    scheduler.schedule("KEY-2", start + timedelta(days=35))
+    
+    # Yenilenen lisansın eski olayları atlanır, iptal edilenin hiç olayı kalmaz
+    scheduler.schedule("KEY-1", start + timedelta(days=400))
+    scheduler.cancel("KEY-2")
+    run_until(scheduler, clock, start + timedelta(days=100))
+    assert scheduler.events == []
+    assert scheduler.next_event_time() == start + timedelta(days=370)
+    
+    run_until(scheduler, clock, start + timedelta(days=401))
+    assert scheduler.events == [("expiring", "KEY-1", 0), ("expired", "KEY-1")]
+    assert scheduler.next_event_time() is None
+
+
+def test_past_expiry_fires_only_expired(scheduler, clock):
+    scheduler.schedule("KEY-1", clock.now - timedelta(days=1))
+    scheduler._process_due()
+    assert scheduler.events == [("expired", "KEY-1")]
+
+
+def test_timer_waits_at_most_a_day(scheduler, clock):
+    scheduler.schedule("KEY-1", clock.now + timedelta(days=90))
+    assert scheduler._timer.isActive()
+    assert scheduler._timer.interval() == ExpiryScheduler.MAX_TIMER_INTERVAL
+    
+    scheduler.schedule("KEY-2", clock.now + timedelta(days=30, minutes=1))
+    assert scheduler._timer.interval() == 60 * 1000
@@ -0,0 +1,60 @@
+import csv
+import gzip
+import json
+import os
+import stat
+
+import pytest
+
+from utils.exporter import export_rows
+
+ROWS = [{"id": number, "name": f"Kişi {number}"} for number in range(2500)]
+
+
+@pytest.mark.parametrize("filename", ["out.json", "out.jsonl", "out.json.gz", "out.jsonl.gz"])
+def test_json_formats_round_trip(tmp_path, filename):
+    path = str(tmp_path / filename)
+    assert export_rows(iter(ROWS), path) == len(ROWS)
+    
+    opener = gzip.open if filename.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        if ".jsonl" in filename:
+            assert [json.loads(line) for line in f] == ROWS
+        else:
+            assert json.load(f) == ROWS
+
+
+def test_csv_uses_columns(tmp_path):
+    path = str(tmp_path / "out.csv")
+    export_rows(ROWS[:2], path, columns=[("Ad", lambda row: row["name"])])
+    with open(path, encoding="utf-8", newline="") as f:
+        assert list(csv.reader(f)) == [["Ad"], ["Kişi 0"], ["Kişi 1"]]
+
+
+def test_existing_file_keeps_its_permissions(tmp_path):
+    path = tmp_path / "out.json"
+    path.write_text("[]", encoding="utf-8")
+    os.chmod(path, 0o640)
+    
+    export_rows(ROWS, str(path))
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+
+
+def test_failed_export_leaves_target_untouched(tmp_path):
+    path = tmp_path / "out.json"
+    path.write_text("[]", encoding="utf-8")
+    
+    def rows():
+        yield ROWS[0]
+        raise RuntimeError("kesildi")
+    
+    with pytest.raises(RuntimeError):
+        export_rows(rows(), str(path))
+    assert path.read_text(encoding="utf-8") == "[]"
+    assert os.listdir(tmp_path) == ["out.json"]
+
+
+def test_new_file_is_owner_only(tmp_path):
+    path = tmp_path / "out.jsonl"
+    export_rows(ROWS[:1], str(path))
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
@@ -0,0 +1,127 @@
+import io
+import os
+
+import pytest
+
+from utils.crypto_manager import CryptoManager
+from utils.encrypted_store import EncryptedRecordStore
+from utils.key_rotation import ReencryptionJob
+
+
+@pytest.fixture
+def crypto(tmp_path):
+    return CryptoManager(str(tmp_path / "data"))
+
+
+@pytest.fixture
+def store(tmp_path, crypto):
+    store = EncryptedRecordStore(str(tmp_path / "licenses.db"), crypto, ("user_id",))
+    for number in range(10):
+        store.put(f"lic-{number}", {"user_id": f"u{number % 3}", "number": number})
+    yield store
+    store.close()
+
+
+def test_background_job_reencrypts_all_stale_records(app, tmp_path, crypto, store):
+    plain = tmp_path / "plain.bin"
+    plain.write_bytes(b"dosya" * 100)
+    encrypted = str(tmp_path / "enc.bin")
+    crypto.encrypt_file(str(plain), encrypted)
+
+    crypto.rotate_key()
+    assert len(store.stale_ids()) == 10
+
+    results = []
+    progress = []
+    job = ReencryptionJob(crypto, stores=[store], files=[encrypted], workers=3, batch_size=4)
+    job.finished.connect(lambda rotated, failed: results.append((rotated, failed)))
+    job.progress.connect(lambda processed, total: progress.append((processed, total)))
+    job.start()
+    job.wait(30)
+    app.processEvents()
+
+    assert not job.is_running()
+    assert results == [(11, 0)]
+    assert progress[-1] == (11, 11)
+    assert store.stale_ids() == []
+    assert crypto.file_key_id(encrypted) == crypto.key_id
+
+    # Kayıtlar yeni anahtarla çözülebilir
+    reopened = EncryptedRecordStore(str(tmp_path / "licenses.db"), crypto, ("user_id",))
+    assert reopened["lic-7"] == {"user_id": "u1", "number": 7}
+    reopened.close()
+
+
+def test_failed_batches_are_not_counted_as_progress(crypto, store):
+    crypto.rotate_key()
+    job = ReencryptionJob(crypto, stores=[store], workers=1, batch_size=5)
+    progress = []
+    job.progress.connect(lambda processed, total: progress.append((processed, total)))
+
+    def failing():
+        raise RuntimeError("bozuk parti")
+
+    batch = store.stale_ids()[:5]
+    rotated, failed = job.run([(failing, 5), (lambda: store.reencrypt(batch), 5)])
+    assert (rotated, failed) == (5, 5)
+    assert progress[-1] == (5, 10)
+
+
+def test_cancelled_job_reports_no_progress(crypto, store):
+    crypto.rotate_key()
+    job = ReencryptionJob(crypto, stores=[store], workers=1, batch_size=2)
+    progress = []
+    job.progress.connect(lambda processed, total: progress.append((processed, total)))
+    job.cancel()
+    tasks = job._collect_tasks()
+    assert job.run(tasks) == (0, 0)
+    assert progress == [(0, 10)]
+    assert len(store.stale_ids()) == 10
+
+
+def reencrypt_and_read(crypto, tmp_path, encrypted):
+    crypto.rotate_key()
+    assert crypto.reencrypt_file(encrypted)
+    assert crypto.file_key_id(encrypted) == crypto.key_id
+    crypto.decrypt_file(encrypted, str(tmp_path / "out.bin"))
+    return (tmp_path / "out.bin").read_bytes()
+
+
+def test_reencrypt_large_legacy_file(crypto, tmp_path):
+    data = os.urandom(3 * 1024 * 1024)
+    encrypted = tmp_path / "legacy.bin"
+    encrypted.write_bytes(crypto._fernet.encrypt(data))
+
+    # Tek parça Fernet dosyası 1 MiB'lık çerçevelere bölünür
+    assert reencrypt_and_read(crypto, tmp_path, str(encrypted)) == data
+
+
+def test_reencrypt_stream_with_larger_chunk_size(crypto, tmp_path):
+    data = os.urandom(9 * 1024 * 1024 + 3)
+    encrypted = str(tmp_path / "enc.bin")
+    with open(encrypted, "wb") as dst:
+        crypto.encrypt_stream(io.BytesIO(data), dst, chunk_size=4 * 1024 * 1024)
+
+    assert reencrypt_and_read(crypto, tmp_path, encrypted) == data
+
+
+def test_failed_verification_keeps_the_original_file(crypto, tmp_path, monkeypatch):
+    plain = tmp_path / "plain.bin"
+    plain.write_bytes(os.urandom(2 * 1024 * 1024 + 1))
+    encrypted = tmp_path / "enc.bin"
+    crypto.encrypt_file(str(plain), str(encrypted))
+    original = encrypted.read_bytes()
+    crypto.rotate_key()
+
+    # Yeni dosyaya bir parça yazılmadan kaybolursa doğrulama eski dosyayı korur
+    def dropping(chunks, digest):
+        for number, chunk in enumerate(chunks):
+            digest.update(chunk)
+            if number:
+                yield chunk
+
+    monkeypatch.setattr(CryptoManager, "_hashed", staticmethod(dropping))
+    with pytest.raises(ValueError):
+        crypto.reencrypt_file(str(encrypted))
+    assert encrypted.read_bytes() == original
+    assert not os.path.exists(str(encrypted) + ".rekey")
@@ -0,0 +1,97 @@
+import random
+from datetime import datetime, timedelta
+
+from utils.license_statistics import LicenseStatistics
+
+NOW = datetime(2024, 6, 1, 12, 0, 0)
+STATUSES = ("ACTIVE", "EXPIRED", "SUSPENDED")
+TYPES = ("standart", "kurumsal", "deneme")
+
+
+def make_license(rng, key):
+    created = NOW - timedelta(days=rng.randint(0, 60), hours=rng.randint(0, 23))
+    end = NOW + timedelta(days=rng.randint(-10, 45), hours=rng.randint(0, 23))
+    return {
+        "key": key,
+        "type": rng.choice(TYPES),
+        "status": rng.choice(STATUSES),
+        "user_id": rng.randint(1, 5),
+        "created_at": created.strftime("%Y-%m-%d %H:%M:%S"),
+        "end_date": end.strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+
+def full_scan(licenses, now):
+    # Artımlı sayaçlardan önceki get_license_statistics hesabı
+    type_distribution = {}
+    for license in licenses:
+        type_distribution[license["type"]] = type_distribution.get(license["type"], 0) + 1
+    soon_to_expire = []
+    for license in licenses:
+        days_left = (datetime.fromisoformat(license["end_date"]) - now).days
+        if license["status"] == "ACTIVE" and 0 <= days_left <= 30:
+            soon_to_expire.append({"key": license["key"], "days_left": days_left, "user_id": license["user_id"]})
+    return {
+        "total": len(licenses),
+        "active": len([l for l in licenses if l["status"] == "ACTIVE"]),
+        "expired": len([l for l in licenses if l["status"] == "EXPIRED"]),
+        "suspended": len([l for l in licenses if l["status"] == "SUSPENDED"]),
+        "type_distribution": type_distribution,
+        "new_licenses_30d": len([
+            l for l in licenses if datetime.fromisoformat(l["created_at"]) >= now - timedelta(days=30)
+        ]),
+        "soon_to_expire": soon_to_expire
+    }
+
+
+def normalized(summary):
+    # Yakında bitecekler bitiş sırasıyla gelir; karşılaştırma sıradan bağımsız yapılır
+    return {**summary, "soon_to_expire": sorted(summary["soon_to_expire"], key=lambda item: item["key"])}
+
+
+def test_incremental_changes_match_full_scan():
+    rng = random.Random(29)
+    licenses = {}
+    stats = LicenseStatistics()
+    for step in range(2000):
+        action = rng.random()
+        if action < 0.5 or not licenses:
+            license = make_license(rng, f"KEY-{step}")
+            licenses[license["key"]] = license
+            stats.add(license)
+        elif action < 0.8:
+            key = rng.choice(list(licenses))
+            license = make_license(rng, key)
+            licenses[key] = license
+            stats.update(license)
+        else:
+            key = rng.choice(list(licenses))
+            del licenses[key]
+            stats.remove(key)
+        
+        if step % 250 == 0:
+            assert normalized(stats.summary(NOW)) == normalized(full_scan(list(licenses.values()), NOW))
+    
+    expected = normalized(full_scan(list(licenses.values()), NOW))
+    assert normalized(stats.summary(NOW)) == expected
+    
+    rebuilt = LicenseStatistics()
+    rebuilt.rebuild(list(licenses.values()))
+    assert normalized(rebuilt.summary(NOW)) == expected
+
+
+def test_rebuild_keeps_the_last_record_of_a_duplicate_key():
+    rng = random.Random(7)
+    first = {**make_license(rng, "KEY-1"), "status": "ACTIVE", "type": "deneme"}
+    second = {**first, "status": "EXPIRED", "type": "kurumsal"}
+    
+    rebuilt = LicenseStatistics()
+    rebuilt.rebuild([first, second])
+    incremental = LicenseStatistics()
+    incremental.add(first)
+    incremental.add(second)
+    
+    # Aynı anahtar tek lisans sayılır; rebuild ile artımlı ekleme aynı sonucu verir
+    assert rebuilt.summary(NOW) == incremental.summary(NOW) == full_scan([second], NOW)
+    rebuilt.remove("KEY-1")
+    assert rebuilt.count() == 0 and rebuilt.type_distribution() == {} and rebuilt.next_expiry() is None
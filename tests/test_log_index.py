@@ -0,0 +1,68 @@
+import logging
+
+import pytest
+
+from utils.log_index import LogQuery, read_index
+from utils.logger import IndexedRotatingFileHandler, JsonLineFormatter
+
+LEGACY_LINES = (
+    "2024-01-01 10:00:00 - INFO - app - Eski bilgi\n"
+    "Context: {\"user_id\": 1}\n"
+    "\n"
+    "2024-01-01 10:00:05 - ERROR - app - Eski hata\n"
+    "Context: çok satırlı\n"
+    "devam satırı\n"
+    "\n"
+)
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text(LEGACY_LINES, encoding="utf-8")
+    return str(path)
+
+
+def write_json_records(log_file):
+    handler = IndexedRotatingFileHandler(log_file, maxBytes=1024 * 1024, backupCount=1, encoding="utf-8")
+    handler.setFormatter(JsonLineFormatter())
+    for level, message in ((logging.INFO, "Yeni bilgi"), (logging.ERROR, "Yeni hata")):
+        handler.handle(logging.makeLogRecord({"name": "app", "levelno": level, "levelname": logging.getLevelName(level), "msg": message, "context": None}))
+    handler.flush_batch()
+    return handler
+
+
+def messages(log_file, **filters):
+    return [entry["message"] for entry in LogQuery(log_file, **filters).newest(10)]
+
+
+@pytest.mark.parametrize("closed", [False, True])
+def test_legacy_lines_before_json_lines_are_returned(log_file, closed):
+    handler = write_json_records(log_file)
+    if closed:
+        # Kapanışta açık dilim indekse yazılır; eski metin bölümü indeksin önünde kalır
+        handler.close()
+        assert read_index(log_file)[0]["offset"] == len(LEGACY_LINES.encode("utf-8"))
+
+    assert messages(log_file) == ["Yeni hata", "Yeni bilgi", "Eski hata", "Eski bilgi"]
+    errors = LogQuery(log_file, severity="error").newest(10)
+    assert [entry["message"] for entry in errors] == ["Yeni hata", "Eski hata"]
+    assert errors[1]["context"] == "çok satırlı\ndevam satırı"
+    if not closed:
+        handler.close()
+
+
+def test_unindexed_gap_between_buckets_is_scanned(log_file):
+    handler = write_json_records(log_file)
+    handler.close()
+    bucket = read_index(log_file)[0]
+
+    # Kapanmadan kalmış bir dilim: dosyaya yazılmış ama indekse hiç eklenmemiş kayıt
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write('{"timestamp":"2024-01-02T00:00:00","level":"WARNING","type":"app","message":"İndekssiz","context":null}\n')
+    handler = write_json_records(log_file)
+    handler.close()
+
+    assert len(read_index(log_file)) == 2
+    assert read_index(log_file)[1]["offset"] > bucket["end"]
+    assert messages(log_file, severity="warning") == ["İndekssiz"]
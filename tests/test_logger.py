@@ -0,0 +1,37 @@
+import json
+import logging
+import queue
+
+from utils.logger import FastQueueHandler, JsonLineFormatter, LazyContext
+
+
+def enqueue(context):
+    log_queue = queue.SimpleQueue()
+    logger = logging.getLogger("test_logger.enqueue")
+    logger.propagate = False
+    handler = FastQueueHandler(log_queue)
+    logger.addHandler(handler)
+    try:
+        logger.warning("kayıt", extra={"context": context})
+    finally:
+        logger.removeHandler(handler)
+    return log_queue.get_nowait()
+
+
+def test_lazy_context_keeps_values_from_log_time():
+    details = {"user_id": 1, "tags": ["a"]}
+    context = LazyContext({"details": details})
+    # Kayıt kuyruğa girdikten sonra çağıran sözlüğü değiştirir
+    details["user_id"] = 2
+    details["extra"] = True
+
+    assert json.loads(str(context)) == {"details": {"user_id": 1, "tags": ["a"]}}
+
+
+def test_queued_record_is_not_affected_by_later_changes():
+    context = {"step": 1}
+    record = enqueue(context)
+    context["step"] = 2
+
+    entry = json.loads(JsonLineFormatter().format(record))
+    assert entry["context"] == {"step": 1}
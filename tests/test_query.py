@@ -0,0 +1,44 @@
+from utils.filters import Query, parse_datetime
+from utils.search_index import FieldIndex
+
+
+def make_users():
+    return [
+        {"id": 1, "department": "IT", "role": "admin"},
+        {"id": 2, "department": "HR", "role": "user"},
+        {"id": 3, "department": "IT", "role": "user"},
+        {"id": 4, "department": "IT", "role": "user"},
+    ]
+
+
+def test_indexed_query_keeps_collection_order_after_updates():
+    users = make_users()
+    index = FieldIndex(("department", "role"))
+    index.rebuild(users)
+
+    # Kullanıcı 1 başka bölüme taşınıp geri gelince kova sonuna eklenir
+    users[0]["department"] = "HR"
+    index.update(users[0])
+    users[0]["department"] = "IT"
+    index.update(users[0])
+
+    result = Query(users, index).where("department", "IT").all()
+    assert [user["id"] for user in result] == [1, 3, 4]
+
+
+def test_indexed_query_matches_full_scan():
+    users = make_users()
+    index = FieldIndex(("department", "role"))
+    index.rebuild(users)
+
+    indexed = Query(users, index).where("department", "IT").where("role", "user").all()
+    scanned = Query(users).where("department", "IT").where("role", "user").all()
+    assert indexed == scanned
+
+
+def test_parse_datetime_reuses_cached_results():
+    parse_datetime.cache_clear()
+    first = parse_datetime("2024-05-01T10:30:00")
+    # Aynı metin yeniden ayrıştırılmaz, önbellekteki nesne döner
+    assert parse_datetime("2024-05-01T10:30:00") is first
+    assert parse_datetime.cache_info().hits == 1
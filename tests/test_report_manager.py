@@ -0,0 +1,156 @@
+import json
+import os
+import random
+from collections import Counter
+
+import pytest
+
+from utils.data_manager import DataManager
+from utils.report_manager import ReportManager
+
+
+class FakeDataManager:
+    """Rapor yöneticisinin kullandığı DataManager yüzeyinin küçük bir kopyası."""
+
+    def __init__(self, licenses_file, licenses, fail_after=None):
+        self.licenses_file = licenses_file
+        self.licenses = licenses
+        self.fail_after = fail_after
+        self.save()
+
+    def save(self):
+        with open(self.licenses_file, "w", encoding="utf-8") as f:
+            f.write(str(len(self.licenses)))
+
+    def query_licenses(self):
+        for number, license in enumerate(self.licenses):
+            if number == self.fail_after:
+                raise OSError("disk okunamadı")
+            yield license
+
+    def get_data_stamp(self, collection):
+        stat = os.stat(self.licenses_file)
+        return stat.st_mtime_ns, stat.st_size
+
+
+def make_license(number):
+    return {
+        "id": number, "key": f"KEY-{number}", "type": "standart", "start_date": "2024-01-01",
+        "end_date": "2025-01-01", "status": "ACTIVE", "user_id": 1, "created_at": "2024-01-01"
+    }
+
+
+@pytest.fixture
+def data_manager(tmp_path):
+    return FakeDataManager(str(tmp_path / "licenses.json"), [make_license(number) for number in range(2000)])
+
+
+@pytest.fixture
+def manager(tmp_path):
+    def build(data_manager):
+        return ReportManager(data_manager, report_dir=str(tmp_path / "reports"), cache_dir=str(tmp_path / "cache"))
+    return build
+
+
+def test_failed_row_source_leaves_no_cached_report(manager, data_manager):
+    data_manager.fail_after = 1200
+    reports = manager(data_manager)
+
+    with pytest.raises(OSError):
+        reports.export("license_usage", ["csv", "json"])
+    # Yarım kalan dosyalar önbelleğe geçerli rapor olarak girmez
+    assert len(reports.cache) == 0
+    assert [name for name in os.listdir(reports.cache.cache_dir) if name != "index.json"] == []
+
+    data_manager.fail_after = None
+    paths = reports.export("license_usage", ["csv"])
+    with open(paths["csv"], encoding="utf-8") as f:
+        assert sum(1 for _ in f) == len(data_manager.licenses) + 1
+
+
+def test_cached_report_is_reused_by_a_new_process(manager, data_manager, monkeypatch):
+    first = manager(data_manager).generate_license_usage_report(output_format="csv")
+
+    # Yeni açılış: önbellek diskten yüklenir, rapor yeniden üretilmez
+    reports = manager(data_manager)
+    monkeypatch.setattr(reports, "_write_report", lambda *args: pytest.fail("rapor yeniden üretildi"))
+    second = reports.generate_license_usage_report(output_format="csv")
+    assert os.path.dirname(second) == reports.report_dir
+    with open(first, encoding="utf-8") as a, open(second, encoding="utf-8") as b:
+        assert a.read() == b.read()
+
+    # Önbellek temizlense de kullanıcıya verilen kopya kalır
+    reports.cache.clear()
+    assert os.path.exists(second)
+
+
+def test_changed_data_file_misses_the_cache(manager, data_manager):
+    reports = manager(data_manager)
+    reports.generate_license_usage_report(output_format="json")
+
+    data_manager.licenses = data_manager.licenses[:10]
+    data_manager.save()
+    path = reports.generate_license_usage_report(output_format="json")
+    assert len(reports.cache) == 2
+    with open(path, encoding="utf-8") as f:
+        assert f.read().count('"Lisans ID"') == 10
+
+
+def write_collection(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(records, f)
+
+
+def summary_counts(path):
+    with open(path, encoding="utf-8") as f:
+        rows = json.load(f)
+    counts = {}
+    for row in rows:
+        counts.setdefault(row["Kategori"], {})[row["Değer"]] = row["Sayı"]
+    return counts
+
+
+def test_summary_report_matches_plain_counts(app, tmp_path):
+    rng = random.Random(43)
+    users = [
+        {
+            "id": number, "full_name": f"Kişi {number}", "email": f"kisi{number}@firma.com",
+            "department": rng.choice(["BT", "İK", "Satış"]), "role": rng.choice(["admin", "user"]),
+            "status": "active", "created_at": f"2024-0{rng.randint(1, 6)}-1{rng.randint(0, 9)}T09:00:00"
+        }
+        for number in range(1, 61)
+    ]
+    licenses = [
+        {
+            **make_license(number), "type": rng.choice(["standart", "kurumsal"]),
+            "status": rng.choice(["ACTIVE", "EXPIRED"]), "end_date": f"2025-0{rng.randint(1, 9)}-15"
+        }
+        for number in range(1, 81)
+    ]
+    write_collection(tmp_path / "users.json", users)
+    write_collection(tmp_path / "licenses.json", licenses)
+    data_manager = DataManager(str(tmp_path))
+    try:
+        reports = ReportManager(data_manager, report_dir=str(tmp_path / "reports"), cache_dir=str(tmp_path / "cache"))
+        path = reports.generate_summary_report("2024-03-01", "2024-05-31", output_format="json")
+
+        # Bitiş günü aralığa dahildir
+        in_range = [user for user in users if "2024-03-01" <= user["created_at"][:10] <= "2024-05-31"]
+        active = [license for license in licenses if license["status"] == "ACTIVE"]
+        assert summary_counts(path) == {
+            "Departman": dict(Counter(user["department"] for user in in_range)),
+            "Rol": dict(Counter(user["role"] for user in in_range)),
+            "Lisans Türü": dict(Counter(license["type"] for license in licenses)),
+            "Lisans Bitiş Ayı": dict(Counter(license["end_date"][:7] for license in active))
+        }
+
+        # Yeni lisans hem önbelleği hem analitik tablosunu geçersiz kılar
+        assert data_manager.add_license({
+            "key": "YENI-1", "type": "deneme", "start_date": "2024-01-01", "end_date": "2025-12-01",
+            "user_id": 1, "status": "ACTIVE"
+        })
+        counts = summary_counts(reports.generate_summary_report("2024-03-01", "2024-05-31", output_format="json"))
+        assert counts["Lisans Türü"]["deneme"] == 1
+        assert counts["Lisans Bitiş Ayı"]["2025-12"] == 1
+    finally:
+        data_manager.stop_auto_backup()
@@ -0,0 +1,31 @@
+from utils.search_index import SearchIndex
+
+
+def make_index():
+    index = SearchIndex(("full_name", "email"))
+    index.rebuild([
+        {"id": 1, "full_name": "Ali Veli", "email": "ali@example.com"},
+        {"id": 2, "full_name": "Selim Kaya", "email": "selim@example.com"},
+        {"id": 3, "full_name": "Ahmet Işık", "email": "ahmet@example.com"},
+    ])
+    return index
+
+
+def test_short_query_matches_substrings():
+    index = make_index()
+    assert index.search("li") == {1, 2}
+    assert index.search("a") == {1, 2, 3}
+
+
+def test_long_query_matches_substrings():
+    index = make_index()
+    assert index.search("eli") == {1, 2}
+    assert index.search("ışık") == {3}
+    assert index.search("yok") == set()
+
+
+def test_removed_item_is_not_found():
+    index = make_index()
+    index.remove(2)
+    assert index.search("li") == {1}
+    assert index.search("selim") == set()
@@ -0,0 +1,93 @@
+import io
+import json
+
+import pytest
+
+from utils.data_manager import DataManager
+from utils.user_import import UserImporter, iter_json_records
+
+
+@pytest.fixture
+def data_manager(app, tmp_path):
+    with open(tmp_path / "users.json", "w", encoding="utf-8") as f:
+        json.dump([{
+            "id": 7, "username": "user7", "email": "Mevcut@Firma.com", "full_name": "Mevcut Kişi",
+            "department": "BT", "role": "user", "is_active": True
+        }], f)
+    manager = DataManager(str(tmp_path))
+    yield manager
+    manager.stop_auto_backup()
+
+
+def user(email, **fields):
+    return {"full_name": "Ad Soyad", "email": email, "department": "BT", "role": "user", **fields}
+
+
+ROWS = [
+    user("yeni@firma.com"),
+    user("mevcut@firma.com"),  # kayıtlı e-posta, büyük/küçük harf farkıyla
+    user("YENI@firma.com"),  # dosya içinde tekrar
+    user("gecersiz"),
+    {"full_name": "Eksik"},
+    "nesne değil",
+    user("ikinci@firma.com", phone="+905551112233")
+]
+
+
+def test_run_dedupes_validates_and_adds_in_one_write(data_manager):
+    progress = []
+    report = UserImporter(data_manager, batch_size=3, progress=progress.append).run(ROWS)
+
+    assert report["total"] == len(ROWS)
+    assert report["imported"] == 2
+    assert report["duplicates"] == 2
+    assert report["invalid"] == 3
+    assert {index for index, _ in report["errors"]} == {3, 4, 5}
+    assert (3, "Geçersiz e-posta formatı") in report["errors"]
+    assert progress == [3, 6, 7]
+
+    users = data_manager.query_users().all()
+    assert [(u["id"], u["email"]) for u in users[1:]] == [(8, "yeni@firma.com"), (9, "ikinci@firma.com")]
+    with open(data_manager.users_file, encoding="utf-8") as f:
+        assert len(json.load(f)) == 3
+
+
+def test_dry_run_reports_without_writing(data_manager):
+    report = UserImporter(data_manager).run(ROWS, dry_run=True)
+
+    assert report["dry_run"] and report["imported"] == 2
+    assert len(data_manager.query_users().all()) == 1
+
+
+def test_import_file_reads_csv_headers(data_manager, tmp_path):
+    path = tmp_path / "kullanicilar.csv"
+    path.write_text(
+        "ID,Ad Soyad,E-posta,Departman,Rol,Durum\n"
+        "1,Ayşe Yılmaz,ayse@firma.com,İK,user,Aktif\n"
+        "2,Ali Veli,ali@firma.com,BT,admin,Pasif\n",
+        encoding="utf-8"
+    )
+    report = UserImporter(data_manager).import_file(str(path))
+
+    assert report["imported"] == 2
+    imported = {u["email"]: u for u in data_manager.query_users().all()}
+    assert imported["ayse@firma.com"]["is_active"] is True
+    assert imported["ali@firma.com"]["is_active"] is False
+
+
+@pytest.mark.parametrize("text", [
+    json.dumps(ROWS, ensure_ascii=False, indent=2),
+    "\n".join(json.dumps(row, ensure_ascii=False) for row in ROWS) + "\n"
+])
+def test_iter_json_records_handles_arrays_and_json_lines_across_chunks(text):
+    # Küçük okuma boyutu kayıtları ve sayıları tampon sınırında böler
+    assert list(iter_json_records(io.StringIO(text), chunk_size=7)) == ROWS
+
+
+def test_iter_json_records_rejects_unterminated_array():
+    with pytest.raises(ValueError):
+        list(iter_json_records(io.StringIO('[{"a": 1},'), chunk_size=4))
+
+
+def test_iter_json_records_does_not_split_numbers_at_chunk_boundary():
+    assert list(iter_json_records(io.StringIO("123456 789\n"), chunk_size=3)) == [123456, 789]
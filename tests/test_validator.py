@@ -0,0 +1,69 @@
+import pytest
+
+from utils.validator import (DATE_ORDER, INVALID_DATE, INVALID_FORMAT, INVALID_RECORD, REQUIRED,
+                             TOO_SHORT, Validator)
+
+VALID_USER = {"full_name": "Ayşe Yılmaz", "email": "ayse@example.com", "department": "BT", "role": "user"}
+VALID_LICENSE = {
+    "key": "ABCDE-12345-FGHIJ-67890",
+    "type": "yıllık",
+    "start_date": "2024-01-01",
+    "end_date": "2025-01-01",
+    "user_id": 1
+}
+
+
+def test_user_messages_keep_their_wording():
+    assert Validator.validate_user_data(VALID_USER) == []
+    assert Validator.validate_user_data({**VALID_USER, "email": "bozuk", "phone": "12"}) == [
+        "Geçersiz e-posta formatı",
+        "Geçersiz telefon numarası formatı"
+    ]
+    assert Validator.validate_user_data({"email": "ayse@example.com"}) == [
+        "full_name alanı zorunludur",
+        "department alanı zorunludur",
+        "role alanı zorunludur"
+    ]
+
+
+def test_license_messages_and_date_order():
+    assert Validator.validate_license_data(VALID_LICENSE) == []
+    assert Validator.validate_license_data({**VALID_LICENSE, "start_date": "01.01.2024", "key": "abc"}) == [
+        "Geçersiz lisans anahtarı formatı",
+        "Geçersiz başlangıç tarihi formatı"
+    ]
+    # Aynı gün biten lisans da sıralama hatasıdır
+    assert Validator.license_issues({**VALID_LICENSE, "end_date": "2024-01-01"}) == [("end_date", DATE_ORDER)]
+    assert Validator.license_issues({**VALID_LICENSE, "end_date": "2024-02-30"}) == [("end_date", INVALID_DATE)]
+
+
+def test_template_messages():
+    assert Validator.validate_template_data({"name": "Karşılama", "content": "kısa", "type": "mail"}) == [
+        "Şablon içeriği çok kısa"
+    ]
+    assert Validator.template_issues({"content": "yeterince uzun içerik"}) == [
+        ("name", REQUIRED), ("type", REQUIRED)
+    ]
+
+
+def test_validate_many_reports_row_indexes():
+    records = [VALID_USER, "satır", {**VALID_USER, "email": "bozuk"}, {}]
+    report = Validator.validate_many(records)
+    assert report[:2] == [(1, None, INVALID_RECORD), (2, "email", INVALID_FORMAT)]
+    assert {code for index, _, code in report if index == 3} == {REQUIRED}
+    assert Validator.validate_many(iter([VALID_LICENSE]), kind="license") == []
+    assert Validator.validate_many([{"name": "x", "content": "kısa", "type": "t"}], kind="template") == [
+        (0, "content", TOO_SHORT)
+    ]
+
+
+def test_validate_many_in_processes_matches_single_process():
+    records = [{**VALID_USER, "email": "bozuk" if number % 3 == 0 else VALID_USER["email"]} for number in range(25)]
+    records[7] = None
+    expected = Validator.validate_many(records)
+    assert Validator.validate_many(iter(records), processes=2, chunk_size=4) == expected
+
+
+def test_validate_many_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        Validator.validate_many([], kind="grup")